@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
@@ -9,16 +10,27 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 
-from .const import DOMAIN, PLATFORMS
-from .coordinator import TaubenschiesserDataUpdateCoordinator
+_import_started = time.perf_counter()
+
+from .const import DOMAIN, IMPORT_BUDGET_MS, PLATFORMS, SETUP_BUDGET_MS  # noqa: E402
+from .coordinator import TaubenschiesserDataUpdateCoordinator  # noqa: E402
+from .detections import DetectionTracker  # noqa: E402
+from .retained import RetainedTelemetry  # noqa: E402
+from .services import async_setup_services, async_unload_services  # noqa: E402
+from .tokens import TokenStore  # noqa: E402
+
+# Time to import the integration's own modules (dependencies already loaded by HA)
+IMPORT_DURATION_MS = (time.perf_counter() - _import_started) * 1000
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Taubenschiesser from a config entry."""
+    started = time.perf_counter()
     coordinator = TaubenschiesserDataUpdateCoordinator(hass, entry)
-    
+    coordinator.metrics.record_setup("import", IMPORT_DURATION_MS)
+
     try:
         await coordinator.async_config_entry_first_refresh()
     except Exception as err:
@@ -27,18 +39,58 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    # Forward entry setup to sensor, switch and button platforms
+    # Forward entry setup to all platforms (set up concurrently by HA)
+    platforms_started = time.perf_counter()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.metrics.record_setup(
+        "platforms", (time.perf_counter() - platforms_started) * 1000
+    )
+
+    async_setup_services(hass)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
+    total = (time.perf_counter() - started) * 1000
+    coordinator.metrics.record_setup("total", total)
+    if IMPORT_DURATION_MS > IMPORT_BUDGET_MS:
+        _LOGGER.warning(
+            "Import der Integration dauerte %.0f ms (Budget %s ms)",
+            IMPORT_DURATION_MS,
+            IMPORT_BUDGET_MS,
+        )
+    if total > SETUP_BUDGET_MS:
+        _LOGGER.warning(
+            "Einrichtung von %s dauerte %.0f ms (Budget %s ms): %s",
+            entry.title,
+            total,
+            SETUP_BUDGET_MS,
+            {phase: round(value) for phase, value in coordinator.metrics.setup.items()},
+        )
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         coordinator = hass.data[DOMAIN].pop(entry.entry_id)
         await coordinator.async_shutdown()
+        async_unload_services(hass)
 
     return unload_ok
 
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the entry's stored tokens, telemetry and detection counters."""
+    for store in (
+        TokenStore(hass, entry.entry_id),
+        RetainedTelemetry(hass, entry.entry_id),
+        DetectionTracker(hass, entry.entry_id),
+    ):
+        await store.async_remove()
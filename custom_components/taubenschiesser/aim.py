@@ -0,0 +1,232 @@
+"""Coalesced aiming: absolute and relative targets sent as net impulses."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import ATTR_MOVING, ATTR_ROTATION, ATTR_TILT
+
+if TYPE_CHECKING:
+    from .coordinator import TaubenschiesserDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# At most one impulse per device per tick bounds the MQTT message rate
+AIM_TICK = 0.25
+# Errors below this (degrees) count as on target
+AIM_TOLERANCE = 1.0
+# Largest single impulse; the rest follows on later ticks
+AIM_MAX_STEP = 45.0
+# Wait this long for telemetry showing the last impulse before going open-loop
+AIM_SETTLE_TIMEOUT = 2.0
+
+
+@dataclass(slots=True)
+class AimTarget:
+    """Pending aim of one device."""
+
+    device_ip: str
+    speed: int = 1
+    # Absolute targets (need a known position)
+    rot: float | None = None
+    tilt: float | None = None
+    # Relative movement requested while the position was unknown
+    delta_rot: float = 0.0
+    delta_tilt: float = 0.0
+    # Impulses sent that telemetry does not show yet
+    outstanding_rot: float = 0.0
+    outstanding_tilt: float = 0.0
+    sent_at: float | None = None
+    sending: bool = False
+
+
+def _clamp(value: float) -> float:
+    return max(-AIM_MAX_STEP, min(AIM_MAX_STEP, value))
+
+
+class AimController:
+    """Turn bursts of aim requests into one net impulse per device and tick.
+
+    Requests only update the target; a request that arrives before the last
+    one was sent supersedes it. Each tick compares the target with the live
+    Rot/Tilt telemetry plus impulses not yet reflected in it and sends the
+    remaining difference, so a joystick sending many requests per second
+    still produces a bounded number of MQTT commands.
+    """
+
+    def __init__(self, coordinator: TaubenschiesserDataUpdateCoordinator) -> None:
+        """Initialize the controller."""
+        self.coordinator = coordinator
+        self.hass = coordinator.hass
+        self.targets: dict[str, AimTarget] = {}
+        self.requests = 0
+        self.superseded = 0
+        self.impulses = 0
+        self.errors = 0
+        self._unsub: CALLBACK_TYPE | None = None
+
+    def _position(self, device_id: str, target: AimTarget) -> tuple[float | None, float | None]:
+        """Return the estimated position including impulses still under way."""
+        device = self.coordinator.devices.get(device_id) or {}
+        rot = device.get(ATTR_ROTATION)
+        tilt = device.get(ATTR_TILT)
+        return (
+            rot + target.outstanding_rot if isinstance(rot, (int, float)) else None,
+            tilt + target.outstanding_tilt if isinstance(tilt, (int, float)) else None,
+        )
+
+    @callback
+    def async_aim(
+        self,
+        device_id: str,
+        device_ip: str,
+        rotation: float | None = None,
+        tilt: float | None = None,
+        delta_rotation: float = 0.0,
+        delta_tilt: float = 0.0,
+        speed: int = 1,
+    ) -> None:
+        """Merge an aim request into the device's target."""
+        self.requests += 1
+        target = self.targets.get(device_id) or AimTarget(device_ip)
+        rot_now, tilt_now = self._position(device_id, target)
+        if (rotation is not None and rot_now is None) or (
+            tilt is not None and tilt_now is None
+        ):
+            raise ValueError("Position unbekannt, nur relative Bewegung möglich")
+        if device_id in self.targets:
+            # The previous target is replaced before it was reached
+            self.superseded += 1
+        self.targets[device_id] = target
+        target.device_ip = device_ip
+        target.speed = speed
+
+        target.rot, target.delta_rot = self._merge_axis(
+            target.rot, target.delta_rot, rot_now, rotation, delta_rotation
+        )
+        target.tilt, target.delta_tilt = self._merge_axis(
+            target.tilt, target.delta_tilt, tilt_now, tilt, delta_tilt
+        )
+
+        if self._unsub is None:
+            # Leading edge: the first request moves at once, later ones coalesce
+            self._async_tick(None)
+
+    @staticmethod
+    def _merge_axis(
+        absolute: float | None,
+        pending_delta: float,
+        position: float | None,
+        requested: float | None,
+        delta: float,
+    ) -> tuple[float | None, float]:
+        if requested is not None:
+            absolute, pending_delta = requested, 0.0
+        if delta:
+            if absolute is not None:
+                absolute += delta
+            elif position is not None:
+                absolute = position + pending_delta + delta
+                pending_delta = 0.0
+            else:
+                pending_delta += delta
+        return absolute, pending_delta
+
+    @callback
+    def _async_tick(self, _now: datetime | None) -> None:
+        """Send at most one net impulse per device."""
+        self._unsub = None
+        now = time.monotonic()
+        for device_id, target in list(self.targets.items()):
+            if target.sending:
+                continue
+            device = self.coordinator.devices.get(device_id)
+            if device is None:
+                del self.targets[device_id]
+                continue
+            if target.sent_at is not None:
+                seen = self.coordinator._mqtt_last_seen(device_id)
+                if seen is not None and seen > target.sent_at and not device.get(ATTR_MOVING):
+                    # Telemetry now shows the last impulse
+                    target.outstanding_rot = target.outstanding_tilt = 0.0
+                    target.sent_at = None
+                elif now - target.sent_at < AIM_SETTLE_TIMEOUT:
+                    continue
+
+            rot_now, tilt_now = self._position(device_id, target)
+            step_rot = self._step(target.rot, rot_now, target.delta_rot)
+            step_tilt = self._step(target.tilt, tilt_now, target.delta_tilt)
+            if not step_rot and not step_tilt:
+                # On target (the last impulse is settled or timed out)
+                del self.targets[device_id]
+                continue
+
+            if target.rot is None:
+                target.delta_rot -= step_rot
+            if target.tilt is None:
+                target.delta_tilt -= step_tilt
+            target.outstanding_rot += step_rot
+            target.outstanding_tilt += step_tilt
+            target.sent_at = now
+            target.sending = True
+            self.hass.async_create_task(
+                self._async_send(device_id, target, step_rot, step_tilt)
+            )
+        if self.targets:
+            self._unsub = async_call_later(self.hass, AIM_TICK, self._async_tick)
+
+    @staticmethod
+    def _step(absolute: float | None, position: float | None, pending_delta: float) -> float:
+        if absolute is not None and position is not None:
+            error = absolute - position
+        else:
+            error = pending_delta
+        if abs(error) < AIM_TOLERANCE:
+            return 0.0
+        return round(_clamp(error), 1)
+
+    async def _async_send(
+        self, device_id: str, target: AimTarget, step_rot: float, step_tilt: float
+    ) -> None:
+        command = {
+            "type": "impulse",
+            "speed": target.speed,
+            "bounce": 0,
+            "position": {"rot": step_rot, "tilt": step_tilt},
+        }
+        try:
+            await self.coordinator.async_send_device_command(
+                target.device_ip, command, device_id=device_id
+            )
+            self.impulses += 1
+        except Exception as err:  # pylint: disable=broad-except
+            self.errors += 1
+            _LOGGER.error("Zielen von %s fehlgeschlagen: %s", device_id, err)
+            # Give up on this aim instead of retrying into a dead path
+            self.targets.pop(device_id, None)
+        finally:
+            target.sending = False
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the tick and drop all targets."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self.targets.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the controller."""
+        return {
+            "active": sorted(self.targets),
+            "requests": self.requests,
+            "superseded": self.superseded,
+            "impulses": self.impulses,
+            "errors": self.errors,
+        }
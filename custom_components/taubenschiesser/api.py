@@ -0,0 +1,102 @@
+"""Backend API helpers shared by the config flow and the coordinator."""
+from __future__ import annotations
+
+import logging
+
+import aiohttp
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import API_ENDPOINT_AUTH, API_ENDPOINT_DEVICES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CannotConnect(HomeAssistantError):
+    """Error to indicate we cannot connect."""
+
+
+class InvalidAuth(HomeAssistantError):
+    """Error to indicate there is invalid auth."""
+
+
+class CommandNotSent(HomeAssistantError):
+    """Error to indicate a command certainly did not leave (safe to send again)."""
+
+
+class BackendUnavailable(UpdateFailed):
+    """Transient backend failure (network, timeout, 5xx); the last data is still valid."""
+
+
+async def validate_login(
+    session: aiohttp.ClientSession, api_url: str, email: str, password: str
+) -> dict[str, str]:
+    """Validate login and get tokens."""
+    try:
+        async with session.post(
+            f"{api_url.rstrip('/')}{API_ENDPOINT_AUTH}",
+            json={"email": email, "password": password},
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                access_token = data.get("access_token")
+                refresh_token = data.get("refresh_token")
+
+                if not access_token:
+                    raise InvalidAuth("Kein Token in der Antwort erhalten")
+
+                return {
+                    "access_token": access_token,
+                    "refresh_token": refresh_token or "",
+                }
+            elif response.status == 401:
+                raise InvalidAuth("Ungültige Anmeldedaten")
+            else:
+                error_text = await response.text()
+                raise CannotConnect(f"Login fehlgeschlagen: HTTP {response.status} - {error_text}")
+    except (CannotConnect, InvalidAuth):
+        raise
+    except aiohttp.ClientConnectorError as err:
+        _LOGGER.error("API connection error: %s", err)
+        # Check if localhost is used (common Docker issue)
+        if "localhost" in api_url.lower() or "127.0.0.1" in api_url:
+            raise CannotConnect(
+                "Verbindung zu localhost fehlgeschlagen. "
+                "Wenn Home Assistant in Docker läuft, verwende stattdessen:\n"
+                "- macOS/Windows: host.docker.internal:5001\n"
+                "- Linux: Die IP-Adresse deines Hosts (z.B. 192.168.1.100:5001)\n\n"
+                f"Original-Fehler: {err}"
+            )
+        raise CannotConnect(f"Verbindung fehlgeschlagen: {err}")
+    except aiohttp.ClientError as err:
+        _LOGGER.error("API connection error: %s", err)
+        raise CannotConnect(f"Netzwerkfehler: {err}")
+    except Exception as err:
+        _LOGGER.error("Unexpected error: %s", err)
+        raise CannotConnect(f"Unerwarteter Fehler: {err}")
+
+
+async def validate_api_connection(
+    session: aiohttp.ClientSession, api_url: str, access_token: str
+) -> bool:
+    """Validate API connection with access token."""
+    try:
+        headers = {"Authorization": f"Bearer {access_token}"}
+        async with session.get(
+            f"{api_url.rstrip('/')}{API_ENDPOINT_DEVICES}",
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as response:
+            if response.status == 200:
+                return True
+            elif response.status == 401:
+                raise InvalidAuth
+            else:
+                raise CannotConnect
+    except InvalidAuth:
+        raise
+    except Exception as err:
+        _LOGGER.error("API connection error: %s", err)
+        raise CannotConnect(f"Verbindung fehlgeschlagen: {err}")
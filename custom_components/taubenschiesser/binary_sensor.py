@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
 from homeassistant.components.binary_sensor import (
@@ -9,11 +10,23 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTR_DEVICE_IP, ATTR_LAST_SEEN, ATTR_MONITOR_STATUS, ATTR_WATERTANK, DOMAIN
+from .const import (
+    ATTR_DEVICE_IP,
+    ATTR_LAST_SEEN,
+    ATTR_MONITOR_STATUS,
+    ATTR_RESTORED_AGE,
+    ATTR_STALE_SINCE,
+    ATTR_TELEMETRY_RESTORED,
+    ATTR_WATERTANK,
+    DOMAIN,
+    LISTENER_TELEMETRY,
+    SIGNAL_DEVICES_ADDED,
+)
 from .coordinator import TaubenschiesserDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,11 +40,26 @@ async def async_setup_entry(
     """Set up Taubenschiesser binary sensors from a config entry."""
     coordinator: TaubenschiesserDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities = []
-    for device_id, device in coordinator.data.get("devices", {}).items():
-        entities.append(TaubenschiesserWaterTankBinarySensor(coordinator, device_id, device))
+    @callback
+    def async_add_device_entities(device_ids: set[str] | None = None) -> None:
+        entities = []
+        for device_id, device in coordinator.data.get("devices", {}).items():
+            if device_ids is not None and device_id not in device_ids:
+                continue
+            entities.append(
+                TaubenschiesserWaterTankBinarySensor(coordinator, device_id, device)
+            )
+        async_add_entities(entities)
+
+    async_add_device_entities()
 
-    async_add_entities(entities)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_DEVICES_ADDED.format(entry_id=entry.entry_id),
+            async_add_device_entities,
+        )
+    )
 
 
 class TaubenschiesserWaterTankBinarySensor(CoordinatorEntity, BinarySensorEntity):
@@ -39,6 +67,9 @@ class TaubenschiesserWaterTankBinarySensor(CoordinatorEntity, BinarySensorEntity
 
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
     _attr_icon = "mdi:water-alert"
+    _unrecorded_attributes = frozenset(
+        {ATTR_TELEMETRY_RESTORED, ATTR_RESTORED_AGE, ATTR_STALE_SINCE}
+    )
 
     def __init__(
         self,
@@ -47,7 +78,7 @@ class TaubenschiesserWaterTankBinarySensor(CoordinatorEntity, BinarySensorEntity
         device: dict,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, LISTENER_TELEMETRY)
         self.device_id = device_id
         self.device = device
         device_name = device.get("name", "Taubenschiesser")
@@ -65,13 +96,24 @@ class TaubenschiesserWaterTankBinarySensor(CoordinatorEntity, BinarySensorEntity
             return False
         return watertank is False
 
+    async def async_added_to_hass(self) -> None:
+        """Follow the staleness watchdog."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_availability_listener(
+                self.device_id, self.async_write_ha_state
+            )
+        )
+
     @property
     def available(self) -> bool:
-        """Available when telemetry has been received."""
+        """Available when telemetry has been received and is not overdue."""
         device = self.coordinator.data.get("devices", {}).get(self.device_id)
         if not device:
             return False
-        return device.get(ATTR_WATERTANK) is not None
+        return device.get(ATTR_WATERTANK) is not None and self.coordinator.device_available(
+            self.device_id
+        )
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -89,6 +131,14 @@ class TaubenschiesserWaterTankBinarySensor(CoordinatorEntity, BinarySensorEntity
             attrs["updated_at"] = live.get("updatedAt")
         if device.get("lastSeen"):
             attrs[ATTR_LAST_SEEN] = device["lastSeen"]
+        restored = device.get(ATTR_TELEMETRY_RESTORED)
+        if restored:
+            attrs[ATTR_TELEMETRY_RESTORED] = restored["source"]
+            if restored.get("at"):
+                attrs[ATTR_RESTORED_AGE] = int(time.time() - restored["at"])
+        if self.coordinator.snapshot_stale:
+            # Backend unreachable: the values are the last snapshot
+            attrs[ATTR_STALE_SINCE] = self.coordinator.fetch_stats.stale_since
         return attrs
 
     @property
@@ -6,11 +6,12 @@ from typing import Any
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTR_DEVICE_IP, DOMAIN
+from .const import ATTR_DEVICE_IP, DOMAIN, SIGNAL_DEVICES_ADDED
 from .coordinator import TaubenschiesserDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -33,14 +34,27 @@ async def async_setup_entry(
     """Set up Taubenschiesser buttons from a config entry."""
     coordinator: TaubenschiesserDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities = []
-    for device_id, device in coordinator.data.get("devices", {}).items():
-        for button_type in BUTTON_TYPES:
-            entities.append(
-                TaubenschiesserButton(coordinator, device_id, device, button_type)
-            )
-
-    async_add_entities(entities)
+    @callback
+    def async_add_device_entities(device_ids: set[str] | None = None) -> None:
+        entities = []
+        for device_id, device in coordinator.data.get("devices", {}).items():
+            if device_ids is not None and device_id not in device_ids:
+                continue
+            for button_type in BUTTON_TYPES:
+                entities.append(
+                    TaubenschiesserButton(coordinator, device_id, device, button_type)
+                )
+        async_add_entities(entities)
+
+    async_add_device_entities()
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_DEVICES_ADDED.format(entry_id=entry.entry_id),
+            async_add_device_entities,
+        )
+    )
 
 
 class TaubenschiesserButton(CoordinatorEntity, ButtonEntity):
@@ -81,13 +95,14 @@ class TaubenschiesserButton(CoordinatorEntity, ButtonEntity):
             else:
                 command = self.button_type["command"]
 
-            # Try MQTT first if available
-            if self.coordinator.mqtt_client and self.coordinator.mqtt_client.is_connected():
-                await self.coordinator.send_mqtt_command(device_ip, command)
-            else:
-                # Fallback to API (backend uses device shootingTimeMs for shoot)
-                action = self.button_type["key"]
-                await self.coordinator.send_api_command(self.device_id, action)
+            # Fastest healthy path first: MQTT, LAN or API (backend uses
+            # device shootingTimeMs for shoot)
+            await self.coordinator.async_send_device_command(
+                device_ip,
+                command,
+                device_id=self.device_id,
+                api_action=self.button_type["key"],
+            )
         except Exception as err:
             _LOGGER.error(
                 "Error sending command %s to device %s: %s",
@@ -0,0 +1,155 @@
+"""Recording of MQTT and API traffic for offline replay (tools/replay.py)."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_VERSION = 1
+FLUSH_INTERVAL = timedelta(seconds=5)
+
+# Record kinds: [offset_ms, kind, ...]
+KIND_MQTT = "m"  # [t, "m", topic, payload, retained]
+KIND_API = "a"  # [t, "a", endpoint, status, payload]
+KIND_PUSH = "p"  # [t, "p", event_type, payload]
+
+REDACTED = "**REDACTED**"
+REDACT_KEYS = frozenset(
+    {
+        "access_token",
+        "accessToken",
+        "refresh_token",
+        "refreshToken",
+        "token",
+        "password",
+        "mqtt_password",
+        "mqttPassword",
+        "apiKey",
+        "secret",
+        "email",
+    }
+)
+
+
+def redact(value: Any) -> Any:
+    """Return a copy with credentials replaced (recursively)."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in REDACT_KEYS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def capture_path(config_dir: str, entry_id: str) -> str:
+    """Return a fresh output path for a capture."""
+    return os.path.join(
+        config_dir,
+        f"taubenschiesser_capture_{entry_id}_{time.strftime('%Y%m%d_%H%M%S')}.jsonl",
+    )
+
+
+def _append_lines(path: str, lines: list[str]) -> None:
+    """Append encoded records to the capture file (blocking)."""
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write("\n".join(lines))
+        handle.write("\n")
+
+
+class TrafficCapture:
+    """Append-only JSONL recording of everything that feeds the coordinator.
+
+    Records are compact arrays with a millisecond offset from the start, so a
+    replay can reproduce the original pacing. They are encoded when recorded
+    (before the coordinator mutates the payloads) and queued in a deque, which
+    the paho thread may append to without a lock; the loop drains it to disk
+    in the executor every few seconds.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, entry_id: str) -> None:
+        """Initialize the capture."""
+        self.hass = hass
+        self.path = path
+        self.records = 0
+        self.bytes = 0
+        self._started = time.monotonic()
+        self._queue: deque[str] = deque()
+        self._unsub: CALLBACK_TYPE | None = None
+        self._queue.append(
+            json.dumps(
+                {
+                    "version": CAPTURE_VERSION,
+                    "entry_id": entry_id,
+                    "started": time.time(),
+                }
+            )
+        )
+
+    def _add(self, record: list[Any]) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        self._queue.append(line)
+        self.records += 1
+        self.bytes += len(line) + 1
+
+    def _offset(self) -> int:
+        return round((time.monotonic() - self._started) * 1000)
+
+    def record_mqtt(self, topic: str, payload: Any, retained: bool) -> None:
+        """Record a decoded MQTT message (may run on the paho thread)."""
+        self._add([self._offset(), KIND_MQTT, topic, redact(payload), int(retained)])
+
+    def record_api(self, endpoint: str, status: int, payload: Any) -> None:
+        """Record a decoded API response."""
+        self._add([self._offset(), KIND_API, endpoint, status, redact(payload)])
+
+    def record_push(self, event_type: str, payload: Any) -> None:
+        """Record a push channel event."""
+        self._add([self._offset(), KIND_PUSH, event_type, redact(payload)])
+
+    @callback
+    def async_start(self) -> None:
+        """Start flushing to disk periodically."""
+        self._unsub = async_track_time_interval(
+            self.hass, self._async_flush_interval, FLUSH_INTERVAL
+        )
+
+    async def _async_flush_interval(self, _now: datetime) -> None:
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Append queued records to the file."""
+        lines: list[str] = []
+        while self._queue:
+            lines.append(self._queue.popleft())
+        if lines:
+            await self.hass.async_add_executor_job(_append_lines, self.path, lines)
+
+    async def async_stop(self) -> None:
+        """Stop flushing and write what is left."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        await self.async_flush()
+        _LOGGER.info(
+            "Verkehrsaufzeichnung gespeichert: %s (%s Einträge)", self.path, self.records
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the capture."""
+        return {
+            "file": self.path,
+            "records": self.records,
+            "bytes": self.bytes,
+            "duration_s": round(time.monotonic() - self._started, 1),
+        }
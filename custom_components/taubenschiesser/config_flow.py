@@ -1,17 +1,20 @@
 """Config flow for Taubenschiesser integration."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable
 import logging
+import time
 from typing import Any
 
-import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .api import CannotConnect, InvalidAuth, validate_api_connection, validate_login
 from .const import (
     CONF_API_URL,
     CONF_EMAIL,
@@ -22,81 +25,52 @@ from .const import (
     CONF_MQTT_PASSWORD,
     CONF_MQTT_PORT,
     CONF_MQTT_USERNAME,
+    CONF_HIGH_RESOLUTION,
+    CONF_HISTORY,
+    CONF_HISTORY_RETENTION_DAYS,
+    CONF_USE_HA_MQTT,
+    CONF_FLEET_STORE,
+    CONF_MQTT_RETAINED,
+    CONF_LOCAL_CONTROL,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_PUSH,
+    CONF_SHARDS,
+    CONF_HEDGED_FETCH,
+    DEFAULT_HISTORY_RETENTION_DAYS,
     DEFAULT_MQTT_PORT,
+    DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
-    API_ENDPOINT_DEVICES,
-    API_ENDPOINT_AUTH,
-    API_ENDPOINT_REFRESH,
 )
+from .mqtt_pool import BrokerProbeError, async_probe_broker
+from .shards import parse_shards
 
 _LOGGER = logging.getLogger(__name__)
 
+# All checks of the setup form together must finish within this (seconds)
+VALIDATION_DEADLINE = 15
 
-async def validate_login(api_url: str, email: str, password: str) -> dict[str, str]:
-    """Validate login and get tokens."""
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{api_url.rstrip('/')}{API_ENDPOINT_AUTH}",
-                json={"email": email, "password": password},
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    access_token = data.get("access_token")
-                    refresh_token = data.get("refresh_token")
-                    
-                    if not access_token:
-                        raise InvalidAuth("Kein Token in der Antwort erhalten")
-                    
-                    return {
-                        "access_token": access_token,
-                        "refresh_token": refresh_token or "",
-                    }
-                elif response.status == 401:
-                    raise InvalidAuth("Ungültige Anmeldedaten")
-                else:
-                    error_text = await response.text()
-                    raise CannotConnect(f"Login fehlgeschlagen: HTTP {response.status} - {error_text}")
-    except aiohttp.ClientConnectorError as err:
-        _LOGGER.error("API connection error: %s", err)
-        # Check if localhost is used (common Docker issue)
-        if "localhost" in api_url.lower() or "127.0.0.1" in api_url:
-            raise CannotConnect(
-                "Verbindung zu localhost fehlgeschlagen. "
-                "Wenn Home Assistant in Docker läuft, verwende stattdessen:\n"
-                "- macOS/Windows: host.docker.internal:5001\n"
-                "- Linux: Die IP-Adresse deines Hosts (z.B. 192.168.1.100:5001)\n\n"
-                f"Original-Fehler: {err}"
-            )
-        raise CannotConnect(f"Verbindung fehlgeschlagen: {err}")
-    except aiohttp.ClientError as err:
-        _LOGGER.error("API connection error: %s", err)
-        raise CannotConnect(f"Netzwerkfehler: {err}")
-    except Exception as err:
-        _LOGGER.error("Unexpected error: %s", err)
-        raise CannotConnect(f"Unerwarteter Fehler: {err}")
-
-
-async def validate_api_connection(api_url: str, access_token: str) -> bool:
-    """Validate API connection with access token."""
-    try:
-        headers = {"Authorization": f"Bearer {access_token}"}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{api_url.rstrip('/')}{API_ENDPOINT_DEVICES}",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                if response.status == 200:
-                    return True
-                elif response.status == 401:
-                    raise InvalidAuth
-                else:
-                    raise CannotConnect
-    except (aiohttp.ClientConnectorError, aiohttp.ClientError, Exception) as err:
-        _LOGGER.error("API connection error: %s", err)
-        raise CannotConnect(f"Verbindung fehlgeschlagen: {err}")
+
+class _Checks:
+    """Latency and outcome of each validation step, for the form errors."""
+
+    def __init__(self) -> None:
+        self.results: dict[str, tuple[float, bool]] = {}
+
+    async def run(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = await awaitable
+            ok = True
+            return result
+        finally:
+            self.results[name] = ((time.perf_counter() - started) * 1000, ok)
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{name} {latency:.0f} ms {'✓' if ok else '✗'}"
+            for name, (latency, ok) in self.results.items()
+        )
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -104,38 +78,28 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 2  # Increment version for breaking changes
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
         errors: dict[str, str] = {}
+        checks = _Checks()
 
         if user_input is not None:
-            try:
-                # Try login with email/password
-                tokens = await validate_login(
-                    user_input[CONF_API_URL],
-                    user_input[CONF_EMAIL],
-                    user_input[CONF_PASSWORD],
-                )
-                
-                # Validate connection with access token
-                await validate_api_connection(
-                    user_input[CONF_API_URL],
-                    tokens["access_token"],
-                )
-            except CannotConnect as err:
-                error_msg = str(err) if str(err) else "cannot_connect"
-                if error_msg != "cannot_connect":
-                    errors["base"] = error_msg
-                else:
-                    errors["base"] = "cannot_connect"
-            except InvalidAuth:
-                errors["base"] = "invalid_auth"
-            except Exception:  # pylint: disable=broad-except
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = "unknown"
-            else:
+            tokens, api_error, mqtt_error = await self._async_validate(user_input, checks)
+            if mqtt_error is not None:
+                errors[CONF_MQTT_BROKER] = mqtt_error
+            if api_error is not None:
+                errors["base"] = api_error
+            elif not errors:
                 # Check if already configured
                 await self.async_set_unique_id(user_input[CONF_API_URL])
                 self._abort_if_unique_id_configured()
@@ -192,13 +156,151 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
             description_placeholders={
                 "api_url_example": suggested_api_url,
+                "checks": checks.summary(),
             },
         )
 
+    async def _async_validate(
+        self, user_input: dict[str, Any], checks: _Checks
+    ) -> tuple[dict[str, str] | None, str | None, str | None]:
+        """Run login + device list and the broker probe concurrently.
+
+        All go through Home Assistant's shared session (no extra handshake
+        for the device list after the login) and share one deadline, so a
+        dead broker or API fails the form within VALIDATION_DEADLINE seconds.
+        Returns the tokens and the API and MQTT error keys.
+        """
+        session = async_get_clientsession(self.hass)
+        api_url = user_input[CONF_API_URL]
+
+        async def check_api() -> dict[str, str]:
+            tokens = await checks.run(
+                "Login",
+                validate_login(
+                    session, api_url, user_input[CONF_EMAIL], user_input[CONF_PASSWORD]
+                ),
+            )
+            await checks.run(
+                "Geräteliste",
+                validate_api_connection(session, api_url, tokens["access_token"]),
+            )
+            return tokens
 
-class CannotConnect(HomeAssistantError):
-    """Error to indicate we cannot connect."""
+        async def check_mqtt() -> None:
+            if user_input.get(CONF_MQTT_BROKER):
+                await checks.run(
+                    "MQTT",
+                    async_probe_broker(
+                        user_input[CONF_MQTT_BROKER],
+                        user_input.get(CONF_MQTT_PORT, DEFAULT_MQTT_PORT),
+                        user_input.get(CONF_MQTT_USERNAME),
+                        user_input.get(CONF_MQTT_PASSWORD),
+                    ),
+                )
 
+        try:
+            async with asyncio.timeout(VALIDATION_DEADLINE):
+                api_result, mqtt_result = await asyncio.gather(
+                    check_api(), check_mqtt(), return_exceptions=True
+                )
+        except TimeoutError:
+            return None, "timeout", None
 
-class InvalidAuth(HomeAssistantError):
-    """Error to indicate there is invalid auth."""
+        tokens: dict[str, str] | None = None
+        api_error: str | None = None
+        if isinstance(api_result, CannotConnect):
+            # Detailed messages (e.g. the Docker localhost hint) are shown as is
+            api_error = str(api_result) or "cannot_connect"
+        elif isinstance(api_result, InvalidAuth):
+            api_error = "invalid_auth"
+        elif isinstance(api_result, BaseException):
+            _LOGGER.error("Unexpected exception: %s", api_result)
+            api_error = "unknown"
+        else:
+            tokens = api_result
+
+        mqtt_error: str | None = None
+        if isinstance(mqtt_result, BrokerProbeError):
+            _LOGGER.debug("MQTT-Prüfung fehlgeschlagen: %s", mqtt_result)
+            mqtt_error = "mqtt_invalid_auth" if mqtt_result.auth else "mqtt_cannot_connect"
+        elif isinstance(mqtt_result, BaseException):
+            _LOGGER.error("Unexpected exception: %s", mqtt_result)
+            mqtt_error = "mqtt_cannot_connect"
+        return tokens, api_error, mqtt_error
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Taubenschiesser options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+        placeholders: dict[str, str] = {"shard_error": ""}
+        if user_input is not None:
+            try:
+                parse_shards(user_input.get(CONF_SHARDS, ""), DEFAULT_UPDATE_INTERVAL)
+            except ValueError as err:
+                errors[CONF_SHARDS] = "invalid_shards"
+                placeholders["shard_error"] = str(err)
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = user_input or self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_PERFORMANCE_SENSORS,
+                    default=options.get(CONF_PERFORMANCE_SENSORS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_HIGH_RESOLUTION,
+                    default=options.get(CONF_HIGH_RESOLUTION, False),
+                ): bool,
+                vol.Optional(
+                    CONF_PUSH,
+                    default=options.get(CONF_PUSH, False),
+                ): bool,
+                vol.Optional(
+                    CONF_HISTORY,
+                    default=options.get(CONF_HISTORY, False),
+                ): bool,
+                vol.Optional(
+                    CONF_HISTORY_RETENTION_DAYS,
+                    default=options.get(
+                        CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3650)),
+                vol.Optional(
+                    CONF_USE_HA_MQTT,
+                    default=options.get(CONF_USE_HA_MQTT, False),
+                ): bool,
+                vol.Optional(
+                    CONF_FLEET_STORE,
+                    default=options.get(CONF_FLEET_STORE, False),
+                ): bool,
+                vol.Optional(
+                    CONF_MQTT_RETAINED,
+                    default=options.get(CONF_MQTT_RETAINED, False),
+                ): bool,
+                vol.Optional(
+                    CONF_LOCAL_CONTROL,
+                    default=options.get(CONF_LOCAL_CONTROL, False),
+                ): bool,
+                vol.Optional(
+                    CONF_HEDGED_FETCH,
+                    default=options.get(CONF_HEDGED_FETCH, False),
+                ): bool,
+                vol.Optional(
+                    CONF_SHARDS,
+                    default=options.get(CONF_SHARDS, ""),
+                ): str,
+            }
+        )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders=placeholders,
+        )
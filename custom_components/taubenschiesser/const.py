@@ -15,19 +15,53 @@ CONF_MQTT_PORT: Final = "mqtt_port"
 CONF_MQTT_USERNAME: Final = "mqtt_username"
 CONF_MQTT_PASSWORD: Final = "mqtt_password"
 
+# Options
+CONF_PERFORMANCE_SENSORS: Final = "performance_sensors"
+CONF_HIGH_RESOLUTION: Final = "high_resolution"
+CONF_PUSH: Final = "push"
+CONF_HISTORY: Final = "history"
+CONF_HISTORY_RETENTION_DAYS: Final = "history_retention_days"
+CONF_USE_HA_MQTT: Final = "use_ha_mqtt"
+CONF_FLEET_STORE: Final = "fleet_store"
+CONF_MQTT_RETAINED: Final = "mqtt_retained"
+CONF_LOCAL_CONTROL: Final = "local_control"
+CONF_SHARDS: Final = "shards"
+CONF_HEDGED_FETCH: Final = "hedged_fetch"
+
 # Defaults
 DEFAULT_MQTT_PORT: Final = 1883
 DEFAULT_UPDATE_INTERVAL: Final = 30
+PERFORMANCE_TICK_INTERVAL: Final = 30
+PUSH_CONSISTENCY_INTERVAL: Final = 300
+PUSH_IDLE_TIMEOUT: Final = 90
+DEFAULT_HISTORY_RETENTION_DAYS: Final = 90
+MQTT_STALE_AFTER: Final = 300
+# Entities of a device without MQTT message or new lastSeen turn unavailable
+DEVICE_STALE_AFTER: Final = 600
+LOCAL_PROBE_INTERVAL: Final = 60
+# Import / entry setup slower than this (ms) is logged as a warning
+IMPORT_BUDGET_MS: Final = 500
+SETUP_BUDGET_MS: Final = 10000
 
 # API endpoints
 API_ENDPOINT_DEVICES: Final = "/api/devices"
 API_ENDPOINT_CONTROL: Final = "/api/device-control"
 API_ENDPOINT_AUTH: Final = "/api/auth/login"
 API_ENDPOINT_REFRESH: Final = "/api/auth/refresh"
+API_ENDPOINT_EVENTS: Final = "/api/devices/events"
+API_ENDPOINT_DETECTIONS_HOURLY: Final = "/api/devices/{device_id}/detections/hourly"
+
+# Local HTTP interface of the ESP (same JSON as the MQTT command/info topics)
+LOCAL_ENDPOINT_COMMAND: Final = "/command"
+LOCAL_ENDPOINT_INFO: Final = "/info"
 
 # MQTT topics
 MQTT_TOPIC_COMMAND: Final = "taubenschiesser/{ip}"
 MQTT_TOPIC_STATUS: Final = "taubenschiesser/{ip}/info"
+MQTT_TOPIC_DETECTION: Final = "taubenschiesser/{ip}/detection"
+
+# Events
+EVENT_DETECTION: Final = "taubenschiesser_detection"
 
 # Device attributes
 ATTR_ROTATION: Final = "rotation"
@@ -44,8 +78,14 @@ ATTR_SHOOT_USE_AUDIO: Final = "shoot_use_audio"
 ATTR_SHOOT_LASER_BLINK: Final = "shoot_laser_blink"
 ATTR_WATERTANK: Final = "watertank"
 ATTR_STATUS: Final = "status"
+ATTR_TELEMETRY_RESTORED: Final = "telemetry_restored"
+ATTR_RESTORED_AGE: Final = "restored_age"
+ATTR_STALE_SINCE: Final = "stale_since"
 ATTR_TODAY_DETECTIONS: Final = "today_detections"
 ATTR_YESTERDAY_DETECTIONS: Final = "yesterday_detections"
+ATTR_DETECTIONS_5MIN: Final = "detections_5min"
+ATTR_DETECTIONS_HOUR: Final = "detections_hour"
+ATTR_DETECTIONS_DAY: Final = "detections_day"
 
 # Hardware monitor (persisted on device by backend)
 ATTR_DYNAMIC_THRESHOLD: Final = "dynamic_threshold"
@@ -56,3 +96,17 @@ MONITOR_STATUS_RUNNING: Final = "running"
 MONITOR_STATUS_PAUSED: Final = "paused"
 MONITOR_STATUS_STOPPED: Final = "stopped"
 
+
+# Coordinator listener context of entities that only render live telemetry
+LISTENER_TELEMETRY: Final = "telemetry"
+
+# Dispatcher signals (format with entry_id)
+SIGNAL_DEVICES_ADDED: Final = f"{DOMAIN}_devices_added_{{entry_id}}"
+SIGNAL_SUMMARY_UPDATED: Final = f"{DOMAIN}_summary_updated_{{entry_id}}"
+SIGNAL_DETECTIONS_DECAYED: Final = f"{DOMAIN}_detections_decayed_{{entry_id}}"
+
+# Services
+SERVICE_PROFILE: Final = "profile"
+SERVICE_QUERY_HISTORY: Final = "query_history"
+SERVICE_AIM: Final = "aim"
+SERVICE_CAPTURE_TRAFFIC: Final = "capture_traffic"
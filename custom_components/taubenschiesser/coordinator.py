@@ -2,15 +2,21 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 import json
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
-import paho.mqtt.client as mqtt
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
@@ -25,6 +31,7 @@ from .const import (
     ATTR_MOVING,
     ATTR_ROTATION,
     ATTR_STATUS,
+    ATTR_TELEMETRY_RESTORED,
     ATTR_TILT,
     ATTR_WATERTANK,
     ATTR_WIFI,
@@ -37,13 +44,86 @@ from .const import (
     CONF_MQTT_PASSWORD,
     CONF_MQTT_PORT,
     CONF_MQTT_USERNAME,
+    CONF_HISTORY,
+    CONF_HISTORY_RETENTION_DAYS,
+    CONF_PUSH,
+    CONF_USE_HA_MQTT,
+    CONF_FLEET_STORE,
+    CONF_MQTT_RETAINED,
+    CONF_LOCAL_CONTROL,
+    CONF_SHARDS,
+    CONF_HEDGED_FETCH,
+    DEFAULT_HISTORY_RETENTION_DAYS,
     DEFAULT_UPDATE_INTERVAL,
+    DEVICE_STALE_AFTER,
     DOMAIN,
+    LISTENER_TELEMETRY,
+    LOCAL_PROBE_INTERVAL,
+    MQTT_TOPIC_DETECTION,
+    MQTT_STALE_AFTER,
     MQTT_TOPIC_STATUS,
+    PERFORMANCE_TICK_INTERVAL,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_SUMMARY_UPDATED,
+    SIGNAL_DETECTIONS_DECAYED,
 )
+from .aim import AimController
+from .api import BackendUnavailable, CommandNotSent, validate_login
+from .detections import DetectionTracker, parse_timestamp
+from .fleet import FleetStore, load_numpy
+from .hedge import (
+    FETCH_DEADLINE,
+    STALE_SNAPSHOT_MAX,
+    FetchStats,
+    async_hedged,
+    hedge_delay,
+)
+from .local import (
+    PATH_API,
+    PATH_LOCAL,
+    PATH_MQTT,
+    SLOW_PATH_MS,
+    LocalTransport,
+    PathSelector,
+)
+from .metrics import CoordinatorMetrics
+from .mqtt_pool import MqttConnection, async_get_pool
+from .optimistic import OptimisticOverlay
+from .push import TaubenschiesserPushClient
+from .retained import RetainedTelemetry, position_from_payload
+from .shards import (
+    Shard,
+    ShardScheduler,
+    assign_phases,
+    async_get_rate_limiter,
+    parse_shards,
+)
+from .summary import FleetSummary
+from .tokens import TokenStore
+from .watchdog import StalenessWatchdog
+
+if TYPE_CHECKING:
+    from .capture import TrafficCapture
+    from .history import HistoryStore
+    from .statistics import DetectionStatisticsImporter
 
 _LOGGER = logging.getLogger(__name__)
 
+# Device fields fed by MQTT / live telemetry (rendered by telemetry entities)
+TELEMETRY_KEYS = frozenset(
+    {
+        ATTR_ROTATION,
+        ATTR_TILT,
+        ATTR_MOVING,
+        ATTR_LASER,
+        ATTR_WIFI,
+        ATTR_WATERTANK,
+        ATTR_LAST_MQTT,
+        ATTR_TELEMETRY_RESTORED,
+        "liveTelemetry",
+    }
+)
+
 
 class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API and MQTT."""
@@ -65,19 +145,105 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
         self.refresh_token = entry.data.get(CONF_REFRESH_TOKEN)
         self.email = entry.data.get(CONF_EMAIL)  # For re-authentication
         self.password = entry.data.get(CONF_PASSWORD)  # For re-authentication
+        # Rotated tokens live here; entry.data keeps the tokens from setup
+        self.tokens = TokenStore(hass, entry.entry_id)
         self.session = async_get_clientsession(hass)
+        # Device list requests of all entries on this backend share one limiter
+        self.rate_limiter = async_get_rate_limiter(hass, self.api_url)
+        self.shards: list[Shard] = []
+        try:
+            self.shards = parse_shards(
+                entry.options.get(CONF_SHARDS, ""), DEFAULT_UPDATE_INTERVAL
+            )
+        except ValueError as err:
+            _LOGGER.error("Shard-Konfiguration ungültig, frage alle Geräte ab: %s", err)
+        assign_phases(self.shards, entry.entry_id)
+        # Device IDs returned by each shard's last poll
+        self._shard_members: dict[str, set[str]] = {}
+        self.shard_scheduler: ShardScheduler | None = None
+        self.fetch_stats = FetchStats()
+        self._hedged_fetch = entry.options.get(CONF_HEDGED_FETCH, False)
         
         self.mqtt_broker = entry.data.get(CONF_MQTT_BROKER)
         self.mqtt_port = entry.data.get(CONF_MQTT_PORT, 1883)
         self.mqtt_username = entry.data.get(CONF_MQTT_USERNAME)
         self.mqtt_password = entry.data.get(CONF_MQTT_PASSWORD)
         
-        self.mqtt_client: mqtt.Client | None = None
+        self.mqtt: MqttConnection | None = None
         self.devices: dict[str, dict[str, Any]] = {}
+        # Device IP -> ID, replaced (never changed) on the loop; read on the paho thread
+        self._device_ids_by_ip: dict[str, str] = {}
         self.device_positions: dict[str, dict[str, Any]] = {}
+        # Optional columnar store; replaces device_positions when enabled
+        self.fleet: FleetStore | None = None
         self._mqtt_debounce_handle: asyncio.TimerHandle | None = None
         self._mqtt_debounce_seconds: float = 3.0
+        self._mqtt_debounce_started: float | None = None
+        self._subscribed_topics: set[str] = set()
         self._token_expired_notified = False
+        # Hedged fetches may hit a 401 together; a refresh token is single-use
+        self._token_lock = asyncio.Lock()
+        self.metrics = CoordinatorMetrics()
+        self._performance_listeners: list[CALLBACK_TYPE] = []
+        self._performance_tick_unsub: CALLBACK_TYPE | None = None
+        self._known_device_ids: set[str] | None = None
+        self._added_device_ids: set[str] = set()
+        self._removed_device_ids: set[str] = set()
+        # Push-only fast path: MQTT flushes wake telemetry entities only
+        self.telemetry = DataUpdateCoordinator(
+            hass, _LOGGER, name=f"{DOMAIN}_telemetry"
+        )
+        self._sync_devices_unsub: CALLBACK_TYPE | None = self.async_add_listener(
+            self._async_sync_devices
+        )
+        self.optimistic = OptimisticOverlay()
+        self.summary = FleetSummary(MQTT_STALE_AFTER)
+        self._summary_changed: set[str] = set()
+        self._summary_tick_unsub: CALLBACK_TYPE | None = None
+        # IPs seen by the paho thread, taken over by the loop under the lock;
+        # the first message after a flush opens the next debounce window
+        self._mqtt_seen_lock = threading.Lock()
+        self._mqtt_seen_ips: set[str] = set()
+        self._mqtt_last_message_at = 0.0
+        self._mqtt_window_open = False
+        # IPs taken over in the current window (loop only)
+        self._mqtt_window_ips: set[str] = set()
+        self._optimistic_expiry_unsub: CALLBACK_TYPE | None = None
+        self.watchdog = StalenessWatchdog(
+            hass,
+            DEVICE_STALE_AFTER,
+            self._async_device_availability_changed,
+            self._mqtt_last_seen,
+        )
+        self._availability_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self.detections = DetectionTracker(hass, entry.entry_id)
+        self.retained = RetainedTelemetry(hass, entry.entry_id)
+        self._mqtt_retained = entry.options.get(CONF_MQTT_RETAINED, False)
+        # Command paths per device IP (MQTT, LAN HTTP, backend API)
+        self.path_selectors: dict[str, PathSelector] = {}
+        self.local: LocalTransport | None = None
+        self._local_probe_unsub: CALLBACK_TYPE | None = None
+        if entry.options.get(CONF_LOCAL_CONTROL, False):
+            self.local = LocalTransport()
+        self.aim = AimController(self)
+        self.capture: TrafficCapture | None = None
+        self.history: HistoryStore | None = None
+        if entry.options.get(CONF_HISTORY, False):
+            # Imported lazily: most entries run without the SQLite history
+            from .history import HistoryStore
+
+            self.history = HistoryStore(
+                hass,
+                hass.config.path(f"{DOMAIN}_history_{entry.entry_id}.db"),
+                entry.options.get(
+                    CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS
+                ),
+            )
+        self._history_telemetry_at: dict[str, float] = {}
+        self.statistics: DetectionStatisticsImporter | None = None
+        self.push: TaubenschiesserPushClient | None = None
+        if entry.options.get(CONF_PUSH, False):
+            self.push = TaubenschiesserPushClient(self)
 
     @staticmethod
     def build_shoot_command(taubenschiesser: dict[str, Any] | None) -> dict[str, Any]:
@@ -116,7 +282,11 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
         """Merge watertank from MQTT cache or API liveTelemetry (not persisted in MongoDB)."""
         device_ip = device.get("taubenschiesser", {}).get("ip")
         watertank = None
-        if device_ip and device_ip in self.device_positions:
+        if device_ip and self.fleet is not None:
+            view = self.fleet.view_by_ip(device_ip)
+            if view is not None and view.has_telemetry:
+                watertank = view.watertank
+        elif device_ip and device_ip in self.device_positions:
             pos = self.device_positions[device_ip]
             if "watertank" in pos:
                 watertank = pos.get("watertank")
@@ -125,6 +295,27 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
             watertank = live.get("watertank")
         if watertank is not None:
             device[ATTR_WATERTANK] = bool(watertank)
+            if self.fleet is not None:
+                self.fleet.set_watertank(device.get("_id"), bool(watertank))
+
+    def cached_position(self, device_ip: str) -> dict[str, Any] | None:
+        """Return the cached MQTT position of a device IP."""
+        if self.fleet is not None:
+            view = self.fleet.view_by_ip(device_ip)
+            if view is None or not view.has_telemetry:
+                return None
+            return view.as_position()
+        return self.device_positions.get(device_ip)
+
+    @asynccontextmanager
+    async def _api_request(
+        self, endpoint: str, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Issue an API request and record its round-trip time per endpoint."""
+        started = time.perf_counter()
+        async with self.session.request(method, url, **kwargs) as response:
+            self.metrics.record_api_rtt(endpoint, (time.perf_counter() - started) * 1000)
+            yield response
 
     async def _ensure_token_valid(self) -> None:
         """Ensure access token is valid, refresh if needed."""
@@ -132,9 +323,12 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
             raise UpdateFailed("Kein Access Token verfügbar")
         
         # Try a test request to check if token is still valid
+        self.metrics.auth_checks += 1
         headers = {"Authorization": f"Bearer {self.access_token}"}
         try:
-            async with self.session.get(
+            async with self._api_request(
+                "auth_me",
+                "GET",
                 f"{self.api_url}/api/auth/me",
                 headers=headers,
                 timeout=aiohttp.ClientTimeout(total=5),
@@ -147,17 +341,28 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
                     await self._refresh_token()
         except Exception as e:
             _LOGGER.debug("Fehler beim Token-Check: %s", e)
+            self.metrics.auth_check_failures += 1
             # Try refresh anyway if we have refresh token
             if self.refresh_token:
                 await self._refresh_token()
 
     async def _refresh_token(self) -> None:
-        """Refresh access token using refresh token."""
+        """Refresh access token using refresh token, once for concurrent callers."""
+        expired_token = self.access_token
+        async with self._token_lock:
+            if self.access_token != expired_token:
+                return  # Rotated by a concurrent request while waiting
+            await self._async_refresh_token()
+
+    async def _async_refresh_token(self) -> None:
         if not self.refresh_token:
             raise UpdateFailed("Kein Refresh Token verfügbar")
         
+        self.metrics.token_refreshes += 1
         try:
-            async with self.session.post(
+            async with self._api_request(
+                "auth_refresh",
+                "POST",
                 f"{self.api_url}{API_ENDPOINT_REFRESH}",
                 json={"refresh_token": self.refresh_token},
                 timeout=aiohttp.ClientTimeout(total=10),
@@ -174,13 +379,7 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
                     if new_refresh_token:
                         self.refresh_token = new_refresh_token
                     
-                    # Update config entry with new tokens
-                    new_data = self.entry.data.copy()
-                    new_data[CONF_ACCESS_TOKEN] = self.access_token
-                    if new_refresh_token:
-                        new_data[CONF_REFRESH_TOKEN] = self.refresh_token
-                    
-                    self.hass.config_entries.async_update_entry(self.entry, data=new_data)
+                    self.tokens.async_update(self.access_token, new_refresh_token)
                     
                     _LOGGER.debug("Token erfolgreich aktualisiert")
                     
@@ -212,9 +411,11 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
                     raise UpdateFailed(f"Token-Refresh fehlgeschlagen: HTTP {response.status} - {error_text}")
         except aiohttp.ClientError as e:
             _LOGGER.error("Fehler beim Token-Refresh: %s", e)
+            self.metrics.token_refresh_failures += 1
             raise UpdateFailed(f"Token-Refresh fehlgeschlagen: {e}")
         except Exception as e:
             _LOGGER.error("Fehler beim Token-Refresh: %s", e)
+            self.metrics.token_refresh_failures += 1
             raise UpdateFailed(f"Token-Refresh fehlgeschlagen: {e}")
 
     def _show_token_expired_notification(self) -> None:
@@ -251,23 +452,17 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
                 "Bitte Integration neu konfigurieren."
             )
         
+        self.metrics.reauthentications += 1
         try:
-            # Import validate_login from config_flow
-            from .config_flow import validate_login
-            
             _LOGGER.info("Starte Re-Authentifizierung mit E-Mail: %s", self.email)
-            tokens = await validate_login(self.api_url, self.email, self.password)
+            tokens = await validate_login(
+                self.session, self.api_url, self.email, self.password
+            )
             
             self.access_token = tokens["access_token"]
             self.refresh_token = tokens.get("refresh_token", "")
             
-            # Update config entry with new tokens
-            new_data = self.entry.data.copy()
-            new_data[CONF_ACCESS_TOKEN] = self.access_token
-            if self.refresh_token:
-                new_data[CONF_REFRESH_TOKEN] = self.refresh_token
-            
-            self.hass.config_entries.async_update_entry(self.entry, data=new_data)
+            self.tokens.async_update(self.access_token, self.refresh_token)
             
             _LOGGER.info("Erfolgreich neu authentifiziert")
             
@@ -286,17 +481,467 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Re-Authentifizierung fehlgeschlagen: %s", e)
             raise UpdateFailed(f"Re-Authentifizierung fehlgeschlagen: {e}")
 
+    def _apply_devices(
+        self, devices: list[dict[str, Any]], shard: str | None = None
+    ) -> dict[str, Any]:
+        """Index devices from the API and merge cached MQTT telemetry.
+
+        A shard's list only replaces the devices that shard returned last time;
+        a device leaves only once no shard lists it any more.
+        """
+        previous = self.devices
+        fetched = {device["_id"]: device for device in devices}
+        if shard is None:
+            self.devices = fetched
+        else:
+            dropped = self._shard_members.get(shard, set()) - fetched.keys()
+            self._shard_members[shard] = set(fetched)
+            gone = {
+                device_id
+                for device_id in dropped
+                if not any(device_id in members for members in self._shard_members.values())
+            }
+            self.devices = {
+                device_id: device
+                for device_id, device in previous.items()
+                if device_id not in gone
+            }
+            self.devices.update(fetched)
+        self._diff_device_ids(previous)
+        self._index_device_ips()
+
+        # Merge with MQTT position data
+        for device_id, device in fetched.items():
+            device_ip = device.get("taubenschiesser", {}).get("ip")
+            if self.fleet is not None:
+                self.fleet.add(device_id, device_ip)
+            pos_data = self.cached_position(device_ip) if device_ip else None
+            if pos_data is None and device_ip:
+                # No live message since startup: last known values, never a fake 0
+                pos_data = self.retained.restored.get(device_ip)
+            if pos_data is not None:
+                self._apply_position(device, pos_data)
+            self._merge_device_telemetry(device)
+            self._update_status(device)
+            if self.fleet is not None:
+                self.fleet.set_status(device_id, device[ATTR_STATUS])
+            self._summary_changed |= self.summary.update(device_id, device)
+            self.watchdog.touch_if_changed(device_id, self._freshness_marker(device))
+
+        return {"devices": self.devices}
+
+    @staticmethod
+    def _apply_position(device: dict[str, Any], position: dict[str, Any]) -> None:
+        """Copy a cached or restored position onto a device."""
+        device[ATTR_ROTATION] = position.get("rot", 0)
+        device[ATTR_TILT] = position.get("tilt", 0)
+        device[ATTR_MOVING] = position.get("moving", False)
+        device[ATTR_LASER] = position.get("laser", False)
+        # Extract timeMQTT if available
+        if "timeMQTT" in position:
+            device[ATTR_LAST_MQTT] = position.get("timeMQTT")
+        if "wifi" in position:
+            device[ATTR_WIFI] = position.get("wifi")
+        if "source" in position:
+            device[ATTR_TELEMETRY_RESTORED] = {
+                "source": position["source"],
+                "at": position.get("at"),
+            }
+            if "watertank" in position:
+                device[ATTR_WATERTANK] = bool(position["watertank"])
+        else:
+            device.pop(ATTR_TELEMETRY_RESTORED, None)
+
+    @staticmethod
+    def _freshness_marker(device: dict[str, Any]) -> tuple[Any, Any] | None:
+        """Return the fields that only change when the device reported in.
+
+        None if the backend sends neither field.
+        """
+        live = device.get("liveTelemetry") or {}
+        marker = (
+            device.get("lastSeen"),
+            live.get("updatedAt") if isinstance(live, dict) else None,
+        )
+        return None if marker == (None, None) else marker
+
+    @staticmethod
+    def _update_status(device: dict[str, Any]) -> None:
+        """Set status - use overall status from device, or calculate from taubenschiesserStatus/cameraStatus."""
+        device[ATTR_STATUS] = device.get("status", "unknown")
+        if device[ATTR_STATUS] == "unknown" or not device.get("status"):
+            # Calculate status from component statuses
+            taubenschiesser_status = device.get("taubenschiesserStatus", "offline")
+            camera_status = device.get("cameraStatus", "offline")
+            if taubenschiesser_status == "online" and camera_status == "online":
+                device[ATTR_STATUS] = "online"
+            elif taubenschiesser_status == "error" or camera_status == "error":
+                device[ATTR_STATUS] = "error"
+            elif taubenschiesser_status == "maintenance" or camera_status == "maintenance":
+                device[ATTR_STATUS] = "maintenance"
+            else:
+                device[ATTR_STATUS] = "offline"
+
+    @callback
+    def async_apply_device_delta(self, device_id: str, changes: dict[str, Any]) -> None:
+        """Merge a pushed per-device change set and notify entities."""
+        device = self.devices.get(device_id)
+        if device is None:
+            # Unknown device: let the next poll pick it up with full data
+            self.hass.async_create_task(self.async_request_refresh())
+            return
+
+        if (
+            "status" not in changes
+            and ("taubenschiesserStatus" in changes or "cameraStatus" in changes)
+        ):
+            # The merged status was derived from the component statuses: recompute it
+            device.pop("status", None)
+        device.update(changes)
+        if "taubenschiesser" in changes:
+            self._index_device_ips()
+        if "liveTelemetry" in changes:
+            self._merge_device_telemetry(device)
+        self._update_status(device)
+        if self.fleet is not None:
+            self.fleet.set_status(device_id, device[ATTR_STATUS])
+        self.optimistic.reconcile(
+            device, device_id, time.monotonic(), frozenset(changes)
+        )
+        self._summary_changed |= self.summary.update(device_id, device)
+        self.watchdog.touch_if_changed(device_id, self._freshness_marker(device))
+        self.metrics.push_deltas += 1
+        if not changes.keys() <= TELEMETRY_KEYS:
+            self.async_notify_pushed_data()
+        if changes.keys() & TELEMETRY_KEYS:
+            self.async_notify_telemetry()
+
+    def _device_id_for_ip(self, device_ip: str) -> str | None:
+        """Return the ID of the device at an IP (O(1), safe on the paho thread)."""
+        if self.fleet is not None:
+            return self.fleet.device_id_for_ip(device_ip)
+        return self._device_ids_by_ip.get(device_ip)
+
+    @callback
+    def _index_device_ips(self) -> None:
+        """Rebuild the IP index as a new dict, so readers never see it change."""
+        index: dict[str, str] = {}
+        for device_id, device in self.devices.items():
+            device_ip = device.get("taubenschiesser", {}).get("ip")
+            if device_ip:
+                index[device_ip] = device_id
+        self._device_ids_by_ip = index
+
+    @callback
+    def async_handle_detection(self, device_id: str, payload: dict[str, Any]) -> None:
+        """Record a detection event from MQTT or the push channel."""
+        device = self.devices.get(device_id)
+        if not self.detections.async_record(
+            device_id, device.get("name") if device else None, payload
+        ):
+            return
+        if self.history is not None:
+            timestamp = parse_timestamp(payload.get("timestamp"))
+            count = payload.get("count", 1)
+            self.history.async_record(
+                device_id,
+                "detection",
+                count if isinstance(count, int) and count > 0 else 1,
+                timestamp,
+            )
+            if payload.get("shot") or payload.get("fired"):
+                self.history.async_record(device_id, "shot", None, timestamp)
+        self.async_notify_pushed_data()
+
+    @callback
+    def _async_record_telemetry_history(self) -> None:
+        """Sample WLAN telemetry into the history store (at most once a minute)."""
+        now = time.time()
+        for device_id, device in self.devices.items():
+            wifi = device.get(ATTR_WIFI)
+            if not isinstance(wifi, (int, float)):
+                continue
+            if now - self._history_telemetry_at.get(device_id, 0) < 60:
+                continue
+            self._history_telemetry_at[device_id] = now
+            self.history.async_record(device_id, "wifi", wifi, now)
+
+    @callback
+    def _async_handle_mqtt_detection(self, device_ip: str, payload: dict[str, Any]) -> None:
+        device_id = self._device_id_for_ip(device_ip)
+        if device_id is None:
+            _LOGGER.debug("Erkennung von unbekanntem Gerät %s ignoriert", device_ip)
+            return
+        self.async_handle_detection(device_id, payload)
+
+    @callback
+    def async_notify_pushed_data(self) -> None:
+        """Notify entities of pushed data without postponing the next poll.
+
+        async_set_updated_data() reschedules the poll timer, so frequent pushes
+        would otherwise starve the API consistency sweep.
+        """
+        self.data = {"devices": self.devices}
+        self.async_update_listeners()
+
+    @callback
+    def async_notify_telemetry(self) -> None:
+        """Notify only the entities that render live telemetry."""
+        self.telemetry.data = {"devices": self.devices}
+        self.metrics.listener_callbacks["telemetry"] += len(self.telemetry._listeners)
+        self.telemetry.async_update_listeners()
+        self._async_send_summary()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update API listeners and count the callbacks."""
+        self.metrics.listener_callbacks["api"] += len(self._listeners)
+        super().async_update_listeners()
+        self._async_send_summary()
+
+    @callback
+    def _async_send_summary(self) -> None:
+        """Wake the fleet summary sensors whose counter changed."""
+        if self._summary_changed:
+            changed, self._summary_changed = self._summary_changed, set()
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_SUMMARY_UPDATED.format(entry_id=self.entry.entry_id),
+                changed,
+            )
+
+    @callback
+    def _async_detections_decayed(self, changed: set[str]) -> None:
+        """Wake only the rolling detection sensors of the changed devices."""
+        async_dispatcher_send(
+            self.hass,
+            SIGNAL_DETECTIONS_DECAYED.format(entry_id=self.entry.entry_id),
+            changed,
+        )
+
+    @callback
+    def _async_summary_tick(self, _now: datetime) -> None:
+        """Count devices whose MQTT telemetry went stale."""
+        self._summary_changed |= self.summary.expire(time.monotonic())
+        self._async_send_summary()
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Attach telemetry entities to the push-only telemetry coordinator."""
+        if context == LISTENER_TELEMETRY:
+            return self.telemetry.async_add_listener(update_callback, context)
+        return super().async_add_listener(update_callback, context)
+
+    def _diff_device_ids(self, previous: dict[str, dict[str, Any]]) -> None:
+        """Remember which device IDs appeared or disappeared since the last poll."""
+        current = set(self.devices)
+        if self._known_device_ids is None:
+            self._known_device_ids = current
+            return
+        self._added_device_ids |= current - self._known_device_ids
+        removed = self._known_device_ids - current
+        self._added_device_ids -= removed
+        for device_id in removed:
+            self._removed_device_ids.add(device_id)
+            device_ip = previous.get(device_id, {}).get("taubenschiesser", {}).get("ip")
+            if device_ip:
+                self.device_positions.pop(device_ip, None)
+                self.retained.async_forget(device_ip)
+                self.path_selectors.pop(device_ip, None)
+            if self.fleet is not None:
+                self.fleet.remove(device_id)
+            self._summary_changed |= self.summary.remove(device_id)
+            self.watchdog.remove(device_id)
+            self._availability_listeners.pop(device_id, None)
+        self._known_device_ids = current
+
+    @callback
+    def _async_sync_devices(self) -> None:
+        """Add entities for new devices and remove devices gone from the backend."""
+        if self._added_device_ids:
+            added, self._added_device_ids = self._added_device_ids, set()
+            _LOGGER.info("Neue Geräte erkannt: %s", ", ".join(sorted(added)))
+            async_dispatcher_send(
+                self.hass, SIGNAL_DEVICES_ADDED.format(entry_id=self.entry.entry_id), added
+            )
+
+        if self._removed_device_ids:
+            removed, self._removed_device_ids = self._removed_device_ids, set()
+            device_registry = dr.async_get(self.hass)
+            for device_id in removed:
+                device_entry = device_registry.async_get_device(
+                    identifiers={(DOMAIN, device_id)}
+                )
+                if device_entry is None:
+                    continue
+                _LOGGER.info("Gerät %s wurde im Backend entfernt", device_id)
+                # Removing the config entry from the device also removes its entities
+                device_registry.async_update_device(
+                    device_entry.id, remove_config_entry_id=self.entry.entry_id
+                )
+            if self.mqtt is not None:
+                self.hass.async_create_task(self._async_unsubscribe_stale_topics())
+
+    async def _async_parse_devices(
+        self, response: aiohttp.ClientResponse, shard: str | None = None
+    ) -> dict[str, Any]:
+        """Read and decode the device list, recording size and parse time."""
+        body = await response.read()
+        started = time.perf_counter()
+        devices = json.loads(body)
+        if self.capture is not None:
+            # Recorded before _apply_devices merges telemetry into the dicts
+            self.capture.record_api(
+                f"devices:{shard}" if shard else "devices", response.status, devices
+            )
+        data = self._apply_devices(devices, shard)
+        self.metrics.parse_duration.record((time.perf_counter() - started) * 1000)
+        self.metrics.last_poll_bytes = len(body)
+        return data
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from API."""
+        started = time.perf_counter()
+        sampled_at = time.monotonic()
+        self.metrics.polls += 1
+        try:
+            if self.shards:
+                data = await self._async_fetch_shards()
+            else:
+                data = await self._async_fetch_bounded()
+        except BackendUnavailable as err:
+            self.metrics.poll_failures += 1
+            if self._can_serve_stale():
+                return self._serve_stale(err)
+            self._count_blip()
+            raise
+        except Exception:
+            self.metrics.poll_failures += 1
+            self._count_blip()
+            raise
+        finally:
+            self.metrics.poll_duration.record((time.perf_counter() - started) * 1000)
+        self.metrics.last_successful_poll = time.time()
+        if self.fetch_stats.stale_since is not None:
+            _LOGGER.info(
+                "Backend wieder erreichbar nach %.0f s mit altem Stand",
+                time.time() - self.fetch_stats.stale_since,
+            )
+            self.fetch_stats.stale_since = None
+        self._reconcile_polled(sampled_at)
+        # Polled liveTelemetry may have changed what telemetry entities show
+        self.async_notify_telemetry()
+        return data
+
+    async def _async_fetch_bounded(self, shard: Shard | None = None) -> dict[str, Any]:
+        """Fetch within FETCH_DEADLINE, hedging a slow request if enabled."""
+        self.fetch_stats.requests += 1
+        delay = hedge_delay(self.metrics.poll_duration) if self._hedged_fetch else None
+        deadline = asyncio.timeout(FETCH_DEADLINE)
+        try:
+            async with deadline:
+                return await async_hedged(
+                    # The hedge skips the token check the primary just did
+                    lambda hedge: self._async_fetch_devices(shard, check_token=not hedge),
+                    delay,
+                    self.fetch_stats,
+                )
+        except TimeoutError as err:
+            if deadline.expired():
+                self.fetch_stats.deadline_exceeded += 1
+            raise BackendUnavailable(
+                f"Geräteliste nicht innerhalb von {FETCH_DEADLINE:.0f} s erhalten"
+            ) from err
+
+    def _can_serve_stale(self) -> bool:
+        """Return True while the last snapshot may stand in for a failed poll."""
+        if self.data is None or not self.devices:
+            return False
+        stale_since = self.fetch_stats.stale_since
+        return stale_since is None or time.time() - stale_since < STALE_SNAPSHOT_MAX
+
+    def _serve_stale(self, err: Exception) -> dict[str, Any]:
+        """Keep the entities on the last snapshot instead of failing the update."""
+        if self.fetch_stats.stale_since is None:
+            self.fetch_stats.stale_since = time.time()
+            if self.last_update_success:
+                self.fetch_stats.blips_avoided += 1
+            _LOGGER.warning("Backend nicht erreichbar, zeige letzten Stand: %s", err)
+        self.fetch_stats.stale_serves += 1
+        return {"devices": self.devices, "stale_since": self.fetch_stats.stale_since}
+
+    def _count_blip(self) -> None:
+        """Count a failed update that turns every entity unavailable."""
+        if self.last_update_success:
+            self.fetch_stats.blips += 1
+
+    @property
+    def snapshot_stale(self) -> bool:
+        """Return True while entities show a snapshot from before a backend outage."""
+        return self.fetch_stats.stale_since is not None
+
+    def _reconcile_polled(self, sampled_at: float) -> None:
+        """Confirm or keep pending optimistic writes against polled data."""
+        if self.optimistic.pending:
+            # Telemetry in the device list is only the cached MQTT state
+            ignore = TELEMETRY_KEYS if self.mqtt is not None else frozenset()
+            for device_id, device in self.devices.items():
+                self.optimistic.reconcile(device, device_id, sampled_at, None, ignore)
+
+    async def _async_fetch_shards(self) -> dict[str, Any]:
+        """Fetch every shard at once (first refresh and requested refreshes)."""
+        results = await asyncio.gather(
+            *(self._async_fetch_bounded(shard) for shard in self.shards),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if len(errors) == len(results):
+            raise errors[0]
+        for shard, result in zip(self.shards, results):
+            shard.devices = len(self._shard_members.get(shard.name, ()))
+            if isinstance(result, BaseException):
+                shard.failures += 1
+                _LOGGER.warning("Abfrage von Shard %s fehlgeschlagen: %s", shard.name, result)
+        return {"devices": self.devices}
+
+    async def _async_poll_shard(self, shard: Shard) -> None:
+        """Scheduled poll of one shard; notifies like a push."""
+        sampled_at = time.monotonic()
+        started = time.perf_counter()
+        self.metrics.polls += 1
+        try:
+            await self._async_fetch_bounded(shard)
+        except Exception:
+            self.metrics.poll_failures += 1
+            raise
+        finally:
+            self.metrics.poll_duration.record((time.perf_counter() - started) * 1000)
+        self.metrics.last_successful_poll = time.time()
+        shard.devices = len(self._shard_members[shard.name])
+        self._reconcile_polled(sampled_at)
+        self.async_notify_pushed_data()
+        self.async_notify_telemetry()
+
+    async def _async_fetch_devices(
+        self, shard: Shard | None = None, check_token: bool = True
+    ) -> dict[str, Any]:
+        """Fetch the device list (or one shard), refreshing the token once on 401."""
         try:
             # Ensure token is valid (will refresh if needed)
-            if self.refresh_token:
+            if check_token and self.refresh_token:
                 await self._ensure_token_valid()
             
             headers = {"Authorization": f"Bearer {self.access_token}"}
-            async with self.session.get(
+            params = shard.params if shard is not None else None
+            shard_name = shard.name if shard is not None else None
+            async with self.rate_limiter.acquire(), self._api_request(
+                "devices",
+                "GET",
                 f"{self.api_url}{API_ENDPOINT_DEVICES}",
                 headers=headers,
+                params=params,
                 timeout=aiohttp.ClientTimeout(total=10),
             ) as response:
                 if response.status == 200:
@@ -311,269 +956,644 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
                         )
                         self._token_expired_notified = False
                     
-                    devices = await response.json()
-                    self.devices = {device["_id"]: device for device in devices}
-                    
-                    # Merge with MQTT position data
-                    for device_id, device in self.devices.items():
-                        device_ip = device.get("taubenschiesser", {}).get("ip")
-                        if device_ip and device_ip in self.device_positions:
-                            pos_data = self.device_positions[device_ip]
-                            device[ATTR_ROTATION] = pos_data.get("rot", 0)
-                            device[ATTR_TILT] = pos_data.get("tilt", 0)
-                            device[ATTR_MOVING] = pos_data.get("moving", False)
-                            # Extract timeMQTT if available
-                            if "timeMQTT" in pos_data:
-                                device[ATTR_LAST_MQTT] = pos_data.get("timeMQTT")
-                            if "wifi" in pos_data:
-                                device[ATTR_WIFI] = pos_data.get("wifi")
-                        else:
-                            device[ATTR_ROTATION] = 0
-                            device[ATTR_TILT] = 0
-                            device[ATTR_MOVING] = False
-                        self._merge_device_telemetry(device)
-                        
-                        # Set status - use overall status from device, or calculate from taubenschiesserStatus/cameraStatus
-                        device[ATTR_STATUS] = device.get("status", "unknown")
-                        if device[ATTR_STATUS] == "unknown" or not device.get("status"):
-                            # Calculate status from component statuses
-                            taubenschiesser_status = device.get("taubenschiesserStatus", "offline")
-                            camera_status = device.get("cameraStatus", "offline")
-                            if taubenschiesser_status == "online" and camera_status == "online":
-                                device[ATTR_STATUS] = "online"
-                            elif taubenschiesser_status == "error" or camera_status == "error":
-                                device[ATTR_STATUS] = "error"
-                            elif taubenschiesser_status == "maintenance" or camera_status == "maintenance":
-                                device[ATTR_STATUS] = "maintenance"
-                            else:
-                                device[ATTR_STATUS] = "offline"
+                    data = await self._async_parse_devices(response, shard_name)
                     
-                    # Subscribe to new devices if MQTT is connected
-                    if self.mqtt_client and self.mqtt_client.is_connected():
-                        await self.hass.async_add_executor_job(
-                            self._subscribe_to_devices, self.mqtt_client
-                        )
+                    # Route topics of new devices to this coordinator
+                    if self.mqtt is not None:
+                        await self._async_subscribe_to_devices()
                     
-                    return {"devices": self.devices}
-                elif response.status == 401:
-                    # Token expired or invalid
+                    return data
+                elif response.status != 401:
                     error_text = await response.text()
-                    
-                    # Try to refresh if we have refresh token
-                    if self.refresh_token:
-                        try:
-                            self._show_token_expired_notification()
-                            await self._refresh_token()
-                            # Retry request with new token
-                            headers = {"Authorization": f"Bearer {self.access_token}"}
-                            async with self.session.get(
-                                f"{self.api_url}{API_ENDPOINT_DEVICES}",
-                                headers=headers,
-                                timeout=aiohttp.ClientTimeout(total=10),
-                            ) as retry_response:
-                                if retry_response.status == 200:
-                                    devices = await retry_response.json()
-                                    self.devices = {device["_id"]: device for device in devices}
-                                    
-                                    # Merge with MQTT position data
-                                    for device_id, device in self.devices.items():
-                                        device_ip = device.get("taubenschiesser", {}).get("ip")
-                                        if device_ip and device_ip in self.device_positions:
-                                            pos_data = self.device_positions[device_ip]
-                                            device[ATTR_ROTATION] = pos_data.get("rot", 0)
-                                            device[ATTR_TILT] = pos_data.get("tilt", 0)
-                                            device[ATTR_MOVING] = pos_data.get("moving", False)
-                                            # Extract timeMQTT if available
-                                            if "timeMQTT" in pos_data:
-                                                device[ATTR_LAST_MQTT] = pos_data.get("timeMQTT")
-                                            if "wifi" in pos_data:
-                                                device[ATTR_WIFI] = pos_data.get("wifi")
-                                        else:
-                                            device[ATTR_ROTATION] = 0
-                                            device[ATTR_TILT] = 0
-                                            device[ATTR_MOVING] = False
-                                        self._merge_device_telemetry(device)
-                                        
-                                        # Set status
-                                        device[ATTR_STATUS] = device.get("status", "unknown")
-                                        if device[ATTR_STATUS] == "unknown" or not device.get("status"):
-                                            taubenschiesser_status = device.get("taubenschiesserStatus", "offline")
-                                            camera_status = device.get("cameraStatus", "offline")
-                                            if taubenschiesser_status == "online" and camera_status == "online":
-                                                device[ATTR_STATUS] = "online"
-                                            elif taubenschiesser_status == "error" or camera_status == "error":
-                                                device[ATTR_STATUS] = "error"
-                                            elif taubenschiesser_status == "maintenance" or camera_status == "maintenance":
-                                                device[ATTR_STATUS] = "maintenance"
-                                            else:
-                                                device[ATTR_STATUS] = "offline"
-                                    
-                                    return {"devices": self.devices}
-                                else:
-                                    raise UpdateFailed(
-                                        f"API-Fehler nach Token-Refresh (Status {retry_response.status})"
-                                    )
-                        except Exception as refresh_err:
-                            _LOGGER.error("Fehler beim Token-Refresh: %s", refresh_err)
-                            raise UpdateFailed(
-                                "API Token ist abgelaufen und konnte nicht erneuert werden. "
-                                "Bitte konfiguriere die Integration neu."
-                            )
+                    # 5xx: the backend is struggling, the last snapshot stays valid
+                    error = BackendUnavailable if response.status >= 500 else UpdateFailed
+                    raise error(
+                        f"API-Fehler (Status {response.status}): {error_text}"
+                    )
+                # Token expired or invalid: refresh and retry below, after the
+                # limiter slot is released (it is shared by all entries)
+                await response.text()
+
+            # Try to refresh if we have refresh token
+            if not self.refresh_token:
+                self._show_token_expired_notification()
+                raise UpdateFailed(
+                    "API Token ist abgelaufen. Bitte konfiguriere die Integration neu."
+                )
+            try:
+                self._show_token_expired_notification()
+                await self._refresh_token()
+                # Retry request with new token
+                headers = {"Authorization": f"Bearer {self.access_token}"}
+                async with self.rate_limiter.acquire(), self._api_request(
+                    "devices",
+                    "GET",
+                    f"{self.api_url}{API_ENDPOINT_DEVICES}",
+                    headers=headers,
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=10),
+                ) as retry_response:
+                    if retry_response.status == 200:
+                        return await self._async_parse_devices(retry_response, shard_name)
                     else:
-                        self._show_token_expired_notification()
                         raise UpdateFailed(
-                            "API Token ist abgelaufen. Bitte konfiguriere die Integration neu."
+                            f"API-Fehler nach Token-Refresh (Status {retry_response.status})"
                         )
-                else:
-                    error_text = await response.text()
-                    raise UpdateFailed(
-                        f"API-Fehler (Status {response.status}): {error_text}"
-                    )
+            except Exception as refresh_err:
+                _LOGGER.error("Fehler beim Token-Refresh: %s", refresh_err)
+                raise UpdateFailed(
+                    "API Token ist abgelaufen und konnte nicht erneuert werden. "
+                    "Bitte konfiguriere die Integration neu."
+                )
         except aiohttp.ClientError as err:
-            raise UpdateFailed(f"Netzwerkfehler bei API-Verbindung: {err}") from err
+            raise BackendUnavailable(f"Netzwerkfehler bei API-Verbindung: {err}") from err
 
     async def async_config_entry_first_refresh(self) -> None:
         """Refresh data for the first time and setup MQTT if configured."""
-        await super().async_config_entry_first_refresh()
-        
+        started = time.perf_counter()
+        # Independent storage loads; each waits on the executor
+        await asyncio.gather(
+            self._async_load_tokens(),
+            self.detections.async_load(),
+            self.retained.async_load(),
+            self._async_setup_fleet(),
+            self.history.async_setup() if self.history is not None else asyncio.sleep(0),
+        )
+        self.metrics.record_setup("storage", (time.perf_counter() - started) * 1000)
+
+        # The broker handshake overlaps the first API request; whichever
+        # finishes last subscribes the device topics
+        phases = [
+            self._async_timed("first_refresh", super().async_config_entry_first_refresh())
+        ]
         if self.mqtt_broker:
-            await self._setup_mqtt()
+            phases.append(self._async_timed("mqtt_connect", self._setup_mqtt()))
+        results = await asyncio.gather(*phases, return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            # The entry is retried from scratch: release MQTT, the history
+            # database and every listener opened so far
+            await self.async_shutdown()
+            raise errors[0]
 
-    def _schedule_mqtt_debounced_update(self) -> None:
-        """Schedule a single coordinator update after a quiet period (debounce)."""
-        if self._mqtt_debounce_handle is not None:
-            self._mqtt_debounce_handle.cancel()
-        self._mqtt_debounce_handle = self.hass.loop.call_later(
-            self._mqtt_debounce_seconds,
-            self._mqtt_debounce_flush,
+        self.detections.async_start(self._async_detections_decayed)
+        self._summary_tick_unsub = async_track_time_interval(
+            self.hass, self._async_summary_tick, timedelta(seconds=30)
         )
+        if "recorder" in self.hass.config.components:
+            # Imported lazily: the recorder pulls in SQLAlchemy
+            from .statistics import DetectionStatisticsImporter
+
+            self.statistics = DetectionStatisticsImporter(self)
+            self.statistics.async_start()
+
+        if self.shards:
+            # Shards poll on their own schedule from now on
+            self.update_interval = None
+            self._unschedule_refresh()
+            self.shard_scheduler = ShardScheduler(
+                self.hass, self.shards, self._async_poll_shard
+            )
+            self.shard_scheduler.async_start()
+
+        if self.push is not None:
+            self.push.async_start()
+
+        if self.local is not None:
+            self._local_probe_unsub = async_track_time_interval(
+                self.hass,
+                self._async_probe_local,
+                timedelta(seconds=LOCAL_PROBE_INTERVAL),
+            )
+
+    async def _async_load_tokens(self) -> None:
+        """Prefer tokens rotated since setup over those in the entry data."""
+        if await self.tokens.async_load():
+            self.access_token = self.tokens.access_token
+            self.refresh_token = self.tokens.refresh_token or self.refresh_token
+
+    async def _async_setup_fleet(self) -> None:
+        if self.entry.options.get(CONF_FLEET_STORE, False):
+            self.fleet = FleetStore(
+                await self.hass.async_add_executor_job(load_numpy)
+            )
+
+    async def _async_timed(self, phase: str, awaitable: Awaitable[None]) -> None:
+        """Await a setup phase and record its duration."""
+        started = time.perf_counter()
+        try:
+            await awaitable
+        finally:
+            self.metrics.record_setup(phase, (time.perf_counter() - started) * 1000)
 
-    def _mqtt_debounce_flush(self) -> None:
-        """Run after debounce delay; notify entities of MQTT data."""
+    @callback
+    def async_add_performance_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Register a performance entity on the shared low-frequency tick."""
+        self._performance_listeners.append(update_callback)
+        if self._performance_tick_unsub is None:
+            self._performance_tick_unsub = async_track_time_interval(
+                self.hass,
+                self._async_performance_tick,
+                timedelta(seconds=PERFORMANCE_TICK_INTERVAL),
+            )
+
+        @callback
+        def remove_listener() -> None:
+            self._performance_listeners.remove(update_callback)
+            if not self._performance_listeners and self._performance_tick_unsub:
+                self._performance_tick_unsub()
+                self._performance_tick_unsub = None
+
+        return remove_listener
+
+    @callback
+    def async_add_availability_listener(
+        self, device_id: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Register an entity to be written when its device goes stale or recovers."""
+        self._availability_listeners.setdefault(device_id, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners = self._availability_listeners.get(device_id)
+            if listeners and update_callback in listeners:
+                listeners.remove(update_callback)
+                if not listeners:
+                    del self._availability_listeners[device_id]
+
+        return remove_listener
+
+    def device_available(self, device_id: str) -> bool:
+        """Return False while a device's telemetry is overdue."""
+        return not self.watchdog.is_stale(device_id)
+
+    @callback
+    def _async_device_availability_changed(self, device_id: str, available: bool) -> None:
+        """Write only the entities of the device whose deadline passed or reset."""
+        if available and self.history is not None:
+            outages = self.watchdog.outages[device_id]
+            self.history.async_record(
+                device_id,
+                "outage",
+                outages.last_end - outages.last_start,
+                outages.last_start,
+            )
+        for update_callback in list(self._availability_listeners.get(device_id, ())):
+            update_callback()
+
+    def _mqtt_last_seen(self, device_id: str) -> float | None:
+        """Return the monotonic time of the last MQTT message of a device."""
+        device = self.devices.get(device_id)
+        device_ip = device.get("taubenschiesser", {}).get("ip") if device else None
+        counter = self.metrics.mqtt_messages_by_device.get(device_ip)
+        return counter.last_at if counter else None
+
+    @callback
+    def _async_performance_tick(self, _now: datetime) -> None:
+        """Write all performance entities in one pass."""
+        for update_callback in list(self._performance_listeners):
+            update_callback()
+
+    def _mqtt_message_seen(self, device_ip: str) -> None:
+        """Note a live device message (may run on the paho thread).
+
+        Only the first message after a flush hands over to the loop; later
+        ones are picked up when the debounce timer checks for quiet.
+        """
+        with self._mqtt_seen_lock:
+            self._mqtt_seen_ips.add(device_ip)
+            self._mqtt_last_message_at = time.monotonic()
+            self.metrics.mqtt_pending += 1
+            if self.metrics.mqtt_pending > self.metrics.mqtt_pending_max:
+                self.metrics.mqtt_pending_max = self.metrics.mqtt_pending
+            if self._mqtt_window_open:
+                return
+            self._mqtt_window_open = True
+        self.hass.loop.call_soon_threadsafe(self._async_open_mqtt_window)
+
+    @callback
+    def _async_open_mqtt_window(self) -> None:
+        """Start the debounce window opened by the first message after a flush."""
+        self._mqtt_debounce_started = time.perf_counter()
+        self._mqtt_debounce_check()
+
+    @callback
+    def _mqtt_debounce_check(self) -> None:
+        """Flush after a quiet period (debounce); wait on while messages arrive."""
         self._mqtt_debounce_handle = None
-        self.hass.async_create_task(self._async_mqtt_flush())
+        with self._mqtt_seen_lock:
+            seen, self._mqtt_seen_ips = self._mqtt_seen_ips, set()
+            quiet = time.monotonic() - self._mqtt_last_message_at
+        self._async_take_mqtt_seen(seen)
+        if quiet < self._mqtt_debounce_seconds:
+            self._mqtt_debounce_handle = self.hass.loop.call_later(
+                self._mqtt_debounce_seconds - quiet, self._mqtt_debounce_check
+            )
+        else:
+            self.hass.async_create_task(self._async_mqtt_flush())
+
+    @callback
+    def _async_take_mqtt_seen(self, seen: set[str]) -> None:
+        """Take over IPs from the paho thread; stale devices recover at once."""
+        self._mqtt_window_ips |= seen
+        for device_ip in seen:
+            device_id = self._device_id_for_ip(device_ip)
+            if device_id is not None and self.watchdog.is_stale(device_id):
+                self.watchdog.touch(device_id)
 
     async def _async_mqtt_flush(self) -> None:
-        """Push current device data to coordinator (called after debounce)."""
-        await self.async_set_updated_data({"devices": self.devices})
+        """Push current device data to telemetry entities (called after debounce)."""
+        with self._mqtt_seen_lock:
+            # The next message opens a new window
+            seen, self._mqtt_seen_ips = self._mqtt_seen_ips, set()
+            self._mqtt_window_open = False
+            self.metrics.mqtt_pending = 0
+        self._async_take_mqtt_seen(seen)
+        if self.optimistic.pending:
+            self._async_reconcile_mqtt()
+        if self._mqtt_window_ips:
+            seen, self._mqtt_window_ips = self._mqtt_window_ips, set()
+            now = time.monotonic()
+            for device_ip in seen:
+                position = self.cached_position(device_ip)
+                if position is not None:
+                    self.retained.async_remember(device_ip, position)
+                device_id = self._device_id_for_ip(device_ip)
+                if device_id is None or device_id not in self.devices:
+                    continue
+                self._summary_changed |= self.summary.seen(device_id, now)
+                self._summary_changed |= self.summary.update(
+                    device_id, self.devices[device_id]
+                )
+                self.watchdog.touch(device_id, now)
+        self.metrics.mqtt_flush_callbacks += len(self.telemetry._listeners)
+        self.async_notify_telemetry()
+        if self.history is not None:
+            self._async_record_telemetry_history()
+        self.metrics.debounce_flushes += 1
+        if self._mqtt_debounce_started is not None:
+            self.metrics.debounce_flush_latency.record(
+                (time.perf_counter() - self._mqtt_debounce_started) * 1000
+            )
+            self._mqtt_debounce_started = None
 
-    def _subscribe_to_devices(self, client: mqtt.Client) -> None:
-        """Subscribe to MQTT topics for all devices."""
-        for device in self.devices.values():
+    @callback
+    def _async_reconcile_mqtt(self) -> None:
+        """Reconcile pending writes against the latest MQTT state per device."""
+        for device_id in list(self.optimistic.pending):
+            device = self.devices.get(device_id)
+            if device is None:
+                continue
             device_ip = device.get("taubenschiesser", {}).get("ip")
-            if device_ip:
-                topic = MQTT_TOPIC_STATUS.format(ip=device_ip)
-                client.subscribe(topic)
-                _LOGGER.info("Subscribed to %s", topic)
+            counter = self.metrics.mqtt_messages_by_device.get(device_ip)
+            sampled_at = counter.last_at if counter and counter.last_at else 0.0
+            self.optimistic.reconcile(device, device_id, sampled_at, TELEMETRY_KEYS)
 
-    async def _setup_mqtt(self) -> None:
-        """Setup MQTT connection for real-time updates."""
-        if self.mqtt_client:
+    @asynccontextmanager
+    async def async_optimistic(
+        self, device_id: str, fields: dict[str, Any]
+    ) -> AsyncIterator[None]:
+        """Show commanded fields at once; roll them back if the command fails.
+
+        Fields may be dotted (``taubenschiesser.shootUseLaser``).
+        """
+        device = self.devices.get(device_id)
+        if device is not None:
+            self.optimistic.begin(device, device_id, fields)
+            self._summary_changed |= self.summary.update(device_id, device)
+            self._async_notify_fields(fields)
+        try:
+            yield
+        except BaseException:
+            device = self.devices.get(device_id)
+            self.optimistic.rollback(device, device_id, fields)
+            if device is not None:
+                self._summary_changed |= self.summary.update(device_id, device)
+            self._async_notify_fields(fields)
+            self._async_schedule_optimistic_expiry()
+            raise
+        self.optimistic.acknowledge(device_id, fields)
+        self._async_schedule_optimistic_expiry()
+
+    @callback
+    def _async_notify_fields(self, fields) -> None:
+        """Notify the listeners that render the given device fields."""
+        keys = {field.split(".", 1)[0] for field in fields}
+        if keys - TELEMETRY_KEYS:
+            self.async_notify_pushed_data()
+        if keys & TELEMETRY_KEYS:
+            self.async_notify_telemetry()
+
+    @callback
+    def _async_schedule_optimistic_expiry(self) -> None:
+        if self._optimistic_expiry_unsub is not None:
+            self._optimistic_expiry_unsub()
+            self._optimistic_expiry_unsub = None
+        next_expiry = self.optimistic.next_expiry()
+        if next_expiry is not None:
+            self._optimistic_expiry_unsub = async_call_later(
+                self.hass,
+                max(next_expiry - time.monotonic(), 0),
+                self._async_expire_optimistic,
+            )
+
+    @callback
+    def _async_expire_optimistic(self, _now: datetime) -> None:
+        """Fall back to authoritative values of unconfirmed writes."""
+        self._optimistic_expiry_unsub = None
+        changed = self.optimistic.expire(self.devices)
+        if changed:
+            self._async_notify_fields(changed)
+        self._async_schedule_optimistic_expiry()
+
+    def _device_topics(self) -> set[str]:
+        """Return the MQTT topics of all known devices."""
+        return {
+            topic_format.format(ip=device_ip)
+            for device in self.devices.values()
+            if (device_ip := device.get("taubenschiesser", {}).get("ip"))
+            for topic_format in (MQTT_TOPIC_STATUS, MQTT_TOPIC_DETECTION)
+        }
+
+    async def _async_subscribe_to_devices(self) -> None:
+        """Route the MQTT topics of all devices to this coordinator."""
+        for topic in self._device_topics() - self._subscribed_topics:
+            self._subscribed_topics.add(topic)
+            await self.mqtt.async_subscribe(topic, self._handle_mqtt_message)
+
+    async def _async_unsubscribe_stale_topics(self) -> None:
+        """Drop the routes of devices that no longer exist."""
+        for topic in self._subscribed_topics - self._device_topics():
+            self._subscribed_topics.discard(topic)
+            await self.mqtt.async_unsubscribe(topic, self._handle_mqtt_message)
+
+    @property
+    def mqtt_connected(self) -> bool:
+        """Return True if the (shared) MQTT connection is up."""
+        return self.mqtt is not None and self.mqtt.connected
+
+    def _cache_position(self, device_ip: str, payload: dict[str, Any]) -> None:
+        """Cache position data - extract timeMQTT and wifi if available."""
+        self.device_positions[device_ip] = position_from_payload(payload)
+
+    @callback
+    def _async_handle_retained_info(self, device_ip: str, payload: dict[str, Any]) -> None:
+        """Show a retained info message as restored (not live) telemetry."""
+        restored = self.retained.async_retained(device_ip, position_from_payload(payload))
+        device_id = self._device_id_for_ip(device_ip)
+        device = self.devices.get(device_id) if device_id else None
+        if restored is None or device is None:
             return
+        self._apply_position(device, restored)
+        self._merge_device_telemetry(device)
+        self.async_notify_telemetry()
 
-        def on_connect(client, userdata, flags, rc):
-            if rc == 0:
-                _LOGGER.info("MQTT connected")
-                # Subscribe to all device status topics
-                self._subscribe_to_devices(client)
-            else:
-                _LOGGER.error("MQTT connection failed with code %s", rc)
+    def _handle_mqtt_message(self, topic: str, payload: Any, retained: bool = False) -> None:
+        """Handle a decoded device message (may run on the paho thread)."""
+        if self.capture is not None:
+            self.capture.record_mqtt(topic, payload, retained)
+        try:
+            topic_parts = topic.split("/")
+            if len(topic_parts) >= 2:
+                device_ip = topic_parts[1]
+                if retained:
+                    # Broker-stored message of unknown age: no sign of life
+                    if (
+                        self._mqtt_retained
+                        and topic_parts[-1] == "info"
+                        and isinstance(payload, dict)
+                    ):
+                        self.hass.loop.call_soon_threadsafe(
+                            self._async_handle_retained_info, device_ip, payload
+                        )
+                    return
+                self.metrics.record_mqtt_message(device_ip)
+                device_id = self._device_id_for_ip(device_ip)
 
-        def on_message(client, userdata, msg):
-            try:
-                payload = json.loads(msg.payload.decode())
-                topic_parts = msg.topic.split("/")
-                if len(topic_parts) >= 2:
-                    device_ip = topic_parts[1]
-                    
-                    # Update position data - extract timeMQTT and wifi if available
-                    position_data = {
-                        "rot": payload.get("Rot", 0),
-                        "tilt": payload.get("Tilt", 0),
-                        "moving": payload.get("moving", False),
-                        "watertank": payload.get("watertank", True),
-                        "cam": payload.get("Cam", False),
-                        "laser": payload.get("laser", False),
-                    }
-                    # Extract timeMQTT if present
-                    if "timeMQTT" in payload:
-                        position_data["timeMQTT"] = payload.get("timeMQTT")
-                    if "wifi" in payload:
-                        position_data["wifi"] = payload.get("wifi")
-                    
-                    self.device_positions[device_ip] = position_data
-                    
-                    # Update device data if we have it
-                    for device_id, device in self.devices.items():
-                        if device.get("taubenschiesser", {}).get("ip") == device_ip:
-                            device[ATTR_ROTATION] = payload.get("Rot", 0)
-                            device[ATTR_TILT] = payload.get("Tilt", 0)
-                            device[ATTR_MOVING] = payload.get("moving", False)
-                            device[ATTR_LASER] = payload.get("laser", False)
-                            # Update timeMQTT if available
-                            if "timeMQTT" in payload:
-                                device[ATTR_LAST_MQTT] = payload.get("timeMQTT")
-                            if "wifi" in payload:
-                                device[ATTR_WIFI] = payload.get("wifi")
-                            self._merge_device_telemetry(device)
-                            break
-                    
-                    # Debounce: notify HA only after a short quiet period (so API refresh can run)
+                if len(topic_parts) >= 3 and topic_parts[2] == "detection":
                     self.hass.loop.call_soon_threadsafe(
-                        self._schedule_mqtt_debounced_update
+                        self._async_handle_mqtt_detection, device_ip, payload
                     )
-            except Exception as err:
-                _LOGGER.error("Error processing MQTT message: %s", err)
+                    self._mqtt_message_seen(device_ip)
+                    return
+                
+                if self.fleet is not None:
+                    self.fleet.update_telemetry(device_ip, payload)
+                else:
+                    self._cache_position(device_ip, payload)
+                
+                # Update device data if we have it
+                device = self.devices.get(device_id) if device_id else None
+                if device is not None:
+                    device[ATTR_ROTATION] = payload.get("Rot", 0)
+                    device[ATTR_TILT] = payload.get("Tilt", 0)
+                    device[ATTR_MOVING] = payload.get("moving", False)
+                    device[ATTR_LASER] = payload.get("laser", False)
+                    device.pop(ATTR_TELEMETRY_RESTORED, None)
+                    # Update timeMQTT if available
+                    if "timeMQTT" in payload:
+                        device[ATTR_LAST_MQTT] = payload.get("timeMQTT")
+                    if "wifi" in payload:
+                        device[ATTR_WIFI] = payload.get("wifi")
+                    self._merge_device_telemetry(device)
+                
+                # Debounce: notify HA only after a short quiet period (so API refresh can run)
+                self._mqtt_message_seen(device_ip)
+        except Exception as err:
+            self.metrics.mqtt_decode_errors += 1
+            _LOGGER.error("Error processing MQTT message: %s", err)
 
-        def on_disconnect(client, userdata, rc):
-            _LOGGER.warning("MQTT disconnected with code %s", rc)
+    async def async_start_capture(self) -> str:
+        """Start recording MQTT, API and push traffic; return the file path."""
+        # Imported lazily: capturing is a debugging aid
+        from .capture import TrafficCapture, capture_path
 
-        self.mqtt_client = mqtt.Client()
-        if self.mqtt_username:
-            self.mqtt_client.username_pw_set(self.mqtt_username, self.mqtt_password)
-        
-        self.mqtt_client.on_connect = on_connect
-        self.mqtt_client.on_message = on_message
-        self.mqtt_client.on_disconnect = on_disconnect
+        if self.capture is not None:
+            return self.capture.path
+        self.capture = TrafficCapture(
+            self.hass,
+            capture_path(self.hass.config.config_dir, self.entry.entry_id),
+            self.entry.entry_id,
+        )
+        self.capture.async_start()
+        return self.capture.path
+
+    async def async_stop_capture(self) -> dict[str, Any] | None:
+        """Stop recording and return its summary."""
+        capture, self.capture = self.capture, None
+        if capture is None:
+            return None
+        await capture.async_stop()
+        return capture.as_dict()
+
+    async def _setup_mqtt(self) -> None:
+        """Attach to the shared MQTT connection for real-time updates."""
+        if self.mqtt is not None:
+            return
 
-        # Connect in executor to avoid blocking
-        await self.hass.async_add_executor_job(
-            self.mqtt_client.connect, self.mqtt_broker, self.mqtt_port, 60
+        self.mqtt = await async_get_pool(self.hass).async_acquire(
+            self.mqtt_broker,
+            self.mqtt_port,
+            self.mqtt_username,
+            self.mqtt_password,
+            self.entry.options.get(CONF_USE_HA_MQTT, False),
         )
-        self.mqtt_client.loop_start()
-        _LOGGER.info("MQTT client started")
         
         # Subscribe to devices after initial data load
         if self.devices:
-            await self.hass.async_add_executor_job(
-                self._subscribe_to_devices, self.mqtt_client
-            )
+            await self._async_subscribe_to_devices()
 
     async def async_shutdown(self) -> None:
         """Shutdown coordinator and MQTT connection."""
+        if self._sync_devices_unsub is not None:
+            self._sync_devices_unsub()
+            self._sync_devices_unsub = None
+        if self.push is not None:
+            await self.push.async_stop()
+        if self.statistics is not None:
+            self.statistics.async_stop()
+        await self.detections.async_stop()
+        await self.retained.async_save()
+        await self.tokens.async_save()
+        if self.history is not None:
+            await self.history.async_close()
         if self._mqtt_debounce_handle is not None:
             self._mqtt_debounce_handle.cancel()
             self._mqtt_debounce_handle = None
-        if self.mqtt_client:
-            self.mqtt_client.loop_stop()
-            self.mqtt_client.disconnect()
-            self.mqtt_client = None
+        if self._performance_tick_unsub is not None:
+            self._performance_tick_unsub()
+            self._performance_tick_unsub = None
+        if self._optimistic_expiry_unsub is not None:
+            self._optimistic_expiry_unsub()
+            self._optimistic_expiry_unsub = None
+        if self._summary_tick_unsub is not None:
+            self._summary_tick_unsub()
+            self._summary_tick_unsub = None
+        if self.shard_scheduler is not None:
+            await self.shard_scheduler.async_stop()
+            self.shard_scheduler = None
+        self.watchdog.async_stop()
+        self.aim.async_stop()
+        await self.async_stop_capture()
+        if self._local_probe_unsub is not None:
+            self._local_probe_unsub()
+            self._local_probe_unsub = None
+        if self.local is not None:
+            await self.local.async_close()
+        await self._async_release_mqtt()
+
+    async def _async_release_mqtt(self) -> None:
+        """Drop this entry's routes and its reference to the shared connection."""
+        if self.mqtt is not None:
+            for topic in self._subscribed_topics:
+                await self.mqtt.async_unsubscribe(topic, self._handle_mqtt_message)
+            self._subscribed_topics.clear()
+            await async_get_pool(self.hass).async_release(self.mqtt)
+            self.mqtt = None
 
     async def send_mqtt_command(self, device_ip: str, command: dict[str, Any]) -> None:
         """Send MQTT command to device."""
-        if not self.mqtt_client or not self.mqtt_client.is_connected():
-            raise Exception("MQTT client not connected")
+        if not self.mqtt_connected:
+            raise CommandNotSent("MQTT client not connected")
         
         topic = f"taubenschiesser/{device_ip}"
         payload = json.dumps(command)
         
-        def publish():
-            result = self.mqtt_client.publish(topic, payload)
-            if result.rc != mqtt.MQTT_ERR_SUCCESS:
-                raise Exception(f"MQTT publish failed: {result.rc}")
-        
-        await self.hass.async_add_executor_job(publish)
+        started = time.perf_counter()
+        await self.mqtt.async_publish(topic, payload)
+        self.metrics.record_publish_latency(
+            device_ip, (time.perf_counter() - started) * 1000
+        )
         _LOGGER.info("Sent MQTT command to %s: %s", topic, payload)
+        if self.history is not None and command.get("type") == "shoot":
+            device_id = self._device_id_for_ip(device_ip)
+            if device_id:
+                self.history.async_record(device_id, "shot")
+
+    async def async_send_device_command(
+        self,
+        device_ip: str,
+        command: dict[str, Any],
+        device_id: str | None = None,
+        api_action: str | None = None,
+    ) -> str:
+        """Send a command over the best available path, falling back on errors.
+
+        MQTT and the LAN HTTP interface take the ESP command JSON; the backend
+        only knows named actions, so it is a candidate only with api_action.
+        Only a path that certainly did not send the command (CommandNotSent) is
+        retried on the next one: shoot and impulse are not idempotent, and a
+        timed out request may still have reached the device.
+        Returns the path that delivered the command.
+        """
+        candidates = []
+        if self.mqtt_connected:
+            candidates.append(PATH_MQTT)
+        if self.local is not None:
+            candidates.append(PATH_LOCAL)
+        if device_id and api_action:
+            candidates.append(PATH_API)
+        if not candidates:
+            raise Exception("MQTT client not connected")
+
+        selector = self.path_selectors.setdefault(device_ip, PathSelector())
+        last_err: Exception | None = None
+        for path in selector.order(candidates):
+            started = time.perf_counter()
+            try:
+                if path == PATH_MQTT:
+                    await self.send_mqtt_command(device_ip, command)
+                elif path == PATH_LOCAL:
+                    await self.local.async_command(device_ip, command)
+                    if self.history is not None and command.get("type") == "shoot":
+                        local_device_id = device_id or self._device_id_for_ip(device_ip)
+                        if local_device_id:
+                            self.history.async_record(local_device_id, "shot")
+                else:
+                    await self.send_api_command(device_id, api_action)
+            except CommandNotSent as err:
+                selector.record_failure(path)
+                last_err = err
+                _LOGGER.warning(
+                    "Befehl an %s über %s fehlgeschlagen: %s", device_ip, path, err
+                )
+                continue
+            except Exception as err:
+                selector.record_failure(path)
+                _LOGGER.warning(
+                    "Befehl an %s über %s möglicherweise zugestellt, "
+                    "kein weiterer Versuch: %s",
+                    device_ip,
+                    path,
+                    err,
+                )
+                raise
+            selector.record_success(path, (time.perf_counter() - started) * 1000)
+            return path
+        raise last_err
+
+    async def _async_probe_local(self, _now: datetime) -> None:
+        """Probe the LAN interface of every device and demote slow ones."""
+        device_ips = {
+            device_ip
+            for device in self.devices.values()
+            if (device_ip := device.get("taubenschiesser", {}).get("ip"))
+        }
+        results = await asyncio.gather(
+            *(self.local.async_probe(device_ip) for device_ip in device_ips),
+            return_exceptions=True,
+        )
+        now = time.monotonic()
+        for device_ip, result in zip(device_ips, results):
+            selector = self.path_selectors.setdefault(device_ip, PathSelector())
+            if isinstance(result, BaseException):
+                selector.record_failure(PATH_LOCAL, now)
+                _LOGGER.debug("Lokale Prüfung von %s fehlgeschlagen: %s", device_ip, result)
+            elif result > SLOW_PATH_MS:
+                selector.record_success(PATH_LOCAL, result)
+                selector.health(PATH_LOCAL).demote(now)
+            else:
+                selector.record_success(PATH_LOCAL, result)
 
     async def send_api_command(self, device_id: str, action: str) -> None:
         """Send command via API."""
@@ -583,7 +1603,9 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
         
         headers = {"Authorization": f"Bearer {self.access_token}"}
         try:
-            async with self.session.post(
+            async with self._api_request(
+                "device_control",
+                "POST",
                 f"{self.api_url}/api/device-control/{device_id}/control",
                 headers=headers,
                 json={"action": action},
@@ -594,7 +1616,9 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
                     if self.refresh_token:
                         await self._refresh_token()
                         headers = {"Authorization": f"Bearer {self.access_token}"}
-                        async with self.session.post(
+                        async with self._api_request(
+                            "device_control",
+                            "POST",
                             f"{self.api_url}/api/device-control/{device_id}/control",
                             headers=headers,
                             json={"action": action},
@@ -614,9 +1638,14 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
                     raise Exception(
                         f"API-Befehl fehlgeschlagen (Status {response.status}): {error_text}"
                     )
+        except aiohttp.ClientConnectorError as err:
+            raise CommandNotSent(f"Backend nicht erreichbar: {err}") from err
         except aiohttp.ClientError as err:
             raise Exception(f"Netzwerkfehler beim Senden des Befehls: {err}") from err
 
+        if self.history is not None and action == "shoot":
+            self.history.async_record(device_id, "shot")
+
     async def send_api_start_pause(self, device_id: str, action: str) -> None:
         """Send start/pause command via API."""
         # Ensure token is valid
@@ -625,7 +1654,9 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
         
         headers = {"Authorization": f"Bearer {self.access_token}"}
         try:
-            async with self.session.post(
+            async with self._api_request(
+                "device_control",
+                "POST",
                 f"{self.api_url}/api/device-control/{device_id}/{action}",
                 headers=headers,
                 timeout=aiohttp.ClientTimeout(total=10),
@@ -635,7 +1666,9 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
                     if self.refresh_token:
                         await self._refresh_token()
                         headers = {"Authorization": f"Bearer {self.access_token}"}
-                        async with self.session.post(
+                        async with self._api_request(
+                            "device_control",
+                            "POST",
                             f"{self.api_url}/api/device-control/{device_id}/{action}",
                             headers=headers,
                             timeout=aiohttp.ClientTimeout(total=10),
@@ -665,7 +1698,9 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
         headers = {"Authorization": f"Bearer {self.access_token}"}
         payload = {"armed": armed}
         try:
-            async with self.session.patch(
+            async with self._api_request(
+                "device_control",
+                "PATCH",
                 f"{self.api_url}/api/device-control/{device_id}/arm",
                 headers=headers,
                 json=payload,
@@ -675,7 +1710,9 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
                     if self.refresh_token:
                         await self._refresh_token()
                         headers = {"Authorization": f"Bearer {self.access_token}"}
-                        async with self.session.patch(
+                        async with self._api_request(
+                            "device_control",
+                            "PATCH",
                             f"{self.api_url}/api/device-control/{device_id}/arm",
                             headers=headers,
                             json=payload,
@@ -708,7 +1745,9 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
         headers = {"Authorization": f"Bearer {self.access_token}"}
         payload = {"taubenschiesser": fields}
         try:
-            async with self.session.put(
+            async with self._api_request(
+                "device_update",
+                "PUT",
                 f"{self.api_url}/api/devices/{device_id}",
                 headers=headers,
                 json=payload,
@@ -718,7 +1757,9 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
                     if self.refresh_token:
                         await self._refresh_token()
                         headers = {"Authorization": f"Bearer {self.access_token}"}
-                        async with self.session.put(
+                        async with self._api_request(
+                            "device_update",
+                            "PUT",
                             f"{self.api_url}/api/devices/{device_id}",
                             headers=headers,
                             json=payload,
@@ -748,7 +1789,7 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
     async def send_esp_device_config(
         self, device_ip: str, use_laser_on_shoot: bool | None = None, use_audio_on_shoot: bool | None = None
     ) -> None:
-        """Sync persisted shoot settings to ESP via MQTT config command."""
+        """Sync persisted shoot settings to ESP via MQTT (or LAN) config command."""
         command: dict[str, Any] = {"type": "config"}
         if use_laser_on_shoot is not None:
             command["useLaserOnShoot"] = use_laser_on_shoot
@@ -756,4 +1797,4 @@ class TaubenschiesserDataUpdateCoordinator(DataUpdateCoordinator):
             command["useAudioOnShoot"] = use_audio_on_shoot
         if len(command) == 1:
             return
-        await self.send_mqtt_command(device_ip, command)
+        await self.async_send_device_command(device_ip, command)
@@ -0,0 +1,244 @@
+"""Detection events and rolling per-device detection counters."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, EVENT_DETECTION
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+MINUTES_PER_DAY = 1440
+HOURLY_BUCKETS = 7 * 24  # keep one week of hourly buckets
+WINDOWS = (5, 60, MINUTES_PER_DAY)
+
+
+class DetectionCounter:
+    """Per-minute ring with running window sums.
+
+    Adding a detection is O(1); advancing time is O(1) per elapsed minute and
+    bounded by one day, so reads stay constant-time amortized.
+    """
+
+    __slots__ = ("ring", "minute", "sums", "hourly", "total", "last_at")
+
+    def __init__(self) -> None:
+        """Initialize an empty counter."""
+        self.ring = [0] * MINUTES_PER_DAY
+        self.minute = int(time.time() // 60)
+        self.sums = dict.fromkeys(WINDOWS, 0)
+        self.hourly: dict[int, int] = {}
+        self.total = 0
+        self.last_at: float | None = None
+
+    def _advance(self, minute: int) -> None:
+        steps = minute - self.minute
+        if steps <= 0:
+            return
+        if steps >= MINUTES_PER_DAY:
+            self.ring = [0] * MINUTES_PER_DAY
+            self.sums = dict.fromkeys(WINDOWS, 0)
+        else:
+            ring = self.ring
+            for current in range(self.minute + 1, minute + 1):
+                for window in WINDOWS:
+                    self.sums[window] -= ring[(current - window) % MINUTES_PER_DAY]
+                ring[current % MINUTES_PER_DAY] = 0
+        self.minute = minute
+
+    def add(self, timestamp: float, count: int = 1) -> None:
+        """Count detections at a unix timestamp."""
+        minute = int(timestamp // 60)
+        self._advance(minute)
+        age = self.minute - minute
+        if age < MINUTES_PER_DAY:
+            self.ring[minute % MINUTES_PER_DAY] += count
+            for window in WINDOWS:
+                if age < window:
+                    self.sums[window] += count
+        hour = int(timestamp // 3600)
+        self.hourly[hour] = self.hourly.get(hour, 0) + count
+        if len(self.hourly) > HOURLY_BUCKETS:
+            del self.hourly[min(self.hourly)]
+        self.total += count
+        if self.last_at is None or timestamp > self.last_at:
+            self.last_at = timestamp
+
+    def window(self, minutes: int, now: float | None = None) -> int:
+        """Return the detections in the last 5, 60 or 1440 minutes."""
+        self._advance(int((now if now is not None else time.time()) // 60))
+        return self.sums[minutes]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a compact persistable form (only non-empty minutes/hours)."""
+        return {
+            "m": self.minute,
+            "r": [
+                [minute, self.ring[minute % MINUTES_PER_DAY]]
+                for minute in range(self.minute - MINUTES_PER_DAY + 1, self.minute + 1)
+                if self.ring[minute % MINUTES_PER_DAY]
+            ],
+            "h": [[hour, count] for hour, count in sorted(self.hourly.items())],
+            "t": self.total,
+            "l": self.last_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DetectionCounter:
+        """Restore a counter saved with as_dict()."""
+        counter = cls()
+        counter.minute = min(int(data.get("m", counter.minute)), counter.minute)
+        for minute, count in data.get("r", []):
+            counter.ring[minute % MINUTES_PER_DAY] = count
+            age = counter.minute - minute
+            for window in WINDOWS:
+                if 0 <= age < window:
+                    counter.sums[window] += count
+        counter.hourly = {int(hour): count for hour, count in data.get("h", [])}
+        counter.total = data.get("t", 0)
+        counter.last_at = data.get("l")
+        return counter
+
+
+class DetectionTracker:
+    """Ingest detection events, fire them on the bus and keep rolling counts."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.counters: dict[str, DetectionCounter] = {}
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.detections.{entry_id}"
+        )
+        self._recent_ids: deque[str] = deque(maxlen=256)
+        self._tick_unsub: CALLBACK_TYPE | None = None
+        self._last_windows: dict[str, tuple[int, ...]] = {}
+        self._update_callback: Callable[[set[str]], None] | None = None
+
+    async def async_load(self) -> None:
+        """Restore persisted counters."""
+        data = await self._store.async_load() or {}
+        for device_id, counter_data in data.get("devices", {}).items():
+            try:
+                self.counters[device_id] = DetectionCounter.from_dict(counter_data)
+            except (TypeError, ValueError) as err:
+                _LOGGER.debug("Erkennungszähler für %s verworfen: %s", device_id, err)
+
+    @callback
+    def async_start(self, update_callback: Callable[[set[str]], None]) -> None:
+        """Start the minute tick that lets rolling windows decay.
+
+        update_callback receives the IDs of devices whose windows changed.
+        """
+        self._update_callback = update_callback
+        self._tick_unsub = async_track_time_interval(
+            self.hass, self._async_tick, timedelta(minutes=1)
+        )
+
+    async def async_stop(self) -> None:
+        """Stop the tick and flush pending state to disk."""
+        if self._tick_unsub is not None:
+            self._tick_unsub()
+            self._tick_unsub = None
+        if self.counters:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the stored counters (entry removed)."""
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "devices": {
+                device_id: counter.as_dict()
+                for device_id, counter in self.counters.items()
+            }
+        }
+
+    def windows(self, device_id: str) -> tuple[int, int, int] | None:
+        """Return (last 5 min, last hour, last day) for a device."""
+        counter = self.counters.get(device_id)
+        if counter is None:
+            return None
+        now = time.time()
+        return tuple(counter.window(window, now) for window in WINDOWS)
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        """Notify entities only if a rolling window changed by decay."""
+        changed: set[str] = set()
+        for device_id in self.counters:
+            windows = self.windows(device_id)
+            if windows != self._last_windows.get(device_id):
+                self._last_windows[device_id] = windows
+                changed.add(device_id)
+        if changed and self._update_callback is not None:
+            self._update_callback(changed)
+
+    @callback
+    def async_record(
+        self, device_id: str, device_name: str | None, payload: dict[str, Any]
+    ) -> bool:
+        """Record one detection event; return False for duplicates."""
+        event_id = payload.get("id") or payload.get("_id")
+        if event_id is not None:
+            event_id = str(event_id)
+            if event_id in self._recent_ids:
+                return False
+            self._recent_ids.append(event_id)
+
+        timestamp = parse_timestamp(payload.get("timestamp"))
+        count = payload.get("count", 1)
+        if not isinstance(count, int) or count < 1:
+            count = 1
+
+        counter = self.counters.get(device_id)
+        if counter is None:
+            counter = self.counters[device_id] = DetectionCounter()
+        counter.add(timestamp, count)
+        self._last_windows[device_id] = self.windows(device_id)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+        event_data = {
+            key: value
+            for key, value in payload.items()
+            if key not in ("_id", "deviceId", "device_id")
+            and isinstance(value, (str, int, float, bool))
+        }
+        event_data.update(
+            {
+                "device_id": device_id,
+                "device_name": device_name,
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "count": count,
+            }
+        )
+        self.hass.bus.async_fire(EVENT_DETECTION, event_data)
+        return True
+
+
+def parse_timestamp(value: Any) -> float:
+    """Return a unix timestamp from epoch seconds/millis or ISO strings."""
+    now = time.time()
+    if isinstance(value, (int, float)):
+        timestamp = value / 1000 if value > 1e11 else float(value)
+    elif isinstance(value, str):
+        try:
+            timestamp = datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return now
+    else:
+        return now
+    # Never count into the future
+    return min(timestamp, now)
@@ -0,0 +1,161 @@
+"""Diagnostics support for Taubenschiesser."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .const import (
+    CONF_ACCESS_TOKEN,
+    CONF_EMAIL,
+    CONF_MQTT_PASSWORD,
+    CONF_MQTT_USERNAME,
+    CONF_PASSWORD,
+    CONF_REFRESH_TOKEN,
+    DOMAIN,
+    MQTT_TOPIC_STATUS,
+)
+from .coordinator import TaubenschiesserDataUpdateCoordinator
+from .hedge import hedge_delay
+from .mqtt_pool import async_get_pool
+
+TO_REDACT = {
+    CONF_ACCESS_TOKEN,
+    CONF_REFRESH_TOKEN,
+    CONF_PASSWORD,
+    CONF_EMAIL,
+    CONF_MQTT_USERNAME,
+    CONF_MQTT_PASSWORD,
+    "token",
+    "apiKey",
+    "password",
+}
+
+
+def _snapshot_size(data: Any) -> int:
+    """Return the size of the coordinator snapshot as serialized JSON."""
+    try:
+        return len(json.dumps(data, default=str).encode())
+    except (TypeError, ValueError):
+        return -1
+
+
+def _coordinator_diagnostics(
+    coordinator: TaubenschiesserDataUpdateCoordinator,
+) -> dict[str, Any]:
+    return {
+        "update_interval_s": (
+            coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None
+        ),
+        "last_update_success": coordinator.last_update_success,
+        "device_count": len(coordinator.devices),
+        "snapshot_bytes": _snapshot_size(coordinator.data),
+        "listeners": {
+            "api": len(coordinator._listeners),
+            "telemetry": len(coordinator.telemetry._listeners),
+        },
+        "mqtt": {
+            "configured": bool(coordinator.mqtt_broker),
+            "connected": coordinator.mqtt_connected,
+            "connection": coordinator.mqtt.as_dict() if coordinator.mqtt else None,
+            "subscriptions": sorted(coordinator._subscribed_topics),
+            "debounce_s": coordinator._mqtt_debounce_seconds,
+            # With the fleet store, positions live in its columns instead
+            "cached_positions": sum(
+                1
+                for slot in coordinator.fleet.slots.values()
+                if coordinator.fleet.last_message[slot] > 0
+            )
+            if coordinator.fleet is not None
+            else len(coordinator.device_positions),
+            "pool_timings_ms": {
+                name: round(value, 1)
+                for name, value in async_get_pool(coordinator.hass).timings.items()
+            },
+        },
+        "push": coordinator.push.as_dict() if coordinator.push else None,
+        "history": coordinator.history.as_dict() if coordinator.history else None,
+        "statistics": (
+            coordinator.statistics.as_dict() if coordinator.statistics else None
+        ),
+        "optimistic": coordinator.optimistic.as_dict(),
+        "fleet": coordinator.fleet.as_dict() if coordinator.fleet else None,
+        "summary": coordinator.summary.as_dict(),
+        "watchdog": coordinator.watchdog.as_dict(),
+        "retained": coordinator.retained.as_dict(),
+        "local": coordinator.local.as_dict() if coordinator.local else None,
+        "shards": coordinator.shard_scheduler.as_dict()
+        if coordinator.shard_scheduler
+        else None,
+        "rate_limiter": coordinator.rate_limiter.as_dict(),
+        "fetch": {
+            **coordinator.fetch_stats.as_dict(),
+            "poll_p95_ms": coordinator.metrics.poll_duration.percentile(95),
+            "poll_p99_ms": coordinator.metrics.poll_duration.percentile(99),
+            "hedge_delay_s": round(hedge_delay(coordinator.metrics.poll_duration), 2),
+        },
+        "aim": coordinator.aim.as_dict(),
+        "tokens": coordinator.tokens.as_dict(),
+        "capture": coordinator.capture.as_dict() if coordinator.capture else None,
+        "metrics": coordinator.metrics.as_dict(),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: TaubenschiesserDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinator": _coordinator_diagnostics(coordinator),
+        "mqtt_devices": {
+            device_ip: coordinator.metrics.device_mqtt_stats(device_ip)
+            for device_ip in coordinator.metrics.mqtt_messages_by_device
+        },
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a single device."""
+    coordinator: TaubenschiesserDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    device_id = next(
+        (identifier for domain, identifier in device.identifiers if domain == DOMAIN),
+        None,
+    )
+    data = coordinator.devices.get(device_id, {}) if device_id else {}
+    device_ip = data.get("taubenschiesser", {}).get("ip")
+
+    return {
+        "device_id": device_id,
+        "device": async_redact_data(data, TO_REDACT),
+        "snapshot_bytes": _snapshot_size(data),
+        "mqtt_position": coordinator.cached_position(device_ip) if device_ip else None,
+        "mqtt": coordinator.metrics.device_mqtt_stats(device_ip),
+        "detections": coordinator.detections.counters[device_id].as_dict()
+        if device_id in coordinator.detections.counters
+        else None,
+        "stale_since": coordinator.watchdog.stale.get(device_id),
+        "command_paths": coordinator.path_selectors[device_ip].as_dict()
+        if device_ip in coordinator.path_selectors
+        else None,
+        "outages": coordinator.watchdog.as_dict()["outages"].get(device_id),
+        "sensor_state_writes": coordinator.metrics.device_state_write_stats(device_id)
+        if device_id
+        else None,
+        "subscribed": bool(device_ip)
+        and MQTT_TOPIC_STATUS.format(ip=device_ip) in coordinator._subscribed_topics,
+    }
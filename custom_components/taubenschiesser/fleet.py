@@ -0,0 +1,287 @@
+"""Struct-of-arrays store for hot per-device telemetry and status."""
+from __future__ import annotations
+
+from array import array
+import math
+import time
+from typing import Any
+
+NAN = math.nan
+
+# Status enum stored per slot; FREE marks unused slots so counts skip them
+STATUSES: tuple[str, ...] = ("unknown", "online", "offline", "error", "maintenance")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+FREE = 255
+
+TANK_UNKNOWN = 0
+TANK_OK = 1
+TANK_EMPTY = 2
+
+
+def load_numpy() -> Any:
+    """Import numpy if available (call from the executor: the import is slow)."""
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return numpy
+
+
+class FleetDeviceView:
+    """Cheap read-only view of one device slot."""
+
+    __slots__ = ("_store", "slot")
+
+    def __init__(self, store: FleetStore, slot: int) -> None:
+        """Initialize the view."""
+        self._store = store
+        self.slot = slot
+
+    @property
+    def has_telemetry(self) -> bool:
+        """Return True once an MQTT message was stored for the slot."""
+        return self._store.last_message[self.slot] > 0
+
+    @property
+    def rot(self) -> float | None:
+        """Return the rotation."""
+        return _optional(self._store.rot[self.slot])
+
+    @property
+    def tilt(self) -> float | None:
+        """Return the tilt."""
+        return _optional(self._store.tilt[self.slot])
+
+    @property
+    def wifi(self) -> float | None:
+        """Return the WLAN signal."""
+        return _optional(self._store.wifi[self.slot])
+
+    @property
+    def moving(self) -> bool:
+        """Return True if the device is moving."""
+        return bool(self._store.moving[self.slot])
+
+    @property
+    def laser(self) -> bool:
+        """Return True if the laser is on."""
+        return bool(self._store.laser[self.slot])
+
+    @property
+    def watertank(self) -> bool | None:
+        """Return True if the tank is OK, False if empty, None if unknown."""
+        tank = self._store.watertank[self.slot]
+        return None if tank == TANK_UNKNOWN else tank == TANK_OK
+
+    @property
+    def status(self) -> str:
+        """Return the derived device status."""
+        return STATUSES[self._store.status[self.slot]]
+
+    @property
+    def last_message(self) -> float | None:
+        """Return the unix time of the last MQTT message."""
+        return self._store.last_message[self.slot] or None
+
+    def as_position(self) -> dict[str, Any]:
+        """Return the MQTT position cache entry in its dict form."""
+        store, slot = self._store, self.slot
+        position: dict[str, Any] = {
+            "rot": _optional(store.rot[slot], 0),
+            "tilt": _optional(store.tilt[slot], 0),
+            "moving": bool(store.moving[slot]),
+            "laser": bool(store.laser[slot]),
+        }
+        if self.watertank is not None:
+            position["watertank"] = self.watertank
+        if not math.isnan(store.time_mqtt[slot]):
+            position["timeMQTT"] = _number(store.time_mqtt[slot])
+        if not math.isnan(store.wifi[slot]):
+            position["wifi"] = _number(store.wifi[slot])
+        return position
+
+
+def _optional(value: float, default: Any = None) -> Any:
+    return default if math.isnan(value) else _number(value)
+
+
+def _number(value: float) -> int | float:
+    return int(value) if value.is_integer() else value
+
+
+class FleetStore:
+    """Hot fields of all devices in flat columns indexed by device slot.
+
+    Telemetry writes are O(1) index assignments (safe from the paho thread);
+    fleet-wide counts run in C: ``bytearray.count`` for enums and, when numpy
+    is available, zero-copy ``numpy.frombuffer`` views for numeric columns.
+    Slots of removed devices are reused.
+    """
+
+    def __init__(self, numpy: Any = None) -> None:
+        """Initialize an empty store."""
+        self.np = numpy
+        self.ids: list[str | None] = []
+        self.slots: dict[str, int] = {}
+        self.slots_by_ip: dict[str, int] = {}
+        self._free: list[int] = []
+        self.rot = array("d")
+        self.tilt = array("d")
+        self.wifi = array("d")
+        self.time_mqtt = array("d")
+        self.last_message = array("d")
+        self.moving = bytearray()
+        self.laser = bytearray()
+        self.watertank = bytearray()
+        self.status = bytearray()
+
+    def __len__(self) -> int:
+        """Return the number of devices."""
+        return len(self.slots)
+
+    def _reset(self, slot: int, status: int) -> None:
+        self.rot[slot] = self.tilt[slot] = self.wifi[slot] = NAN
+        self.time_mqtt[slot] = NAN
+        self.last_message[slot] = 0.0
+        self.moving[slot] = self.laser[slot] = 0
+        self.watertank[slot] = TANK_UNKNOWN
+        self.status[slot] = status
+
+    def add(self, device_id: str, device_ip: str | None) -> int:
+        """Return the slot of a device, allocating one if needed."""
+        slot = self.slots.get(device_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+                self.ids[slot] = device_id
+            else:
+                slot = len(self.ids)
+                self.ids.append(device_id)
+                for column in (self.rot, self.tilt, self.wifi, self.time_mqtt):
+                    column.append(NAN)
+                self.last_message.append(0.0)
+                for flags in (self.moving, self.laser, self.watertank, self.status):
+                    flags.append(0)
+            self._reset(slot, STATUS_CODES["unknown"])
+            self.slots[device_id] = slot
+        if device_ip and self.slots_by_ip.get(device_ip) != slot:
+            for ip, ip_slot in list(self.slots_by_ip.items()):
+                if ip_slot == slot:
+                    del self.slots_by_ip[ip]
+            self.slots_by_ip[device_ip] = slot
+        return slot
+
+    def remove(self, device_id: str) -> None:
+        """Free the slot of a removed device."""
+        slot = self.slots.pop(device_id, None)
+        if slot is None:
+            return
+        self.ids[slot] = None
+        self._reset(slot, FREE)
+        for ip, ip_slot in list(self.slots_by_ip.items()):
+            if ip_slot == slot:
+                del self.slots_by_ip[ip]
+        self._free.append(slot)
+
+    def view(self, device_id: str) -> FleetDeviceView | None:
+        """Return a view of a device."""
+        slot = self.slots.get(device_id)
+        return None if slot is None else FleetDeviceView(self, slot)
+
+    def view_by_ip(self, device_ip: str) -> FleetDeviceView | None:
+        """Return a view of the device with an IP."""
+        slot = self.slots_by_ip.get(device_ip)
+        return None if slot is None else FleetDeviceView(self, slot)
+
+    def device_id_for_ip(self, device_ip: str) -> str | None:
+        """Return the device ID that owns an IP (O(1))."""
+        slot = self.slots_by_ip.get(device_ip)
+        return None if slot is None else self.ids[slot]
+
+    def set_status(self, device_id: str, status: str) -> None:
+        """Store the derived status of a device."""
+        slot = self.slots.get(device_id)
+        if slot is not None:
+            self.status[slot] = STATUS_CODES.get(status, STATUS_CODES["unknown"])
+
+    def update_telemetry(self, device_ip: str, payload: dict[str, Any]) -> bool:
+        """Store an MQTT status payload; return False for unknown IPs."""
+        slot = self.slots_by_ip.get(device_ip)
+        if slot is None:
+            return False
+        self.rot[slot] = _float(payload.get("Rot", 0))
+        self.tilt[slot] = _float(payload.get("Tilt", 0))
+        self.moving[slot] = 1 if payload.get("moving", False) else 0
+        self.laser[slot] = 1 if payload.get("laser", False) else 0
+        self.watertank[slot] = TANK_OK if payload.get("watertank", True) else TANK_EMPTY
+        if "timeMQTT" in payload:
+            self.time_mqtt[slot] = _float(payload["timeMQTT"])
+        if "wifi" in payload:
+            self.wifi[slot] = _float(payload["wifi"])
+        self.last_message[slot] = time.time()
+        return True
+
+    def set_watertank(self, device_id: str, watertank: bool | None) -> None:
+        """Store the tank state merged from polled liveTelemetry."""
+        slot = self.slots.get(device_id)
+        if slot is not None and watertank is not None:
+            self.watertank[slot] = TANK_OK if watertank else TANK_EMPTY
+
+    def count_status(self, status: str) -> int:
+        """Return how many devices have a status."""
+        return self.status.count(STATUS_CODES[status])
+
+    def count_empty_tanks(self) -> int:
+        """Return how many devices report an empty water tank."""
+        return self.watertank.count(TANK_EMPTY)
+
+    def stale(self, max_age: float, now: float | None = None) -> list[str]:
+        """Return the devices whose last MQTT message is older than max_age."""
+        if now is None:
+            now = time.time()
+        cutoff = now - max_age
+        if self.np is not None and self.ids:
+            last = self.np.frombuffer(self.last_message, dtype=self.np.float64)
+            slots = self.np.flatnonzero((last > 0) & (last < cutoff)).tolist()
+        else:
+            slots = [
+                slot
+                for slot, last in enumerate(self.last_message)
+                if 0 < last < cutoff
+            ]
+        return [self.ids[slot] for slot in slots]
+
+    def count_stale(self, max_age: float, now: float | None = None) -> int:
+        """Return how many devices are stale beyond max_age seconds."""
+        if now is None:
+            now = time.time()
+        cutoff = now - max_age
+        if self.np is not None and self.ids:
+            last = self.np.frombuffer(self.last_message, dtype=self.np.float64)
+            return int(self.np.count_nonzero((last > 0) & (last < cutoff)))
+        return sum(1 for last in self.last_message if 0 < last < cutoff)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the store."""
+        return {
+            "devices": len(self.slots),
+            "slots": len(self.ids),
+            "free_slots": len(self._free),
+            "numpy": self.np is not None,
+            "status": {status: self.count_status(status) for status in STATUSES},
+            "empty_tanks": self.count_empty_tanks(),
+            "column_bytes": sum(
+                column.itemsize * len(column)
+                for column in (
+                    self.rot, self.tilt, self.wifi, self.time_mqtt, self.last_message
+                )
+            )
+            + 4 * len(self.ids),
+        }
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
@@ -0,0 +1,97 @@
+"""Hedged, deadline-bounded device list requests."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import time
+from typing import Any, TypeVar
+
+from .metrics import Histogram
+
+_T = TypeVar("_T")
+
+# The whole fetch (token check, request, retries and hedge) must end by then
+FETCH_DEADLINE = 8.0
+# Hedge after the p95 of poll_duration once there are enough samples
+HEDGE_MIN_SAMPLES = 20
+HEDGE_DEFAULT_DELAY = 2.0
+HEDGE_MIN_DELAY = 0.2
+# Serve the last snapshot at most this long before entities go unavailable
+STALE_SNAPSHOT_MAX = 600
+
+
+@dataclass(slots=True)
+class FetchStats:
+    """Outcome counters of the bounded device list fetch."""
+
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    cancelled: int = 0
+    deadline_exceeded: int = 0
+    stale_serves: int = 0
+    # Polls that turned (or would have turned) every entity unavailable
+    blips: int = 0
+    blips_avoided: int = 0
+    stale_since: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the fetch."""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "cancelled": self.cancelled,
+            "deadline_exceeded": self.deadline_exceeded,
+            "stale_serves": self.stale_serves,
+            "unavailability_blips": self.blips,
+            "unavailability_blips_avoided": self.blips_avoided,
+            "stale_for_s": round(time.time() - self.stale_since, 1)
+            if self.stale_since is not None
+            else None,
+        }
+
+
+def hedge_delay(poll_duration: Histogram) -> float:
+    """Return how long to wait before sending the hedge request (seconds)."""
+    p95 = poll_duration.percentile(95)
+    if poll_duration.count < HEDGE_MIN_SAMPLES or p95 is None:
+        return HEDGE_DEFAULT_DELAY
+    return min(max(p95 / 1000, HEDGE_MIN_DELAY), FETCH_DEADLINE / 2)
+
+
+async def async_hedged(
+    factory: Callable[[bool], Awaitable[_T]], delay: float | None, stats: FetchStats
+) -> _T:
+    """Await factory(False); if it is still running after delay, race factory(True).
+
+    The first successful result wins and the other request is cancelled, so
+    at most two requests are in flight and the slower connection is closed
+    instead of being read to the end. If both fail, the first error is raised.
+    """
+    primary = asyncio.ensure_future(factory(False))
+    tasks = [primary]
+    errors: list[BaseException] = []
+    try:
+        if delay is not None:
+            await asyncio.wait(tasks, timeout=delay)
+            if not primary.done():
+                stats.hedged += 1
+                tasks.append(asyncio.ensure_future(factory(True)))
+        while tasks:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            tasks = list(pending)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    if task is not primary:
+                        stats.hedge_wins += 1
+                    return task.result()
+                errors.append(error)
+        raise errors[0]
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+                stats.cancelled += 1
@@ -0,0 +1,273 @@
+"""Local SQLite history of detections, shots and telemetry samples."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+import sqlite3
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+FLUSH_DELAY = 5.0
+PRUNE_INTERVAL = timedelta(hours=6)
+HOURLY_RETENTION_DAYS = 730
+RAW_QUERY_LIMIT = 10000
+
+RESOLUTIONS = {"hour": ("rollup_hourly", 3600), "day": ("rollup_daily", 86400)}
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS events (
+        ts REAL NOT NULL,
+        device_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        value REAL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_events_device_kind_ts ON events (device_id, kind, ts)",
+    "CREATE INDEX IF NOT EXISTS ix_events_ts ON events (ts)",
+    """CREATE TABLE IF NOT EXISTS rollup_hourly (
+        device_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        bucket INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        total REAL NOT NULL,
+        min REAL,
+        max REAL,
+        PRIMARY KEY (device_id, kind, bucket)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS rollup_daily (
+        device_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        bucket INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        total REAL NOT NULL,
+        min REAL,
+        max REAL,
+        PRIMARY KEY (device_id, kind, bucket)
+    ) WITHOUT ROWID""",
+)
+
+UPSERT_ROLLUP = """INSERT INTO {table} (device_id, kind, bucket, count, total, min, max)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (device_id, kind, bucket) DO UPDATE SET
+        count = count + excluded.count,
+        total = total + excluded.total,
+        min = CASE WHEN excluded.min < min OR min IS NULL THEN excluded.min ELSE min END,
+        max = CASE WHEN excluded.max > max OR max IS NULL THEN excluded.max ELSE max END"""
+
+
+class HistoryStore:
+    """Append-only event history with rollups maintained on insert.
+
+    Rows are buffered on the event loop and written in batches from the
+    executor; hourly and daily rollups are upserted in the same transaction,
+    so aggregate queries never scan the raw table.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, retention_days: int) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.path = path
+        self.retention_days = retention_days
+        self.rows_written = 0
+        self.batches_written = 0
+        self._conn: sqlite3.Connection | None = None
+        self._pending: list[tuple[float, str, str, float | None]] = []
+        self._lock = asyncio.Lock()
+        self._flush_unsub: CALLBACK_TYPE | None = None
+        self._prune_unsub: CALLBACK_TYPE | None = None
+
+    async def async_setup(self) -> None:
+        """Open the database and schedule pruning."""
+        await self.hass.async_add_executor_job(self._open)
+        self._prune_unsub = async_track_time_interval(
+            self.hass, self._async_prune_tick, PRUNE_INTERVAL
+        )
+
+    def _open(self) -> None:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+        self._conn = conn
+
+    async def async_close(self) -> None:
+        """Flush pending rows and close the database."""
+        if self._prune_unsub is not None:
+            self._prune_unsub()
+            self._prune_unsub = None
+        await self.async_flush()
+        async with self._lock:
+            if self._conn is not None:
+                await self.hass.async_add_executor_job(self._conn.close)
+                self._conn = None
+
+    @callback
+    def async_record(
+        self,
+        device_id: str,
+        kind: str,
+        value: float | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Buffer one history row; it is written with the next batch."""
+        self._pending.append(
+            (timestamp if timestamp is not None else time.time(), device_id, kind, value)
+        )
+        if len(self._pending) >= BATCH_SIZE:
+            self.hass.async_create_task(self.async_flush())
+        elif self._flush_unsub is None:
+            self._flush_unsub = async_call_later(
+                self.hass, FLUSH_DELAY, self._async_flush_later
+            )
+
+    @callback
+    def _async_flush_later(self, _now: datetime) -> None:
+        self._flush_unsub = None
+        self.hass.async_create_task(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Write all buffered rows in one transaction."""
+        if self._flush_unsub is not None:
+            self._flush_unsub()
+            self._flush_unsub = None
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        async with self._lock:
+            if self._conn is None:
+                return
+            try:
+                await self.hass.async_add_executor_job(self._write_batch, rows)
+            except sqlite3.Error as err:
+                _LOGGER.error("Historie konnte nicht geschrieben werden: %s", err)
+                return
+        self.rows_written += len(rows)
+        self.batches_written += 1
+
+    def _write_batch(self, rows: list[tuple[float, str, str, float | None]]) -> None:
+        rollups: dict[str, dict[tuple[str, str, int], list[float]]] = {
+            "rollup_hourly": {},
+            "rollup_daily": {},
+        }
+        for ts, device_id, kind, value in rows:
+            amount = 1.0 if value is None else value
+            for table, size in RESOLUTIONS.values():
+                key = (device_id, kind, int(ts // size) * size)
+                agg = rollups[table].get(key)
+                if agg is None:
+                    rollups[table][key] = [1, amount, amount, amount]
+                else:
+                    agg[0] += 1
+                    agg[1] += amount
+                    agg[2] = min(agg[2], amount)
+                    agg[3] = max(agg[3], amount)
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO events (ts, device_id, kind, value) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            for table, aggregates in rollups.items():
+                self._conn.executemany(
+                    UPSERT_ROLLUP.format(table=table),
+                    [(*key, *agg) for key, agg in aggregates.items()],
+                )
+
+    @callback
+    def _async_prune_tick(self, _now: datetime) -> None:
+        self.hass.async_create_task(self.async_prune())
+
+    async def async_prune(self) -> None:
+        """Delete raw rows and hourly rollups past their retention."""
+        async with self._lock:
+            if self._conn is not None:
+                await self.hass.async_add_executor_job(self._prune)
+
+    def _prune(self) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM events WHERE ts < ?", (now - self.retention_days * 86400,)
+            )
+            self._conn.execute(
+                "DELETE FROM rollup_hourly WHERE bucket < ?",
+                (now - HOURLY_RETENTION_DAYS * 86400,),
+            )
+
+    async def async_query(
+        self,
+        kind: str,
+        device_id: str | None,
+        start: float,
+        end: float,
+        resolution: str,
+    ) -> list[dict[str, Any]]:
+        """Return aggregated (or raw) history rows."""
+        await self.async_flush()
+        async with self._lock:
+            if self._conn is None:
+                return []
+            return await self.hass.async_add_executor_job(
+                self._query, kind, device_id, start, end, resolution
+            )
+
+    def _query(
+        self,
+        kind: str,
+        device_id: str | None,
+        start: float,
+        end: float,
+        resolution: str,
+    ) -> list[dict[str, Any]]:
+        device_clause = "AND device_id = ?" if device_id else ""
+        params: list[Any] = [kind]
+        if device_id:
+            params.append(device_id)
+
+        if resolution == "raw":
+            cursor = self._conn.execute(
+                f"SELECT ts, device_id, value FROM events WHERE kind = ? {device_clause} "
+                "AND ts >= ? AND ts < ? ORDER BY ts LIMIT ?",
+                (*params, start, end, RAW_QUERY_LIMIT),
+            )
+            return [
+                {"timestamp": ts, "device_id": dev, "value": value}
+                for ts, dev, value in cursor
+            ]
+
+        table, size = RESOLUTIONS[resolution]
+        cursor = self._conn.execute(
+            f"SELECT device_id, bucket, count, total, min, max FROM {table} "
+            f"WHERE kind = ? {device_clause} AND bucket >= ? AND bucket < ? "
+            "ORDER BY bucket, device_id",
+            (*params, int(start // size) * size, end),
+        )
+        return [
+            {
+                "device_id": dev,
+                "start": bucket,
+                "count": count,
+                "sum": total,
+                "min": min_value,
+                "max": max_value,
+            }
+            for dev, bucket, count, total, min_value, max_value in cursor
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the store."""
+        return {
+            "path": self.path,
+            "retention_days": self.retention_days,
+            "rows_written": self.rows_written,
+            "batches_written": self.batches_written,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,209 @@
+"""Direct LAN control of devices and per-device command path selection."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from .api import CommandNotSent
+from .const import LOCAL_ENDPOINT_COMMAND, LOCAL_ENDPOINT_INFO
+
+_LOGGER = logging.getLogger(__name__)
+
+PATH_MQTT = "mqtt"
+PATH_LOCAL = "local"
+PATH_API = "api"
+
+# Expected latency of paths not measured yet; keeps MQTT first as before
+PRIOR_LATENCY_MS = {PATH_MQTT: 50.0, PATH_LOCAL: 150.0, PATH_API: 800.0}
+# Paths slower than this in a health probe are demoted like failed ones
+SLOW_PATH_MS = 2000.0
+DEMOTE_BASE = 30.0
+DEMOTE_MAX = 600.0
+EWMA_ALPHA = 0.3
+
+LOCAL_TIMEOUT = 3.0
+LOCAL_POOL_SIZE = 2
+LOCAL_KEEPALIVE = 60.0
+
+
+@dataclass(slots=True)
+class PathHealth:
+    """Latency and failure state of one path to one device."""
+
+    latency_ms: float | None = None
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    demoted_until: float = 0.0
+
+    def record_success(self, latency_ms: float) -> None:
+        """Fold a latency sample into the moving average."""
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.demoted_until = 0.0
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += EWMA_ALPHA * (latency_ms - self.latency_ms)
+
+    def demote(self, now: float) -> None:
+        """Skip the path for an exponentially growing backoff."""
+        self.consecutive_failures += 1
+        backoff = min(DEMOTE_BASE * 2 ** (self.consecutive_failures - 1), DEMOTE_MAX)
+        self.demoted_until = now + backoff
+
+    def record_failure(self, now: float) -> None:
+        """Count a failed command or probe and demote the path."""
+        self.failures += 1
+        self.demote(now)
+
+
+class PathSelector:
+    """Order the command paths of a device by health and observed latency.
+
+    Demoted paths stay usable as a last resort, so a command is only lost if
+    every path fails.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the selector."""
+        self.paths: dict[str, PathHealth] = {}
+
+    def health(self, path: str) -> PathHealth:
+        """Return the health record of a path."""
+        health = self.paths.get(path)
+        if health is None:
+            health = self.paths[path] = PathHealth()
+        return health
+
+    def order(self, candidates: list[str], now: float | None = None) -> list[str]:
+        """Return the candidates, best first."""
+        if now is None:
+            now = time.monotonic()
+
+        def rank(path: str) -> tuple[bool, float]:
+            health = self.paths.get(path)
+            if health is None:
+                return False, PRIOR_LATENCY_MS[path]
+            latency = health.latency_ms
+            return (
+                health.demoted_until > now,
+                PRIOR_LATENCY_MS[path] if latency is None else latency,
+            )
+
+        return sorted(candidates, key=rank)
+
+    def record_success(self, path: str, latency_ms: float) -> None:
+        """Record a successful command or probe."""
+        self.health(path).record_success(latency_ms)
+
+    def record_failure(self, path: str, now: float | None = None) -> None:
+        """Record a failed command or probe."""
+        self.health(path).record_failure(time.monotonic() if now is None else now)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the selector."""
+        now = time.monotonic()
+        return {
+            "order": self.order(list(self.paths), now),
+            "paths": {
+                path: {
+                    "latency_ms": round(health.latency_ms, 1)
+                    if health.latency_ms is not None
+                    else None,
+                    "successes": health.successes,
+                    "failures": health.failures,
+                    "demoted_s": max(round(health.demoted_until - now), 0),
+                }
+                for path, health in self.paths.items()
+            },
+        }
+
+
+class LocalTransport:
+    """HTTP commands straight to the device on the LAN.
+
+    One keep-alive session whose connector pools connections per device
+    (host), so repeated commands skip the TCP handshake and one slow device
+    cannot exhaust the connections of another.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the transport."""
+        self._session: aiohttp.ClientSession | None = None
+        self.requests = 0
+        self.errors = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=LOCAL_POOL_SIZE,
+                    keepalive_timeout=LOCAL_KEEPALIVE,
+                ),
+                timeout=aiohttp.ClientTimeout(total=LOCAL_TIMEOUT),
+            )
+        return self._session
+
+    async def async_command(self, device_ip: str, command: dict[str, Any]) -> None:
+        """Send a command (same JSON as over MQTT) to the device.
+
+        Raises CommandNotSent only if the connection could not be opened; after
+        that the device may have executed the command even if no answer came.
+        """
+        self.requests += 1
+        try:
+            async with self._get_session().post(
+                f"http://{device_ip}{LOCAL_ENDPOINT_COMMAND}",
+                data=json.dumps(command),
+                headers={"Content-Type": "application/json"},
+            ) as response:
+                if response.status >= 300:
+                    raise Exception(f"Lokaler Befehl fehlgeschlagen (Status {response.status})")
+        except aiohttp.ClientConnectorError as err:
+            self.errors += 1
+            raise CommandNotSent(f"Gerät {device_ip} lokal nicht erreichbar: {err}") from err
+        except (aiohttp.ClientError, TimeoutError) as err:
+            self.errors += 1
+            raise Exception(f"Lokaler Befehl an {device_ip} ohne Antwort: {err}") from err
+        except Exception:
+            self.errors += 1
+            raise
+
+    async def async_probe(self, device_ip: str) -> float:
+        """Fetch the info page and return the round trip in milliseconds."""
+        self.requests += 1
+        started = time.perf_counter()
+        try:
+            async with self._get_session().get(
+                f"http://{device_ip}{LOCAL_ENDPOINT_INFO}"
+            ) as response:
+                await response.read()
+                if response.status >= 300:
+                    raise Exception(f"Status {response.status}")
+        except Exception:
+            self.errors += 1
+            raise
+        return (time.perf_counter() - started) * 1000
+
+    async def async_close(self) -> None:
+        """Close pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the transport."""
+        connector = self._session.connector if self._session else None
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "open": self._session is not None and not self._session.closed,
+            "pool_size_per_device": LOCAL_POOL_SIZE,
+            "connector_closed": connector.closed if connector else None,
+        }
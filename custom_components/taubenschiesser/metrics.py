@@ -0,0 +1,246 @@
+"""Lightweight always-on counters for the Taubenschiesser coordinator."""
+from __future__ import annotations
+
+from bisect import bisect_left
+import time
+from typing import Any
+
+# Bucket upper bounds in milliseconds (last bucket is open-ended)
+DEFAULT_BUCKETS_MS: tuple[float, ...] = (
+    1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (O(log n) record, no allocations)."""
+
+    __slots__ = ("buckets", "counts", "count", "total", "max", "last")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS_MS) -> None:
+        """Initialize the histogram."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last: float | None = None
+
+    def record(self, value_ms: float) -> None:
+        """Record a single sample in milliseconds."""
+        self.counts[bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.last = value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, pct: float) -> float | None:
+        """Return an upper-bound estimate for the given percentile."""
+        if not self.count:
+            return None
+        target = self.count * pct / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(self.buckets):
+                    return float(self.buckets[index])
+                return self.max
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable summary."""
+        labels = [f"<={b}ms" for b in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 2) if self.count else None,
+            "last_ms": round(self.last, 2) if self.last is not None else None,
+            "max_ms": round(self.max, 2),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "buckets": {
+                label: count for label, count in zip(labels, self.counts) if count
+            },
+        }
+
+
+class RateCounter:
+    """Event counter with a per-minute rate over two rolling windows."""
+
+    __slots__ = ("total", "last_at", "_window_start", "_current", "_previous")
+
+    WINDOW: float = 60.0
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.total = 0
+        self.last_at: float | None = None
+        self._window_start = time.monotonic()
+        self._current = 0
+        self._previous = 0
+
+    def _roll(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed >= 2 * self.WINDOW:
+            self._previous = 0
+            self._current = 0
+            self._window_start = now
+        elif elapsed >= self.WINDOW:
+            self._previous = self._current
+            self._current = 0
+            self._window_start += self.WINDOW
+
+    def hit(self, now: float | None = None) -> None:
+        """Count one event."""
+        if now is None:
+            now = time.monotonic()
+        self._roll(now)
+        self._current += 1
+        self.total += 1
+        self.last_at = now
+
+    def per_minute(self, now: float | None = None) -> float:
+        """Return the estimated events per minute (sliding window)."""
+        if now is None:
+            now = time.monotonic()
+        self._roll(now)
+        weight = 1 - (now - self._window_start) / self.WINDOW
+        return round(self._previous * weight + self._current, 2)
+
+
+class CoordinatorMetrics:
+    """Counters and timings collected by the coordinator hot paths."""
+
+    def __init__(self) -> None:
+        """Initialize all counters."""
+        self.started_at = time.time()
+        self.poll_duration = Histogram()
+        self.parse_duration = Histogram()
+        self.debounce_flush_latency = Histogram()
+        self.polls = 0
+        self.poll_failures = 0
+        self.last_poll_bytes = 0
+        self.last_successful_poll: float | None = None
+        self.auth_checks = 0
+        self.auth_check_failures = 0
+        self.token_refreshes = 0
+        self.token_refresh_failures = 0
+        self.reauthentications = 0
+        self.mqtt_messages = RateCounter()
+        self.mqtt_messages_by_device: dict[str, RateCounter] = {}
+        self.mqtt_decode_errors = 0
+        self.mqtt_pending = 0
+        self.mqtt_pending_max = 0
+        self.debounce_flushes = 0
+        self.push_deltas = 0
+        self.listener_callbacks: dict[str, int] = {"api": 0, "telemetry": 0}
+        self.mqtt_flush_callbacks = 0
+        self.api_rtt: dict[str, Histogram] = {}
+        self.mqtt_publish_latency: dict[str, Histogram] = {}
+        self.state_writes: dict[str, int] = {}
+        self.state_writes_suppressed: dict[str, int] = {}
+        # Durations of the setup phases (ms)
+        self.setup: dict[str, float] = {}
+
+    def record_state_write(self, device_id: str, suppressed: bool = False) -> None:
+        """Count a sensor state write (or a write held back by throttling)."""
+        counts = self.state_writes_suppressed if suppressed else self.state_writes
+        counts[device_id] = counts.get(device_id, 0) + 1
+
+    def device_state_write_stats(self, device_id: str) -> dict[str, Any]:
+        """Return recorder-relevant sensor write counts for a device."""
+        writes = self.state_writes.get(device_id, 0)
+        days = max(time.time() - self.started_at, 60) / 86400
+        return {
+            "writes": writes,
+            "suppressed": self.state_writes_suppressed.get(device_id, 0),
+            "writes_per_day": round(writes / days),
+        }
+
+    def record_setup(self, phase: str, value_ms: float) -> None:
+        """Record how long a setup phase took."""
+        self.setup[phase] = value_ms
+
+    def record_api_rtt(self, endpoint: str, value_ms: float) -> None:
+        """Record the time until response headers for an API endpoint."""
+        histogram = self.api_rtt.get(endpoint)
+        if histogram is None:
+            histogram = self.api_rtt[endpoint] = Histogram()
+        histogram.record(value_ms)
+
+    def record_publish_latency(self, device_ip: str, value_ms: float) -> None:
+        """Record how long an MQTT command publish took for a device."""
+        histogram = self.mqtt_publish_latency.get(device_ip)
+        if histogram is None:
+            histogram = self.mqtt_publish_latency[device_ip] = Histogram()
+        histogram.record(value_ms)
+
+    def record_mqtt_message(self, device_ip: str) -> None:
+        """Count an MQTT message for a device (called from the paho thread)."""
+        now = time.monotonic()
+        self.mqtt_messages.hit(now)
+        counter = self.mqtt_messages_by_device.get(device_ip)
+        if counter is None:
+            counter = self.mqtt_messages_by_device[device_ip] = RateCounter()
+        counter.hit(now)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot of all counters."""
+        now = time.monotonic()
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "setup_ms": {phase: round(value, 1) for phase, value in self.setup.items()},
+            "polls": self.polls,
+            "poll_failures": self.poll_failures,
+            "poll_duration": self.poll_duration.as_dict(),
+            "parse_duration": self.parse_duration.as_dict(),
+            "last_poll_bytes": self.last_poll_bytes,
+            "last_successful_poll": self.last_successful_poll,
+            "api_rtt": {
+                endpoint: histogram.as_dict()
+                for endpoint, histogram in self.api_rtt.items()
+            },
+            "auth": {
+                "checks": self.auth_checks,
+                "check_failures": self.auth_check_failures,
+                "token_refreshes": self.token_refreshes,
+                "token_refresh_failures": self.token_refresh_failures,
+                "reauthentications": self.reauthentications,
+            },
+            "push_deltas": self.push_deltas,
+            "listener_callbacks": dict(self.listener_callbacks),
+            "sensor_state_writes": sum(self.state_writes.values()),
+            "sensor_state_writes_suppressed": sum(self.state_writes_suppressed.values()),
+            "mqtt": {
+                "messages": self.mqtt_messages.total,
+                "messages_per_minute": self.mqtt_messages.per_minute(now),
+                "decode_errors": self.mqtt_decode_errors,
+                "pending": self.mqtt_pending,
+                "pending_max": self.mqtt_pending_max,
+                "debounce_flushes": self.debounce_flushes,
+                "debounce_flush_latency": self.debounce_flush_latency.as_dict(),
+                "callbacks_per_flush": (
+                    round(self.mqtt_flush_callbacks / self.debounce_flushes, 1)
+                    if self.debounce_flushes
+                    else None
+                ),
+            },
+        }
+
+    def device_mqtt_stats(self, device_ip: str | None) -> dict[str, Any]:
+        """Return MQTT counters for a single device IP."""
+        counter = self.mqtt_messages_by_device.get(device_ip) if device_ip else None
+        publish = self.mqtt_publish_latency.get(device_ip) if device_ip else None
+        stats: dict[str, Any] = {
+            "messages": 0,
+            "messages_per_minute": 0.0,
+            "last_message_age_s": None,
+            "publish_latency": publish.as_dict() if publish else None,
+        }
+        if counter is not None:
+            now = time.monotonic()
+            stats["messages"] = counter.total
+            stats["messages_per_minute"] = counter.per_minute(now)
+            if counter.last_at is not None:
+                stats["last_message_age_s"] = round(now - counter.last_at, 1)
+        return stats
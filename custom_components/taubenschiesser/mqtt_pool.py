@@ -0,0 +1,427 @@
+"""Shared MQTT connections for all Taubenschiesser config entries."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections.abc import Callable
+import json
+import logging
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+
+from .api import CommandNotSent
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_MQTT_POOL = f"{DOMAIN}_mqtt_pool"
+
+# Called with (topic, decoded payload, retained); may run on the paho network thread
+MessageHandler = Callable[[str, Any, bool], None]
+
+
+def load_paho() -> Any:
+    """Import paho-mqtt (call from the executor: the import is slow).
+
+    Entries without an own broker connection (no broker configured or the
+    MQTT integration shared) never load it.
+    """
+    import paho.mqtt.client as mqtt  # pylint: disable=import-outside-toplevel
+
+    return mqtt
+
+
+# CONNACK return codes of MQTT 3.1.1 meaning the credentials were rejected
+CONNACK_BAD_CREDENTIALS = frozenset({4, 5})
+
+
+class BrokerProbeError(Exception):
+    """The broker is unreachable or refused the CONNECT."""
+
+    def __init__(self, message: str, auth: bool = False) -> None:
+        """Initialize with whether the credentials were the problem."""
+        super().__init__(message)
+        self.auth = auth
+
+
+def _mqtt_string(value: str) -> bytes:
+    data = value.encode()
+    return len(data).to_bytes(2, "big") + data
+
+
+def _connect_packet(client_id: str, username: str | None, password: str | None) -> bytes:
+    """Encode an MQTT 3.1.1 CONNECT with a clean session."""
+    flags = 0x02
+    payload = _mqtt_string(client_id)
+    if username:
+        flags |= 0x80
+        payload += _mqtt_string(username)
+        if password:
+            flags |= 0x40
+            payload += _mqtt_string(password)
+    body = _mqtt_string("MQTT") + bytes((4, flags)) + (10).to_bytes(2, "big") + payload
+    length = len(body)
+    encoded = bytearray()
+    while True:
+        length, digit = divmod(length, 128)
+        encoded.append(digit | (0x80 if length else 0))
+        if not length:
+            break
+    return b"\x10" + bytes(encoded) + body
+
+
+async def async_probe_broker(
+    broker: str, port: int, username: str | None, password: str | None
+) -> None:
+    """Open a TCP connection, send CONNECT and check the CONNACK.
+
+    Cheaper than starting a paho client (no import, no network thread); the
+    caller bounds the time with its own deadline.
+    """
+    try:
+        reader, writer = await asyncio.open_connection(broker, port)
+    except OSError as err:
+        raise BrokerProbeError(f"MQTT-Broker nicht erreichbar: {err}") from err
+    try:
+        writer.write(_connect_packet(f"{DOMAIN}-probe", username, password))
+        await writer.drain()
+        try:
+            connack = await reader.readexactly(4)
+        except asyncio.IncompleteReadError as err:
+            raise BrokerProbeError("MQTT-Broker hat die Verbindung geschlossen") from err
+        if connack[0] != 0x20:
+            raise BrokerProbeError("Keine MQTT-Antwort (falscher Port?)")
+        if connack[3] in CONNACK_BAD_CREDENTIALS:
+            raise BrokerProbeError("MQTT-Anmeldung abgelehnt", auth=True)
+        if connack[3] != 0:
+            raise BrokerProbeError(f"MQTT-Verbindung abgelehnt (Code {connack[3]})")
+        # DISCONNECT
+        writer.write(b"\xe0\x00")
+        await writer.drain()
+    except OSError as err:
+        raise BrokerProbeError(f"MQTT-Broker nicht erreichbar: {err}") from err
+    finally:
+        writer.close()
+
+
+class MqttConnection(ABC):
+    """One broker connection with a topic router shared by several owners.
+
+    Every payload is decoded once and handed to all handlers registered for
+    its topic, so entries sharing a broker no longer receive and parse the
+    same message several times.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: tuple) -> None:
+        """Initialize the connection."""
+        self.hass = hass
+        self.key = key
+        self.owners = 0
+        self.messages = 0
+        self.decode_errors = 0
+        self.executor_hops = 0
+        # Replaced (never mutated) so the paho thread can read it without a lock
+        self._routes: dict[str, tuple[MessageHandler, ...]] = {}
+
+    @property
+    @abstractmethod
+    def connected(self) -> bool:
+        """Return True if the broker connection is up."""
+
+    @abstractmethod
+    async def async_start(self) -> None:
+        """Connect to the broker."""
+
+    @abstractmethod
+    async def async_stop(self) -> None:
+        """Disconnect from the broker."""
+
+    @abstractmethod
+    async def async_publish(self, topic: str, payload: str) -> None:
+        """Publish a payload."""
+
+    @abstractmethod
+    async def _async_broker_subscribe(self, topic: str) -> None:
+        """Subscribe to a topic at the broker."""
+
+    @abstractmethod
+    async def _async_broker_unsubscribe(self, topic: str) -> None:
+        """Unsubscribe from a topic at the broker."""
+
+    async def async_subscribe(self, topic: str, handler: MessageHandler) -> None:
+        """Route a topic to a handler, subscribing at the broker on first use."""
+        handlers = self._routes.get(topic, ())
+        if handler in handlers:
+            return
+        self._routes = {**self._routes, topic: (*handlers, handler)}
+        if not handlers:
+            await self._async_broker_subscribe(topic)
+
+    async def async_unsubscribe(self, topic: str, handler: MessageHandler) -> None:
+        """Remove a route, unsubscribing at the broker when it was the last one."""
+        handlers = tuple(h for h in self._routes.get(topic, ()) if h != handler)
+        routes = dict(self._routes)
+        if handlers:
+            routes[topic] = handlers
+        else:
+            routes.pop(topic, None)
+        self._routes = routes
+        if not handlers:
+            await self._async_broker_unsubscribe(topic)
+
+    def _dispatch(self, topic: str, raw: bytes | str, retained: bool = False) -> None:
+        """Decode a message once and pass it to every handler of its topic."""
+        handlers = self._routes.get(topic)
+        if not handlers:
+            return
+        self.messages += 1
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            self.decode_errors += 1
+            _LOGGER.debug("Ungültige MQTT Nachricht auf %s", topic)
+            return
+        for handler in handlers:
+            try:
+                handler(topic, payload, retained)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Fehler bei der Verarbeitung von %s", topic)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the connection (without credentials)."""
+        return {
+            "backend": type(self).__name__,
+            "broker": self.key[0],
+            "port": self.key[1] if len(self.key) > 1 else None,
+            "connected": self.connected,
+            "owners": self.owners,
+            "topics": len(self._routes),
+            "messages": self.messages,
+            "decode_errors": self.decode_errors,
+            "executor_hops": self.executor_hops,
+        }
+
+
+class PahoMqttConnection(MqttConnection):
+    """Own paho client with a single socket and network thread."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        mqtt: Any,
+        broker: str,
+        port: int,
+        username: str | None,
+        password: str | None,
+    ) -> None:
+        """Initialize the client with the paho module from load_paho()."""
+        super().__init__(hass, (broker, port, username, password))
+        self.broker = broker
+        self.port = port
+        self._mqtt = mqtt
+        self.client = mqtt.Client()
+        if username:
+            self.client.username_pw_set(username, password)
+        self.client.on_connect = self._on_connect
+        self.client.on_message = self._on_message
+        self.client.on_disconnect = self._on_disconnect
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the broker connection is up."""
+        return self.client.is_connected()
+
+    async def _async_executor(self, func, *args) -> Any:
+        """Run a blocking paho call in the executor and count the hop."""
+        self.executor_hops += 1
+        return await self.hass.async_add_executor_job(func, *args)
+
+    def _on_connect(self, client, userdata, flags, rc) -> None:
+        if rc != 0:
+            _LOGGER.error("MQTT connection failed with code %s", rc)
+            return
+        _LOGGER.info("MQTT connected to %s:%s", self.broker, self.port)
+        # Subscriptions do not survive a reconnect with a clean session
+        for topic in list(self._routes):
+            client.subscribe(topic)
+
+    def _on_message(self, client, userdata, msg) -> None:
+        self._dispatch(msg.topic, msg.payload, bool(msg.retain))
+
+    def _on_disconnect(self, client, userdata, rc) -> None:
+        _LOGGER.warning("MQTT disconnected with code %s", rc)
+
+    async def async_start(self) -> None:
+        """Connect in the executor and start the network thread."""
+        await self._async_executor(
+            self.client.connect, self.broker, self.port, 60
+        )
+        self.client.loop_start()
+        _LOGGER.info("MQTT client started")
+
+    async def async_stop(self) -> None:
+        """Stop the network thread and disconnect."""
+        self.client.loop_stop()
+        self.client.disconnect()
+
+    async def async_publish(self, topic: str, payload: str) -> None:
+        """Publish a payload and raise if paho rejects it."""
+
+        def publish() -> None:
+            result = self.client.publish(topic, payload)
+            if result.rc != self._mqtt.MQTT_ERR_SUCCESS:
+                # Rejected before queueing (e.g. not connected): nothing was sent
+                raise CommandNotSent(f"MQTT publish failed: {result.rc}")
+
+        await self._async_executor(publish)
+
+    async def _async_broker_subscribe(self, topic: str) -> None:
+        if self.client.is_connected():
+            await self._async_executor(self.client.subscribe, topic)
+        _LOGGER.info("Subscribed to %s", topic)
+
+    async def _async_broker_unsubscribe(self, topic: str) -> None:
+        if self.client.is_connected():
+            await self._async_executor(self.client.unsubscribe, topic)
+        _LOGGER.info("Unsubscribed from %s", topic)
+
+
+class HomeAssistantMqttConnection(MqttConnection):
+    """Route topics over the connection of Home Assistant's MQTT integration."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the connection."""
+        super().__init__(hass, ("homeassistant",))
+        self._unsubs: dict[str, Callable[[], None]] = {}
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the MQTT integration is connected."""
+        from homeassistant.components import mqtt as ha_mqtt
+
+        return ha_mqtt.is_connected(self.hass)
+
+    async def async_start(self) -> None:
+        """Wait until the MQTT integration's client is available."""
+        from homeassistant.components import mqtt as ha_mqtt
+
+        if not await ha_mqtt.async_wait_for_mqtt_client(self.hass):
+            raise Exception("MQTT integration not available")
+
+    async def async_stop(self) -> None:
+        """Drop all subscriptions; the connection itself is not ours."""
+        while self._unsubs:
+            self._unsubs.popitem()[1]()
+
+    async def async_publish(self, topic: str, payload: str) -> None:
+        """Publish through the MQTT integration."""
+        from homeassistant.components import mqtt as ha_mqtt
+
+        await ha_mqtt.async_publish(self.hass, topic, payload)
+
+    @callback
+    def _async_message_received(self, msg) -> None:
+        self._dispatch(msg.topic, msg.payload, bool(msg.retain))
+
+    async def _async_broker_subscribe(self, topic: str) -> None:
+        from homeassistant.components import mqtt as ha_mqtt
+
+        self._unsubs[topic] = await ha_mqtt.async_subscribe(
+            self.hass, topic, self._async_message_received, encoding=None
+        )
+        _LOGGER.info("Subscribed to %s (Home Assistant MQTT)", topic)
+
+    async def _async_broker_unsubscribe(self, topic: str) -> None:
+        unsub = self._unsubs.pop(topic, None)
+        if unsub is not None:
+            unsub()
+
+
+def _ha_mqtt_matches(
+    hass: HomeAssistant, broker: str, port: int, username: str | None
+) -> bool:
+    """Return True if the MQTT integration is loaded for the same broker."""
+    if "mqtt" not in hass.config.components:
+        return False
+    for entry in hass.config_entries.async_entries("mqtt"):
+        if (
+            entry.state is ConfigEntryState.LOADED
+            and entry.data.get("broker") == broker
+            and int(entry.data.get("port", 1883)) == int(port)
+            and (entry.data.get("username") or None) == (username or None)
+        ):
+            return True
+    return False
+
+
+class MqttConnectionPool:
+    """Reference-counted connections keyed by broker, port and credentials."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the pool."""
+        self.hass = hass
+        self.connections: dict[tuple, MqttConnection] = {}
+        self._lock = asyncio.Lock()
+        self._paho: Any = None
+        # Import and first-connect times (ms), for diagnostics
+        self.timings: dict[str, float] = {}
+
+    async def _async_paho(self) -> Any:
+        if self._paho is None:
+            started = time.perf_counter()
+            self._paho = await self.hass.async_add_executor_job(load_paho)
+            self.timings["paho_import_ms"] = (time.perf_counter() - started) * 1000
+        return self._paho
+
+    async def async_acquire(
+        self,
+        broker: str,
+        port: int,
+        username: str | None,
+        password: str | None,
+        use_ha_mqtt: bool = False,
+    ) -> MqttConnection:
+        """Return a started connection for the broker, creating it if needed."""
+        if use_ha_mqtt and _ha_mqtt_matches(self.hass, broker, port, username):
+            key: tuple = ("homeassistant",)
+        else:
+            key = (broker, port, username, password)
+
+        async with self._lock:
+            connection = self.connections.get(key)
+            if connection is None:
+                if key == ("homeassistant",):
+                    connection = HomeAssistantMqttConnection(self.hass)
+                else:
+                    connection = PahoMqttConnection(
+                        self.hass, await self._async_paho(), broker, port, username, password
+                    )
+                started = time.perf_counter()
+                await connection.async_start()
+                self.timings.setdefault(
+                    "first_connect_ms", (time.perf_counter() - started) * 1000
+                )
+                self.connections[key] = connection
+            connection.owners += 1
+            return connection
+
+    async def async_release(self, connection: MqttConnection) -> None:
+        """Drop one reference and close the connection with the last one."""
+        async with self._lock:
+            connection.owners -= 1
+            if connection.owners > 0:
+                return
+            self.connections.pop(connection.key, None)
+            await connection.async_stop()
+
+
+@callback
+def async_get_pool(hass: HomeAssistant) -> MqttConnectionPool:
+    """Return the MQTT connection pool shared by all config entries."""
+    pool = hass.data.get(DATA_MQTT_POOL)
+    if pool is None:
+        pool = hass.data[DATA_MQTT_POOL] = MqttConnectionPool(hass)
+    return pool
@@ -0,0 +1,185 @@
+"""Optimistic overlay for commanded device fields."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import time
+from typing import Any
+
+# Pending writes fall back to the last authoritative value after this long
+DEFAULT_TTL = 30.0
+
+_MISSING = object()
+
+
+def get_field(device: dict[str, Any], field: str) -> Any:
+    """Return a (dotted) field of a device dict, or _MISSING."""
+    value: Any = device
+    for part in field.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def set_field(device: dict[str, Any], field: str, value: Any) -> None:
+    """Set a (dotted) field of a device dict, creating parents as needed."""
+    *parents, last = field.split(".")
+    target = device
+    for part in parents:
+        child = target.get(part)
+        if not isinstance(child, dict):
+            child = target[part] = {}
+        target = child
+    if value is _MISSING:
+        target.pop(last, None)
+    else:
+        target[last] = value
+
+
+@dataclass(slots=True)
+class PendingWrite:
+    """One commanded value waiting for authoritative confirmation."""
+
+    value: Any
+    authoritative: Any
+    expires_at: float
+    # Set once the command was acknowledged; data sampled earlier is stale
+    acknowledged_at: float | None = None
+
+
+class OptimisticOverlay:
+    """Per-field pending writes layered over polled and pushed device data.
+
+    A pending value is re-applied after every merge of authoritative data
+    until data that was sampled after the command was acknowledged arrives:
+    it is then confirmed (same value) or yields to the newer value (conflict).
+    Times are monotonic; sources pass the time their data was sampled.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL) -> None:
+        """Initialize the overlay."""
+        self.ttl = ttl
+        self.pending: dict[str, dict[str, PendingWrite]] = {}
+        self.confirmed = 0
+        self.conflicts = 0
+        self.expired = 0
+        self.rolled_back = 0
+
+    def begin(self, device: dict[str, Any], device_id: str, fields: dict[str, Any]) -> None:
+        """Record pending writes and show them on the device immediately."""
+        pending = self.pending.setdefault(device_id, {})
+        expires_at = time.monotonic() + self.ttl
+        for field, value in fields.items():
+            previous = pending.get(field)
+            authoritative = (
+                previous.authoritative if previous else get_field(device, field)
+            )
+            pending[field] = PendingWrite(value, authoritative, expires_at)
+            set_field(device, field, value)
+
+    def acknowledge(self, device_id: str, fields: dict[str, Any]) -> None:
+        """Mark writes as accepted by the backend/device."""
+        now = time.monotonic()
+        for field in fields:
+            write = self.pending.get(device_id, {}).get(field)
+            if write is not None:
+                write.acknowledged_at = now
+                write.expires_at = now + self.ttl
+
+    def rollback(self, device: dict[str, Any] | None, device_id: str, fields: dict[str, Any]) -> None:
+        """Drop writes of a failed command and restore the authoritative value."""
+        pending = self.pending.get(device_id, {})
+        for field in fields:
+            write = pending.pop(field, None)
+            if write is None:
+                continue
+            self.rolled_back += 1
+            if device is not None:
+                set_field(device, field, write.authoritative)
+        if not pending:
+            self.pending.pop(device_id, None)
+
+    def reconcile(
+        self,
+        device: dict[str, Any],
+        device_id: str,
+        sampled_at: float,
+        fields: frozenset[str] | None = None,
+        ignore: frozenset[str] = frozenset(),
+    ) -> None:
+        """Reconcile freshly merged data against pending writes.
+
+        ``fields`` limits reconciliation to the top-level fields the source
+        carries (None: a full device snapshot); fields in ``ignore`` are not
+        authoritative in this source.
+        """
+        pending = self.pending.get(device_id)
+        if not pending:
+            return
+        now = time.monotonic()
+        for field, write in list(pending.items()):
+            top = field.split(".", 1)[0]
+            if (fields is not None and top not in fields) or top in ignore:
+                set_field(device, field, write.value)
+                continue
+            actual = get_field(device, field)
+            if actual == write.value:
+                self.confirmed += 1
+                del pending[field]
+            elif write.acknowledged_at is not None and sampled_at >= write.acknowledged_at:
+                # Newer authoritative data disagrees: it wins
+                self.conflicts += 1
+                del pending[field]
+            elif now >= write.expires_at:
+                self.expired += 1
+                del pending[field]
+            else:
+                # Data predates the command: keep showing the commanded value
+                write.authoritative = actual
+                set_field(device, field, write.value)
+        if not pending:
+            del self.pending[device_id]
+
+    def expire(self, devices: dict[str, dict[str, Any]]) -> set[str]:
+        """Drop overdue writes, restoring the last authoritative value.
+
+        Returns the fields that changed.
+        """
+        now = time.monotonic()
+        changed: set[str] = set()
+        for device_id, pending in list(self.pending.items()):
+            device = devices.get(device_id)
+            for field, write in list(pending.items()):
+                if now < write.expires_at:
+                    continue
+                self.expired += 1
+                del pending[field]
+                if device is not None:
+                    set_field(device, field, write.authoritative)
+                    changed.add(field)
+            if not pending:
+                del self.pending[device_id]
+        return changed
+
+    def next_expiry(self) -> float | None:
+        """Return the monotonic time of the next expiry."""
+        return min(
+            (
+                write.expires_at
+                for pending in self.pending.values()
+                for write in pending.values()
+            ),
+            default=None,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the overlay."""
+        return {
+            "pending": {
+                device_id: sorted(pending) for device_id, pending in self.pending.items()
+            },
+            "confirmed": self.confirmed,
+            "conflicts": self.conflicts,
+            "expired": self.expired,
+            "rolled_back": self.rolled_back,
+        }
@@ -0,0 +1,116 @@
+"""On-demand sampling profiler for the Taubenschiesser integration."""
+from __future__ import annotations
+
+from collections import Counter
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+# Only frames from this package are attributed to the integration
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _frame_label(code) -> str:
+    filename = os.path.relpath(code.co_filename, PACKAGE_DIR)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Sample the stacks of all threads (event loop, paho, executor).
+
+    The profiler only exists while a capture is running; nothing is hooked
+    into the interpreter otherwise, so the idle overhead is zero.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """Initialize the profiler."""
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="taubenschiesser-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread (blocking)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():  # noqa: SLF001
+                if ident == own_ident:
+                    continue
+                stack = self._integration_stack(frame)
+                if stack:
+                    self.stacks[(names.get(ident, str(ident)), *stack)] += 1
+            self.samples += 1
+
+    @staticmethod
+    def _integration_stack(frame) -> list[str]:
+        """Return the stack (root first) starting at the outermost integration frame."""
+        stack: list[str] = []
+        outermost = -1
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename.startswith(PACKAGE_DIR):
+                outermost = len(stack)
+                stack.append(_frame_label(code))
+            else:
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+            frame = frame.f_back
+        if outermost < 0:
+            return []
+        return stack[outermost::-1]
+
+    def folded(self) -> str:
+        """Return samples in folded-stack format (flamegraph.pl, speedscope)."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.items()
+        )
+
+    def top_functions(self, limit: int) -> list[dict[str, Any]]:
+        """Return the hottest integration functions by inclusive samples."""
+        inclusive: Counter[str] = Counter()
+        own: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            frames = [f for f in stack[1:] if not f.endswith(".py)")]
+            for label in set(frames):
+                inclusive[label] += count
+            leaf = stack[-1]
+            own[leaf] += count
+        total = max(sum(self.stacks.values()), 1)
+        return [
+            {
+                "function": label,
+                "samples": count,
+                "self_samples": own.get(label, 0),
+                "percent": round(100 * count / total, 2),
+            }
+            for label, count in inclusive.most_common(limit)
+        ]
+
+
+def write_profile(path: str, profiler: SamplingProfiler) -> None:
+    """Write the folded stacks of a capture to disk (blocking)."""
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(profiler.folded())
+
+
+def profile_path(config_dir: str) -> str:
+    """Return a fresh output path for a capture."""
+    return os.path.join(
+        config_dir, f"taubenschiesser_profile_{time.strftime('%Y%m%d_%H%M%S')}.folded"
+    )
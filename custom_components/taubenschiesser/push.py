@@ -0,0 +1,180 @@
+"""Server-Sent Events push channel from the Taubenschiesser backend."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import json
+import logging
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from homeassistant.core import callback
+
+from .const import (
+    API_ENDPOINT_EVENTS,
+    DEFAULT_UPDATE_INTERVAL,
+    PUSH_CONSISTENCY_INTERVAL,
+    PUSH_IDLE_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import TaubenschiesserDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+RECONNECT_MIN = 1.0
+RECONNECT_MAX = 60.0
+
+
+class TaubenschiesserPushClient:
+    """Consume per-device deltas from the backend event stream.
+
+    The stream uses the shared aiohttp session. Each event carries an ``id``
+    (sequence number) that is sent back as ``Last-Event-ID`` on reconnect, so
+    the backend can replay what was missed. While the stream is connected the
+    coordinator only polls as a slow consistency sweep.
+    """
+
+    def __init__(self, coordinator: TaubenschiesserDataUpdateCoordinator) -> None:
+        """Initialize the push client."""
+        self.coordinator = coordinator
+        self.last_event_id: str | None = None
+        self.connected = False
+        self.events = 0
+        self.reconnects = 0
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start the background stream task."""
+        if self._task is None:
+            self._task = self.coordinator.hass.async_create_background_task(
+                self._async_run(), "taubenschiesser_push"
+            )
+
+    async def async_stop(self) -> None:
+        """Stop the stream task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._set_connected(False)
+
+    def _set_connected(self, connected: bool) -> None:
+        if connected == self.connected:
+            return
+        self.connected = connected
+        if self.coordinator.shards:
+            # Shards keep their own poll schedule
+            return
+        seconds = PUSH_CONSISTENCY_INTERVAL if connected else DEFAULT_UPDATE_INTERVAL
+        self.coordinator.update_interval = timedelta(seconds=seconds)
+        _LOGGER.info(
+            "Push-Kanal %s, Poll-Intervall %s s",
+            "verbunden" if connected else "getrennt",
+            seconds,
+        )
+
+    async def _async_run(self) -> None:
+        delay = RECONNECT_MIN
+        while True:
+            try:
+                await self._async_stream()
+                delay = RECONNECT_MIN
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Push-Kanal Fehler: %s", err)
+            self._set_connected(False)
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    async def _async_stream(self) -> None:
+        coordinator = self.coordinator
+        headers = {
+            "Authorization": f"Bearer {coordinator.access_token}",
+            "Accept": "text/event-stream",
+        }
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+
+        async with coordinator.session.get(
+            f"{coordinator.api_url}{API_ENDPOINT_EVENTS}",
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=PUSH_IDLE_TIMEOUT),
+        ) as response:
+            if response.status == 401 and coordinator.refresh_token:
+                await coordinator._refresh_token()
+                return
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message="Push-Kanal nicht verfügbar",
+                )
+
+            self._set_connected(True)
+            event_type = "message"
+            event_id: str | None = None
+            data_lines: list[str] = []
+            async for raw_line in response.content:
+                line = raw_line.decode("utf-8").rstrip("\r\n")
+                if not line:
+                    if data_lines:
+                        self._handle_event(event_type, event_id, "\n".join(data_lines))
+                    event_type, event_id, data_lines = "message", None, []
+                    continue
+                if line.startswith(":"):
+                    continue  # heartbeat comment
+                field, _, value = line.partition(":")
+                value = value.removeprefix(" ")
+                if field == "event":
+                    event_type = value
+                elif field == "data":
+                    data_lines.append(value)
+                elif field == "id":
+                    event_id = value
+
+    def _handle_event(self, event_type: str, event_id: str | None, data: str) -> None:
+        """Apply one event to the coordinator."""
+        coordinator = self.coordinator
+        try:
+            payload: Any = json.loads(data)
+        except ValueError:
+            _LOGGER.debug("Ungültiges Push-Event: %s", data)
+            return
+
+        self.events += 1
+        if coordinator.capture is not None:
+            coordinator.capture.record_push(event_type, payload)
+        if event_type in ("device", "message") and isinstance(payload, dict):
+            device_id = payload.get("_id") or payload.get("deviceId")
+            changes = payload.get("changes", payload)
+            if device_id and isinstance(changes, dict):
+                changes = {k: v for k, v in changes.items() if k not in ("_id", "deviceId")}
+                coordinator.async_apply_device_delta(device_id, changes)
+        elif event_type == "detection" and isinstance(payload, dict):
+            device_id = payload.get("deviceId") or payload.get("device_id")
+            if device_id:
+                coordinator.async_handle_detection(device_id, payload)
+        elif event_type == "reset":
+            # Backend cannot resume from our sequence: fall back to a full poll
+            coordinator.hass.async_create_task(coordinator.async_request_refresh())
+
+        if event_id is not None:
+            self.last_event_id = event_id
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the push channel."""
+        return {
+            "connected": self.connected,
+            "events": self.events,
+            "reconnects": self.reconnects,
+            "last_event_id": self.last_event_id,
+        }
@@ -0,0 +1,131 @@
+"""Last-known device telemetry persisted across restarts."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+SOURCE_STORAGE = "storage"
+SOURCE_MQTT_RETAINED = "mqtt_retained"
+
+
+def position_from_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    """Return the cached position form of an MQTT info payload."""
+    position = {
+        "rot": payload.get("Rot", 0),
+        "tilt": payload.get("Tilt", 0),
+        "moving": payload.get("moving", False),
+        "watertank": payload.get("watertank", True),
+        "cam": payload.get("Cam", False),
+        "laser": payload.get("laser", False),
+    }
+    if "timeMQTT" in payload:
+        position["timeMQTT"] = payload.get("timeMQTT")
+    if "wifi" in payload:
+        position["wifi"] = payload.get("wifi")
+    return position
+
+
+class RetainedTelemetry:
+    """Last live position per device IP, saved debounced and restored on boot.
+
+    Restored entries stand in for the MQTT cache until the device sends a live
+    message, so entities start with the last real values instead of a fake
+    home position. ``source`` and ``at`` (unix time of the original message,
+    None if unknown) let entities expose how old a restored value is.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.telemetry.{entry_id}"
+        )
+        # Live positions to persist, keyed by device IP
+        self.positions: dict[str, dict[str, Any]] = {}
+        # Restored positions not yet superseded by a live message
+        self.restored: dict[str, dict[str, Any]] = {}
+        self.saves = 0
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """Restore the positions saved before the last shutdown."""
+        data = await self._store.async_load() or {}
+        for device_ip, position in data.get("devices", {}).items():
+            if not isinstance(position, dict):
+                continue
+            self.positions[device_ip] = position
+            self.restored[device_ip] = {**position, "source": SOURCE_STORAGE}
+        if self.restored:
+            _LOGGER.debug("Telemetrie von %s Geräten wiederhergestellt", len(self.restored))
+
+    @callback
+    def async_remember(self, device_ip: str, position: dict[str, Any]) -> None:
+        """Remember a live position and schedule a save."""
+        self.restored.pop(device_ip, None)
+        self.positions[device_ip] = {**position, "at": time.time()}
+        self._async_schedule_save()
+
+    @callback
+    def async_retained(self, device_ip: str, position: dict[str, Any]) -> dict[str, Any] | None:
+        """Use a retained broker message unless live data already arrived."""
+        if device_ip in self.positions and device_ip not in self.restored:
+            return None
+        restored = self.restored[device_ip] = {
+            **position,
+            "source": SOURCE_MQTT_RETAINED,
+            "at": None,
+        }
+        return restored
+
+    @callback
+    def async_forget(self, device_ip: str) -> None:
+        """Drop a removed device."""
+        self.restored.pop(device_ip, None)
+        if self.positions.pop(device_ip, None) is not None:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule one save SAVE_DELAY after the first change.
+
+        async_delay_save restarts its timer on every call, and devices report
+        every few seconds, so rescheduling per flush would never write.
+        Later changes are picked up by the pending save instead.
+        """
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        self.saves += 1
+        return {"devices": self.positions}
+
+    async def async_save(self) -> None:
+        """Write pending positions (on shutdown)."""
+        if self.positions:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the stored positions (entry removed)."""
+        await self._store.async_remove()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the store."""
+        return {
+            "devices": len(self.positions),
+            "restored": {
+                device_ip: restored["source"] for device_ip, restored in self.restored.items()
+            },
+            "saves": self.saves,
+        }
@@ -1,6 +1,7 @@
 """Sensor platform for Taubenschiesser."""
 from __future__ import annotations
 
+import time
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -10,8 +11,12 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
@@ -21,14 +26,26 @@ from .const import (
     ATTR_MONITOR_STATUS,
     ATTR_MOVING,
     ATTR_ROTATION,
+    ATTR_RESTORED_AGE,
+    ATTR_STALE_SINCE,
     ATTR_STATUS,
+    ATTR_TELEMETRY_RESTORED,
     ATTR_TILT,
     ATTR_TODAY_DETECTIONS,
     ATTR_WIFI,
     ATTR_YESTERDAY_DETECTIONS,
+    ATTR_DETECTIONS_5MIN,
+    ATTR_DETECTIONS_HOUR,
+    ATTR_DETECTIONS_DAY,
     ATTR_DYNAMIC_THRESHOLD,
     ATTR_HOLDING,
+    CONF_HIGH_RESOLUTION,
+    CONF_PERFORMANCE_SENSORS,
     DOMAIN,
+    LISTENER_TELEMETRY,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_SUMMARY_UPDATED,
+    SIGNAL_DETECTIONS_DECAYED,
 )
 from .coordinator import TaubenschiesserDataUpdateCoordinator
 
@@ -37,12 +54,14 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
         key=ATTR_ROTATION,
         name="Rotation",
         native_unit_of_measurement="°",
+        state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:rotate-3d-variant",
     ),
     SensorEntityDescription(
         key=ATTR_TILT,
         name="Tilt",
         native_unit_of_measurement="°",
+        state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:angle-acute",
     ),
     SensorEntityDescription(
@@ -57,6 +76,7 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
         name="WLAN-Signal",
         native_unit_of_measurement="dBm",
         device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:wifi",
     ),
     SensorEntityDescription(
@@ -68,6 +88,7 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
         key=ATTR_TODAY_DETECTIONS,
         name="Erkennungen heute",
         native_unit_of_measurement="Erkennungen",
+        state_class=SensorStateClass.TOTAL_INCREASING,
         icon="mdi:counter",
     ),
     SensorEntityDescription(
@@ -76,6 +97,27 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
         native_unit_of_measurement="Erkennungen",
         icon="mdi:counter",
     ),
+    SensorEntityDescription(
+        key=ATTR_DETECTIONS_5MIN,
+        name="Erkennungen letzte 5 Minuten",
+        native_unit_of_measurement="Erkennungen",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:counter",
+    ),
+    SensorEntityDescription(
+        key=ATTR_DETECTIONS_HOUR,
+        name="Erkennungen letzte Stunde",
+        native_unit_of_measurement="Erkennungen",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:counter",
+    ),
+    SensorEntityDescription(
+        key=ATTR_DETECTIONS_DAY,
+        name="Erkennungen letzte 24 Stunden",
+        native_unit_of_measurement="Erkennungen",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:counter",
+    ),
     SensorEntityDescription(
         key=ATTR_DYNAMIC_THRESHOLD,
         name="Dyn Wait",
@@ -85,6 +127,191 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
     ),
 )
 
+# Recorder throttling per telemetry sensor: (deadband, min interval in seconds).
+# Disabled by the "high resolution" option.
+SENSOR_THROTTLE: dict[str, tuple[float, float]] = {
+    ATTR_ROTATION: (2.0, 10.0),
+    ATTR_TILT: (2.0, 10.0),
+    ATTR_WIFI: (3.0, 60.0),
+    ATTR_LAST_MQTT: (30.0, 60.0),
+}
+
+# Sensors fed by MQTT telemetry; they listen to the telemetry fast path only
+TELEMETRY_SENSORS = frozenset({ATTR_ROTATION, ATTR_TILT, ATTR_WIFI, ATTR_LAST_MQTT})
+# Rolling windows that also change when no detection arrives (decay)
+ROLLING_DETECTION_SENSORS = frozenset(
+    {ATTR_DETECTIONS_5MIN, ATTR_DETECTIONS_HOUR, ATTR_DETECTIONS_DAY}
+)
+
+# Optional performance sensors for the config entry (API/poll health)
+ENTRY_PERFORMANCE_TYPES: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="api_rtt_devices",
+        name="API RTT Geräteliste",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-outline",
+    ),
+    SensorEntityDescription(
+        key="api_rtt_auth_me",
+        name="API RTT Token-Check",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-outline",
+    ),
+    SensorEntityDescription(
+        key="api_rtt_auth_refresh",
+        name="API RTT Token-Refresh",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-outline",
+    ),
+    SensorEntityDescription(
+        key="api_rtt_device_control",
+        name="API RTT Gerätesteuerung",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-outline",
+    ),
+    SensorEntityDescription(
+        key="api_rtt_device_update",
+        name="API RTT Geräte-Update",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-outline",
+    ),
+    SensorEntityDescription(
+        key="poll_duration",
+        name="Poll-Dauer",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-sync-outline",
+    ),
+    SensorEntityDescription(
+        key="last_poll_age",
+        name="Letzter erfolgreicher Poll",
+        native_unit_of_measurement="s",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:clock-check-outline",
+    ),
+    SensorEntityDescription(
+        key="token_refreshes",
+        name="Token-Refreshes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:key-change",
+    ),
+)
+
+# Fleet summary per config entry, kept as incremental counters by the coordinator
+FLEET_SUMMARY_TYPES: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="online",
+        name="Geräte online",
+        native_unit_of_measurement="Geräte",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:lan-connect",
+    ),
+    SensorEntityDescription(
+        key="offline",
+        name="Geräte offline",
+        native_unit_of_measurement="Geräte",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:lan-disconnect",
+    ),
+    SensorEntityDescription(
+        key="error",
+        name="Geräte mit Fehler",
+        native_unit_of_measurement="Geräte",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:alert-circle",
+    ),
+    SensorEntityDescription(
+        key="maintenance",
+        name="Geräte in Wartung",
+        native_unit_of_measurement="Geräte",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:wrench",
+    ),
+    SensorEntityDescription(
+        key="running",
+        name="Monitor aktiv",
+        native_unit_of_measurement="Geräte",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:play-circle",
+    ),
+    SensorEntityDescription(
+        key="paused",
+        name="Monitor pausiert",
+        native_unit_of_measurement="Geräte",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:pause-circle",
+    ),
+    SensorEntityDescription(
+        key="armed",
+        name="Scharf geschaltet",
+        native_unit_of_measurement="Geräte",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:shield-check",
+    ),
+    SensorEntityDescription(
+        key="tank_empty",
+        name="Wassertank leer",
+        native_unit_of_measurement="Geräte",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-off",
+    ),
+    SensorEntityDescription(
+        key="detections_today",
+        name="Erkennungen heute gesamt",
+        native_unit_of_measurement="Erkennungen",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:counter",
+    ),
+    SensorEntityDescription(
+        key="mqtt_stale",
+        name="MQTT veraltet",
+        native_unit_of_measurement="Geräte",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-alert",
+    ),
+)
+
+# Optional performance sensors per device (locally measured MQTT health)
+DEVICE_PERFORMANCE_TYPES: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="mqtt_message_age",
+        name="MQTT Nachrichtenalter",
+        native_unit_of_measurement="s",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:message-badge-outline",
+    ),
+    SensorEntityDescription(
+        key="mqtt_message_rate",
+        name="MQTT Nachrichtenrate",
+        native_unit_of_measurement="1/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:message-fast-outline",
+    ),
+    SensorEntityDescription(
+        key="mqtt_publish_latency",
+        name="MQTT Befehlslatenz",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:send-clock-outline",
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -94,33 +321,194 @@ async def async_setup_entry(
     """Set up Taubenschiesser sensors from a config entry."""
     coordinator: TaubenschiesserDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities = []
-    for device_id, device in coordinator.data.get("devices", {}).items():
-        for description in SENSOR_TYPES:
-            entities.append(
-                TaubenschiesserSensor(coordinator, device_id, device, description)
-            )
+    high_resolution = entry.options.get(CONF_HIGH_RESOLUTION, False)
+    performance_sensors = entry.options.get(CONF_PERFORMANCE_SENSORS, False)
+
+    @callback
+    def async_add_device_entities(device_ids: set[str] | None = None) -> None:
+        devices = coordinator.data.get("devices", {})
+        entities = []
+        for device_id, device in devices.items():
+            if device_ids is not None and device_id not in device_ids:
+                continue
+            for description in SENSOR_TYPES:
+                entities.append(
+                    TaubenschiesserSensor(
+                        coordinator,
+                        device_id,
+                        device,
+                        description,
+                        high_resolution=high_resolution,
+                    )
+                )
+            if performance_sensors:
+                for description in DEVICE_PERFORMANCE_TYPES:
+                    entities.append(
+                        TaubenschiesserDevicePerformanceSensor(
+                            coordinator, device_id, device, description
+                        )
+                    )
+        async_add_entities(entities)
+
+    async_add_device_entities()
 
-    async_add_entities(entities)
+    async_add_entities(
+        TaubenschiesserFleetSummarySensor(coordinator, entry, description)
+        for description in FLEET_SUMMARY_TYPES
+    )
+
+    if performance_sensors:
+        async_add_entities(
+            TaubenschiesserEntryPerformanceSensor(coordinator, entry, description)
+            for description in ENTRY_PERFORMANCE_TYPES
+        )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_DEVICES_ADDED.format(entry_id=entry.entry_id),
+            async_add_device_entities,
+        )
+    )
 
 
 class TaubenschiesserSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Taubenschiesser sensor."""
 
+    # Context that rarely changes; kept on the entity but not in every recorder row
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_DEVICE_IP,
+            ATTR_MONITOR_STATUS,
+            ATTR_LAST_SEEN,
+            ATTR_LAST_MQTT,
+            ATTR_TELEMETRY_RESTORED,
+            ATTR_RESTORED_AGE,
+            ATTR_STALE_SINCE,
+        }
+    )
+
     def __init__(
         self,
         coordinator: TaubenschiesserDataUpdateCoordinator,
         device_id: str,
         device: dict,
         description: SensorEntityDescription,
+        high_resolution: bool = False,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            LISTENER_TELEMETRY if description.key in TELEMETRY_SENSORS else None,
+        )
         self.device_id = device_id
         self.device = device
         self.entity_description = description
         self._attr_unique_id = f"{device_id}_{description.key}"
         self._attr_name = f"{device.get('name', 'Taubenschiesser')} {description.name}"
+        self._throttle = None if high_resolution else SENSOR_THROTTLE.get(description.key)
+        self._last_written_value: Any = None
+        self._last_written_available: bool | None = None
+        self._last_written_at: float | None = None
+        self._trailing_unsub: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the staleness watchdog and rolling window decay."""
+        await super().async_added_to_hass()
+        if self.entity_description.key in TELEMETRY_SENSORS:
+            self.async_on_remove(
+                self.coordinator.async_add_availability_listener(
+                    self.device_id, self._async_write_tracked
+                )
+            )
+        if self.entity_description.key in ROLLING_DETECTION_SENSORS:
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass,
+                    SIGNAL_DETECTIONS_DECAYED.format(
+                        entry_id=self.coordinator.entry.entry_id
+                    ),
+                    self._async_detections_decayed,
+                )
+            )
+
+    @callback
+    def _async_detections_decayed(self, changed: set[str]) -> None:
+        if self.device_id in changed:
+            self._async_write_tracked()
+
+    @property
+    def available(self) -> bool:
+        """Return False while the device's telemetry is overdue."""
+        if self.entity_description.key in TELEMETRY_SENSORS:
+            return super().available and self.coordinator.device_available(self.device_id)
+        return super().available
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending trailing write."""
+        if self._trailing_unsub is not None:
+            self._trailing_unsub()
+            self._trailing_unsub = None
+        await super().async_will_remove_from_hass()
+
+    def _should_write(self, value: Any, now: float) -> bool:
+        """Return True if the change passes deadband and min-interval filtering."""
+        if self._last_written_at is None or self.available != self._last_written_available:
+            return True
+        last = self._last_written_value
+        if value == last:
+            return False
+        deadband, min_interval = self._throttle
+        if now - self._last_written_at < min_interval:
+            return False
+        if not isinstance(value, (int, float)) or not isinstance(last, (int, float)):
+            return True
+        return abs(value - last) >= deadband
+
+    @callback
+    def _async_write_tracked(self) -> None:
+        if self._trailing_unsub is not None:
+            self._trailing_unsub()
+            self._trailing_unsub = None
+        self.async_write_ha_state()
+        self._last_written_value = self.native_value
+        self._last_written_available = self.available
+        self._last_written_at = time.monotonic()
+        self.coordinator.metrics.record_state_write(self.device_id)
+
+    @callback
+    def _async_trailing_write(self, _now: Any) -> None:
+        """Write the settled value, even if it is within the deadband."""
+        self._trailing_unsub = None
+        if (
+            self.native_value != self._last_written_value
+            or self.available != self._last_written_available
+        ):
+            self._async_write_tracked()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state, filtering telemetry noise unless high resolution is on."""
+        if self._throttle is None:
+            self._async_write_tracked()
+            return
+
+        value = self.native_value
+        now = time.monotonic()
+        if self._should_write(value, now):
+            self._async_write_tracked()
+            return
+
+        self.coordinator.metrics.record_state_write(self.device_id, suppressed=True)
+        if value != self._last_written_value and self._trailing_unsub is None:
+            min_interval = self._throttle[1]
+            delay = min_interval - (now - self._last_written_at)
+            if delay <= 0:
+                # Held back by the deadband: write it if it is still current then
+                delay = min_interval
+            self._trailing_unsub = async_call_later(
+                self.hass, delay, self._async_trailing_write
+            )
 
     @property
     def native_value(self) -> float | str | None:
@@ -151,6 +539,14 @@ class TaubenschiesserSensor(CoordinatorEntity, SensorEntity):
                 # Return yesterday's detection count
                 counts = device.get("detectionCounts", {})
                 return counts.get("yesterday", 0)
+            elif key in (ATTR_DETECTIONS_5MIN, ATTR_DETECTIONS_HOUR, ATTR_DETECTIONS_DAY):
+                # Rolling counts from locally ingested detection events
+                windows = self.coordinator.detections.windows(self.device_id)
+                if windows is None:
+                    return None
+                return windows[
+                    (ATTR_DETECTIONS_5MIN, ATTR_DETECTIONS_HOUR, ATTR_DETECTIONS_DAY).index(key)
+                ]
             elif key == ATTR_DYNAMIC_THRESHOLD:
                 hm = device.get("hardwareMonitor", {}) or {}
                 hm_data = hm.get("lastWaitingData") or hm.get("lastEventData", {}) or {}
@@ -162,8 +558,8 @@ class TaubenschiesserSensor(CoordinatorEntity, SensorEntity):
                 except (TypeError, ValueError):
                     return None
             else:
-                # Numeric values (rotation, tilt)
-                return device.get(key, 0)
+                # Numeric values (rotation, tilt); unknown until reported
+                return device.get(key)
         return None
 
     @property
@@ -191,6 +587,16 @@ class TaubenschiesserSensor(CoordinatorEntity, SensorEntity):
         if device.get(ATTR_LAST_MQTT):
             attrs[ATTR_LAST_MQTT] = device[ATTR_LAST_MQTT]
 
+        restored = device.get(ATTR_TELEMETRY_RESTORED)
+        if restored and self.entity_description.key in TELEMETRY_SENSORS:
+            attrs[ATTR_TELEMETRY_RESTORED] = restored["source"]
+            if restored.get("at"):
+                attrs[ATTR_RESTORED_AGE] = int(time.time() - restored["at"])
+
+        if self.coordinator.snapshot_stale:
+            # Backend unreachable: the values are the last snapshot
+            attrs[ATTR_STALE_SINCE] = self.coordinator.fetch_stats.stale_since
+
         return attrs
 
     @property
@@ -209,3 +615,176 @@ class TaubenschiesserSensor(CoordinatorEntity, SensorEntity):
             "configuration_url": f"http://{device_ip}" if device_ip else None,
         }
 
+
+
+class TaubenschiesserPerformanceSensorBase(SensorEntity):
+    """Base for performance sensors written on the coordinator's shared tick."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: TaubenschiesserDataUpdateCoordinator,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+
+    async def async_added_to_hass(self) -> None:
+        """Register on the shared performance tick."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_performance_listener(self.async_write_ha_state)
+        )
+
+
+class TaubenschiesserEntryPerformanceSensor(TaubenschiesserPerformanceSensorBase):
+    """API and poll health of a config entry."""
+
+    def __init__(
+        self,
+        coordinator: TaubenschiesserDataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, description)
+        self.entry_id = entry.entry_id
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_name = f"Taubenschiesser {description.name}"
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the state of the sensor."""
+        metrics = self.coordinator.metrics
+        key = self.entity_description.key
+        if key.startswith("api_rtt_"):
+            histogram = metrics.api_rtt.get(key.removeprefix("api_rtt_"))
+            if histogram is None or histogram.last is None:
+                return None
+            return round(histogram.last, 1)
+        if key == "poll_duration":
+            last = metrics.poll_duration.last
+            return round(last, 1) if last is not None else None
+        if key == "last_poll_age":
+            if metrics.last_successful_poll is None:
+                return None
+            return round(time.time() - metrics.last_successful_poll)
+        if key == "token_refreshes":
+            return metrics.token_refreshes
+        return None
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device information for the integration itself."""
+        return {
+            "identifiers": {(DOMAIN, self.entry_id)},
+            "name": "Taubenschiesser Integration",
+            "manufacturer": "Taubenschiesser",
+            "model": "Home Assistant Integration",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
+
+
+class TaubenschiesserDevicePerformanceSensor(TaubenschiesserPerformanceSensorBase):
+    """Locally measured MQTT health of a device."""
+
+    def __init__(
+        self,
+        coordinator: TaubenschiesserDataUpdateCoordinator,
+        device_id: str,
+        device: dict,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, description)
+        self.device_id = device_id
+        self._attr_unique_id = f"{device_id}_{description.key}"
+        self._attr_name = f"{device.get('name', 'Taubenschiesser')} {description.name}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        device = self.coordinator.data.get("devices", {}).get(self.device_id)
+        if not device:
+            return None
+        stats = self.coordinator.metrics.device_mqtt_stats(
+            device.get("taubenschiesser", {}).get("ip")
+        )
+        key = self.entity_description.key
+        if key == "mqtt_message_age":
+            return stats["last_message_age_s"]
+        if key == "mqtt_message_rate":
+            return stats["messages_per_minute"]
+        if key == "mqtt_publish_latency":
+            publish = stats["publish_latency"]
+            return publish["last_ms"] if publish else None
+        return None
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device information."""
+        device = self.coordinator.data.get("devices", {}).get(self.device_id)
+        if not device:
+            return {}
+
+        device_ip = device.get("taubenschiesser", {}).get("ip", "")
+        return {
+            "identifiers": {(DOMAIN, self.device_id)},
+            "name": device.get("name", "Taubenschiesser"),
+            "manufacturer": "Taubenschiesser",
+            "model": "Taubenschiesser Device",
+            "configuration_url": f"http://{device_ip}" if device_ip else None,
+        }
+
+
+class TaubenschiesserFleetSummarySensor(SensorEntity):
+    """Fleet-wide count of a config entry, written only when it changes."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: TaubenschiesserDataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self.entry_id = entry.entry_id
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_fleet_{description.key}"
+        self._attr_name = f"Taubenschiesser {description.name}"
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to summary changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_SUMMARY_UPDATED.format(entry_id=self.entry_id),
+                self._async_summary_updated,
+            )
+        )
+
+    @callback
+    def _async_summary_updated(self, changed: set[str]) -> None:
+        if self.entity_description.key in changed:
+            self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> int:
+        """Return the current count."""
+        return self.coordinator.summary.counts[self.entity_description.key]
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device information for the integration itself."""
+        return {
+            "identifiers": {(DOMAIN, self.entry_id)},
+            "name": "Taubenschiesser Integration",
+            "manufacturer": "Taubenschiesser",
+            "model": "Home Assistant Integration",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
@@ -0,0 +1,244 @@
+"""Services for the Taubenschiesser integration."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+import time
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SERVICE_AIM,
+    SERVICE_CAPTURE_TRAFFIC,
+    SERVICE_PROFILE,
+    SERVICE_QUERY_HISTORY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PROFILING = f"{DOMAIN}_profiling"
+DATA_CAPTURING = f"{DOMAIN}_capturing"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("seconds", default=30): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+        vol.Optional("interval_ms", default=5): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=100)
+        ),
+        vol.Optional("top", default=20): vol.All(cv.positive_int, vol.Range(max=200)),
+    }
+)
+
+CAPTURE_TRAFFIC_SCHEMA = vol.Schema(
+    {
+        vol.Optional("seconds", default=300): vol.All(
+            vol.Coerce(float), vol.Range(min=5, max=3600)
+        ),
+    }
+)
+
+QUERY_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("device_id"): cv.string,
+        vol.Optional("kind", default="detection"): vol.In(["detection", "shot", "wifi", "outage"]),
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("resolution", default="hour"): vol.In(["raw", "hour", "day"]),
+    }
+)
+
+AIM_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required("device_id"): cv.string,
+            vol.Optional("rotation"): vol.Coerce(float),
+            vol.Optional("tilt"): vol.Coerce(float),
+            vol.Optional("delta_rotation"): vol.Coerce(float),
+            vol.Optional("delta_tilt"): vol.Coerce(float),
+            vol.Optional("speed", default=1): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=10)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key("rotation", "tilt", "delta_rotation", "delta_tilt"),
+)
+
+
+def _coordinators(hass: HomeAssistant) -> list:
+    """Return the coordinators of all loaded config entries."""
+    return list(hass.data.get(DOMAIN, {}).values())
+
+
+async def _async_profile(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Sample the integration's code paths for N seconds."""
+    # Imported lazily: the profiler is never loaded unless the service runs
+    from .profiler import SamplingProfiler, profile_path, write_profile
+
+    if hass.data.get(DATA_PROFILING):
+        raise HomeAssistantError("Es läuft bereits eine Profiling-Aufnahme")
+
+    hass.data[DATA_PROFILING] = True
+    profiler = SamplingProfiler(interval=call.data["interval_ms"] / 1000)
+    started = time.time()
+    try:
+        profiler.start()
+        try:
+            await asyncio.sleep(call.data["seconds"])
+        finally:
+            await hass.async_add_executor_job(profiler.stop)
+
+        path = profile_path(hass.config.config_dir)
+        await hass.async_add_executor_job(write_profile, path, profiler)
+    finally:
+        hass.data.pop(DATA_PROFILING, None)
+
+    _LOGGER.info("Profil gespeichert: %s (%s Samples)", path, profiler.samples)
+    return {
+        "file": path,
+        "format": "folded",
+        "duration_s": round(time.time() - started, 2),
+        "samples": profiler.samples,
+        "top": profiler.top_functions(call.data["top"]),
+    }
+
+
+async def _async_capture_traffic(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Record MQTT, API and push traffic of every entry for N seconds."""
+    if hass.data.get(DATA_CAPTURING):
+        raise HomeAssistantError("Es läuft bereits eine Verkehrsaufzeichnung")
+    coordinators = _coordinators(hass)
+    if not coordinators:
+        raise HomeAssistantError("Keine Taubenschiesser-Integration geladen")
+
+    hass.data[DATA_CAPTURING] = True
+    captures: list[dict] = []
+    try:
+        for coordinator in coordinators:
+            await coordinator.async_start_capture()
+        await asyncio.sleep(call.data["seconds"])
+    finally:
+        for coordinator in coordinators:
+            summary = await coordinator.async_stop_capture()
+            if summary is not None:
+                captures.append(summary)
+        hass.data.pop(DATA_CAPTURING, None)
+
+    return {"format": "jsonl", "captures": captures}
+
+
+async def _async_query_history(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return aggregated detection/shot/telemetry history."""
+    stores = [c.history for c in _coordinators(hass) if c.history is not None]
+    if not stores:
+        raise HomeAssistantError(
+            "Historie ist nicht aktiviert (Optionen der Integration)"
+        )
+
+    end = call.data.get("end") or dt_util.utcnow()
+    start = call.data.get("start") or end - timedelta(days=1)
+    rows: list[dict] = []
+    for store in stores:
+        rows.extend(
+            await store.async_query(
+                call.data["kind"],
+                call.data.get("device_id"),
+                dt_util.as_utc(start).timestamp(),
+                dt_util.as_utc(end).timestamp(),
+                call.data["resolution"],
+            )
+        )
+    return {
+        "kind": call.data["kind"],
+        "resolution": call.data["resolution"],
+        "rows": rows,
+    }
+
+
+async def _async_aim(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Move a device to an absolute target or by a relative delta."""
+    device_id = call.data["device_id"]
+    coordinator = next(
+        (c for c in _coordinators(hass) if device_id in c.devices), None
+    )
+    if coordinator is None:
+        raise HomeAssistantError(f"Gerät {device_id} nicht gefunden")
+    device_ip = coordinator.devices[device_id].get("taubenschiesser", {}).get("ip")
+    if not device_ip:
+        raise HomeAssistantError(f"Keine IP für Gerät {device_id}")
+    try:
+        coordinator.aim.async_aim(
+            device_id,
+            device_ip,
+            rotation=call.data.get("rotation"),
+            tilt=call.data.get("tilt"),
+            delta_rotation=call.data.get("delta_rotation", 0.0),
+            delta_tilt=call.data.get("delta_tilt", 0.0),
+            speed=call.data["speed"],
+        )
+    except ValueError as err:
+        raise HomeAssistantError(str(err)) from err
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services (once for all config entries)."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def handle_profile(call: ServiceCall) -> ServiceResponse:
+        return await _async_profile(hass, call)
+
+    async def handle_capture_traffic(call: ServiceCall) -> ServiceResponse:
+        return await _async_capture_traffic(hass, call)
+
+    async def handle_query_history(call: ServiceCall) -> ServiceResponse:
+        return await _async_query_history(hass, call)
+
+    async def handle_aim(call: ServiceCall) -> None:
+        await _async_aim(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CAPTURE_TRAFFIC,
+        handle_capture_traffic,
+        schema=CAPTURE_TRAFFIC_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        handle_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_AIM, handle_aim, schema=AIM_SCHEMA
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove integration services when the last entry is unloaded."""
+    if hass.data.get(DOMAIN):
+        return
+    for service in (
+        SERVICE_PROFILE,
+        SERVICE_CAPTURE_TRAFFIC,
+        SERVICE_QUERY_HISTORY,
+        SERVICE_AIM,
+    ):
+        hass.services.async_remove(DOMAIN, service)
@@ -0,0 +1,214 @@
+"""Partitioned device polling with staggered phases and per-backend rate limits."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import hashlib
+import logging
+import re
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RATE_LIMITERS = f"{DOMAIN}_rate_limiters"
+
+SHARD_MIN_INTERVAL = 10.0
+# Device list requests to one backend start at least this far apart ...
+RATE_LIMIT_SPACING = 0.5
+# ... and at most this many run at once, across all entries
+RATE_LIMIT_CONCURRENCY = 2
+
+
+@dataclass(slots=True)
+class Shard:
+    """One partition of the fleet, polled with its own interval and phase."""
+
+    name: str
+    params: dict[str, str]
+    interval: float
+    phase: float = 0.0
+    polls: int = 0
+    failures: int = 0
+    devices: int = 0
+    last_duration_ms: float | None = None
+    next_due: float | None = None
+
+
+def parse_shards(spec: str, default_interval: float) -> list[Shard]:
+    """Parse ``site=nord@30; site=sued,tag=outdoor@120`` into shards.
+
+    Each entry is a set of /api/devices query filters with an optional poll
+    interval in seconds. Raises ValueError with a readable message.
+    """
+    shards: list[Shard] = []
+    for part in re.split(r"[;\n]+", spec or ""):
+        part = part.strip()
+        if not part:
+            continue
+        filters, _, interval = part.partition("@")
+        params: dict[str, str] = {}
+        for item in filters.split(","):
+            key, sep, value = item.partition("=")
+            if not sep or not key.strip() or not value.strip():
+                raise ValueError(f"Ungültiger Filter {item.strip()!r} in {part!r}")
+            params[key.strip()] = value.strip()
+        try:
+            seconds = float(interval) if interval.strip() else float(default_interval)
+        except ValueError as err:
+            raise ValueError(f"Ungültiges Intervall in {part!r}") from err
+        if seconds < SHARD_MIN_INTERVAL:
+            raise ValueError(f"Intervall in {part!r} unter {SHARD_MIN_INTERVAL:.0f} s")
+        name = ",".join(f"{key}={value}" for key, value in params.items())
+        if any(shard.name == name for shard in shards):
+            raise ValueError(f"Shard {name!r} ist doppelt")
+        shards.append(Shard(name, params, seconds))
+    return shards
+
+
+def assign_phases(shards: list[Shard], seed: str) -> None:
+    """Spread the shards evenly over their intervals, offset per entry.
+
+    The offset derived from the entry ID keeps entries that were set up
+    together from polling in lockstep.
+    """
+    offset = int(hashlib.sha1(seed.encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+    count = len(shards)
+    for index, shard in enumerate(shards):
+        shard.phase = shard.interval * (((index + offset) / count) % 1.0)
+
+
+class BackendRateLimiter:
+    """Spacing and concurrency limit for device list requests to one backend."""
+
+    def __init__(
+        self,
+        spacing: float = RATE_LIMIT_SPACING,
+        concurrency: int = RATE_LIMIT_CONCURRENCY,
+    ) -> None:
+        """Initialize the limiter."""
+        self.spacing = spacing
+        self.concurrency = concurrency
+        self.requests = 0
+        self.delayed = 0
+        self.wait_total = 0.0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # FIFO: waiters get their start slot in arrival order
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Wait for a request slot."""
+        started = time.monotonic()
+        async with self._semaphore:
+            async with self._lock:
+                delay = self._next_start - time.monotonic()
+                if delay > 0:
+                    self.delayed += 1
+                    await asyncio.sleep(delay)
+                self._next_start = time.monotonic() + self.spacing
+            self.requests += 1
+            self.wait_total += time.monotonic() - started
+            yield
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the limiter."""
+        return {
+            "spacing_s": self.spacing,
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "delayed": self.delayed,
+            "avg_wait_ms": round(self.wait_total / self.requests * 1000, 1)
+            if self.requests
+            else None,
+        }
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant, api_url: str) -> BackendRateLimiter:
+    """Return the limiter shared by all entries using this backend URL."""
+    limiters: dict[str, BackendRateLimiter] = hass.data.setdefault(DATA_RATE_LIMITERS, {})
+    limiter = limiters.get(api_url)
+    if limiter is None:
+        limiter = limiters[api_url] = BackendRateLimiter()
+    return limiter
+
+
+class ShardScheduler:
+    """One polling task per shard, so a slow shard never delays another."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        shards: list[Shard],
+        poll: Callable[[Shard], Awaitable[None]],
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.shards = shards
+        self._poll = poll
+        self._tasks: list[asyncio.Task] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Start polling every shard at its phase."""
+        for shard in self.shards:
+            self._tasks.append(
+                self.hass.async_create_background_task(
+                    self._async_run(shard), f"taubenschiesser_shard_{shard.name}"
+                )
+            )
+
+    async def _async_run(self, shard: Shard) -> None:
+        due = time.monotonic() + shard.phase
+        while True:
+            shard.next_due = due
+            await asyncio.sleep(max(due - time.monotonic(), 0))
+            started = time.perf_counter()
+            try:
+                await self._poll(shard)
+            except Exception as err:  # pylint: disable=broad-except
+                shard.failures += 1
+                _LOGGER.warning("Abfrage von Shard %s fehlgeschlagen: %s", shard.name, err)
+            finally:
+                shard.polls += 1
+                shard.last_duration_ms = (time.perf_counter() - started) * 1000
+            due += shard.interval
+            now = time.monotonic()
+            if due < now:
+                # Overran: skip the missed slots but keep the phase
+                due += ((now - due) // shard.interval + 1) * shard.interval
+
+    async def async_stop(self) -> None:
+        """Cancel all polling tasks."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for all shards."""
+        now = time.monotonic()
+        return {
+            shard.name: {
+                "interval_s": shard.interval,
+                "phase_s": round(shard.phase, 1),
+                "devices": shard.devices,
+                "polls": shard.polls,
+                "failures": shard.failures,
+                "last_duration_ms": round(shard.last_duration_ms, 1)
+                if shard.last_duration_ms is not None
+                else None,
+                "next_in_s": round(shard.next_due - now, 1)
+                if shard.next_due is not None
+                else None,
+            }
+            for shard in self.shards
+        }
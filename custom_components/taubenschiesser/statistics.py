@@ -0,0 +1,187 @@
+"""Import hourly detection totals as external long-term statistics."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import logging
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_change
+
+from .const import API_ENDPOINT_DETECTIONS_HOURLY, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import TaubenschiesserDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximum history requested from the backend on the first import
+BACKFILL_DAYS = 365
+STARTUP_DELAY = 60
+
+
+def statistic_id(device_id: str) -> str:
+    """Return the external statistic id for a device."""
+    return f"{DOMAIN}:detections_{device_id.lower()}"
+
+
+class DetectionStatisticsImporter:
+    """Bulk-import closed hours of detection counts into the recorder."""
+
+    def __init__(self, coordinator: TaubenschiesserDataUpdateCoordinator) -> None:
+        """Initialize the importer."""
+        self.coordinator = coordinator
+        self.hass = coordinator.hass
+        self.imported_hours = 0
+        self.backend_supported: bool | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Import shortly after startup and then a few minutes past every hour."""
+        self._unsubs.append(
+            async_call_later(self.hass, STARTUP_DELAY, self._async_schedule_import)
+        )
+        self._unsubs.append(
+            async_track_time_change(
+                self.hass, self._async_schedule_import, minute=5, second=0
+            )
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel scheduled imports."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def _async_schedule_import(self, _now: datetime) -> None:
+        self.hass.async_create_background_task(
+            self.async_import(), "taubenschiesser_statistics_import"
+        )
+
+    async def async_import(self) -> None:
+        """Import all closed hours that are not in the recorder yet."""
+        current_hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        for device_id, device in list(self.coordinator.devices.items()):
+            try:
+                await self._async_import_device(device_id, device, current_hour)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning(
+                    "Statistik-Import für Gerät %s fehlgeschlagen: %s", device_id, err
+                )
+
+    async def _async_import_device(
+        self, device_id: str, device: dict[str, Any], current_hour: datetime
+    ) -> None:
+        stat_id = statistic_id(device_id)
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, stat_id, True, {"sum"}
+        )
+        last_start: datetime | None = None
+        last_sum = 0.0
+        if last.get(stat_id):
+            row = last[stat_id][0]
+            last_start = datetime.fromtimestamp(row["start"], timezone.utc)
+            last_sum = row.get("sum") or 0.0
+
+        since = last_start + timedelta(hours=1) if last_start else (
+            current_hour - timedelta(days=BACKFILL_DAYS)
+        )
+        if since >= current_hour:
+            return
+
+        hourly = await self._async_fetch_backend_hours(device_id, since)
+        if hourly is None:
+            counter = self.coordinator.detections.counters.get(device_id)
+            if counter is None:
+                return  # no source for this device
+            hourly = {hour * 3600: count for hour, count in counter.hourly.items()}
+            if last_start is None:
+                if not hourly:
+                    return  # no local events yet, nothing to start the series with
+                # Without a backend there is nothing before the first local event
+                since = max(
+                    since, datetime.fromtimestamp(min(hourly), timezone.utc)
+                )
+
+        statistics: list[StatisticData] = []
+        running = last_sum
+        start = since
+        while start < current_hour:
+            count = hourly.get(int(start.timestamp()), 0)
+            running += count
+            statistics.append(StatisticData(start=start, state=count, sum=running))
+            start += timedelta(hours=1)
+        if not statistics:
+            return
+
+        metadata = StatisticMetaData(
+            mean_type=StatisticMeanType.NONE,
+            has_sum=True,
+            name=f"{device.get('name', 'Taubenschiesser')} Erkennungen",
+            source=DOMAIN,
+            statistic_id=stat_id,
+            unit_class=None,
+            unit_of_measurement="Erkennungen",
+        )
+        async_add_external_statistics(self.hass, metadata, statistics)
+        self.imported_hours += len(statistics)
+        _LOGGER.debug("%s Stunden Statistik für %s importiert", len(statistics), device_id)
+
+    async def _async_fetch_backend_hours(
+        self, device_id: str, since: datetime
+    ) -> dict[int, int] | None:
+        """Fetch hourly totals from the backend; None if it does not offer them."""
+        if self.backend_supported is False:
+            return None
+        coordinator = self.coordinator
+        if coordinator.refresh_token:
+            await coordinator._ensure_token_valid()
+        async with coordinator._api_request(
+            "detections_hourly",
+            "GET",
+            f"{coordinator.api_url}{API_ENDPOINT_DETECTIONS_HOURLY.format(device_id=device_id)}",
+            headers={"Authorization": f"Bearer {coordinator.access_token}"},
+            params={"since": since.isoformat()},
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as response:
+            if response.status in (404, 405, 501):
+                self.backend_supported = False
+                return None
+            if response.status != 200:
+                raise Exception(f"API-Fehler (Status {response.status})")
+            self.backend_supported = True
+            rows = await response.json()
+
+        hourly: dict[int, int] = {}
+        for row in rows:
+            hour = row.get("hour")
+            if isinstance(hour, str):
+                hour = datetime.fromisoformat(hour.replace("Z", "+00:00")).timestamp()
+            if not isinstance(hour, (int, float)):
+                continue
+            if hour > 1e11:
+                hour /= 1000
+            key = int(hour // 3600) * 3600
+            hourly[key] = hourly.get(key, 0) + int(row.get("count", 0))
+        return hourly
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the importer."""
+        return {
+            "imported_hours": self.imported_hours,
+            "backend_supported": self.backend_supported,
+        }
@@ -0,0 +1,126 @@
+"""Fleet-wide counters maintained incrementally per device transition."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+from .const import ATTR_STATUS, ATTR_WATERTANK
+
+SUMMARY_KEYS: tuple[str, ...] = (
+    "online",
+    "offline",
+    "error",
+    "maintenance",
+    "running",
+    "paused",
+    "armed",
+    "tank_empty",
+    "detections_today",
+    "mqtt_stale",
+)
+
+# (status, monitor status, armed, tank empty, detections today)
+DeviceState = tuple[str, str, int, int, int]
+
+
+def _device_state(device: dict[str, Any]) -> DeviceState:
+    counts = device.get("detectionCounts") or {}
+    today = counts.get("today", 0) if isinstance(counts, dict) else 0
+    return (
+        device.get(ATTR_STATUS, "unknown"),
+        device.get("monitorStatus", "unknown"),
+        1 if device.get("monitorArmed") else 0,
+        1 if device.get(ATTR_WATERTANK) is False else 0,
+        today if isinstance(today, int) else 0,
+    )
+
+
+class FleetSummary:
+    """Counts of device states, adjusted by the difference of each transition.
+
+    Every device keeps a small state tuple; an update subtracts the old tuple
+    and adds the new one, so a transition costs O(1) regardless of fleet size.
+    MQTT staleness uses an insertion-ordered map of last-seen times: since all
+    devices share one timeout, the oldest entries are always at the front.
+    """
+
+    def __init__(self, stale_after: float) -> None:
+        """Initialize empty counters."""
+        self.stale_after = stale_after
+        self.counts: dict[str, int] = dict.fromkeys(SUMMARY_KEYS, 0)
+        self._states: dict[str, DeviceState] = {}
+        self._last_seen: OrderedDict[str, float] = OrderedDict()
+        self._stale: set[str] = set()
+
+    def _apply(self, state: DeviceState, sign: int, changed: set[str]) -> None:
+        status, monitor, armed, tank_empty, detections = state
+        counts = self.counts
+        if status in counts:
+            counts[status] += sign
+            changed.add(status)
+        if monitor in ("running", "paused"):
+            counts[monitor] += sign
+            changed.add(monitor)
+        if armed:
+            counts["armed"] += sign
+            changed.add("armed")
+        if tank_empty:
+            counts["tank_empty"] += sign
+            changed.add("tank_empty")
+        if detections:
+            counts["detections_today"] += sign * detections
+            changed.add("detections_today")
+
+    def update(self, device_id: str, device: dict[str, Any]) -> set[str]:
+        """Account for a device's current state; return the changed counters."""
+        state = _device_state(device)
+        previous = self._states.get(device_id)
+        if previous == state:
+            return set()
+        changed: set[str] = set()
+        if previous is not None:
+            self._apply(previous, -1, changed)
+        self._apply(state, 1, changed)
+        self._states[device_id] = state
+        return changed
+
+    def remove(self, device_id: str) -> set[str]:
+        """Drop a device from all counters."""
+        changed: set[str] = set()
+        previous = self._states.pop(device_id, None)
+        if previous is not None:
+            self._apply(previous, -1, changed)
+        self._last_seen.pop(device_id, None)
+        if device_id in self._stale:
+            self._stale.discard(device_id)
+            self.counts["mqtt_stale"] -= 1
+            changed.add("mqtt_stale")
+        return changed
+
+    def seen(self, device_id: str, now: float) -> set[str]:
+        """Record an MQTT message of a device (``now`` must not decrease)."""
+        self._last_seen[device_id] = now
+        self._last_seen.move_to_end(device_id)
+        if device_id in self._stale:
+            self._stale.discard(device_id)
+            self.counts["mqtt_stale"] -= 1
+            return {"mqtt_stale"}
+        return set()
+
+    def expire(self, now: float) -> set[str]:
+        """Move devices silent for longer than stale_after to the stale count."""
+        cutoff = now - self.stale_after
+        changed: set[str] = set()
+        while self._last_seen:
+            device_id, last = next(iter(self._last_seen.items()))
+            if last >= cutoff:
+                break
+            self._last_seen.popitem(last=False)
+            self._stale.add(device_id)
+            self.counts["mqtt_stale"] += 1
+            changed.add("mqtt_stale")
+        return changed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return dict(self.counts)
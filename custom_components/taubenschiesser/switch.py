@@ -6,7 +6,8 @@ from typing import Any, Literal
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -16,8 +17,10 @@ from .const import (
     ATTR_LASER,
     ATTR_MONITOR_STATUS,
     DOMAIN,
+    LISTENER_TELEMETRY,
     MONITOR_STATUS_PAUSED,
     MONITOR_STATUS_RUNNING,
+    SIGNAL_DEVICES_ADDED,
 )
 from .coordinator import TaubenschiesserDataUpdateCoordinator
 
@@ -41,21 +44,34 @@ async def async_setup_entry(
     """Set up Taubenschiesser switches from a config entry."""
     coordinator: TaubenschiesserDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities = []
-    for device_id, device in coordinator.data.get("devices", {}).items():
-        for switch_kind in (
-            "monitor",
-            "armed",
-            "laser",
-            "shoot_use_laser",
-            "shoot_use_audio",
-            "shoot_laser_blink",
-        ):
-            entities.append(
-                TaubenschiesserSwitch(coordinator, device_id, device, switch_kind)
-            )
+    @callback
+    def async_add_device_entities(device_ids: set[str] | None = None) -> None:
+        entities = []
+        for device_id, device in coordinator.data.get("devices", {}).items():
+            if device_ids is not None and device_id not in device_ids:
+                continue
+            for switch_kind in (
+                "monitor",
+                "armed",
+                "laser",
+                "shoot_use_laser",
+                "shoot_use_audio",
+                "shoot_laser_blink",
+            ):
+                entities.append(
+                    TaubenschiesserSwitch(coordinator, device_id, device, switch_kind)
+                )
+        async_add_entities(entities)
+
+    async_add_device_entities()
 
-    async_add_entities(entities)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_DEVICES_ADDED.format(entry_id=entry.entry_id),
+            async_add_device_entities,
+        )
+    )
 
 
 class TaubenschiesserSwitch(CoordinatorEntity, SwitchEntity):
@@ -69,7 +85,10 @@ class TaubenschiesserSwitch(CoordinatorEntity, SwitchEntity):
         switch_kind: SwitchKind,
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        # The laser state comes from MQTT telemetry; the rest from the API
+        super().__init__(
+            coordinator, LISTENER_TELEMETRY if switch_kind == "laser" else None
+        )
         self.device_id = device_id
         self.device = device
         self.switch_kind = switch_kind
@@ -97,6 +116,23 @@ class TaubenschiesserSwitch(CoordinatorEntity, SwitchEntity):
             self._attr_name = f"{device_name} Schuss: Laser blinkt"
             self._attr_icon = "mdi:flash-alert"
 
+    async def async_added_to_hass(self) -> None:
+        """Follow the staleness watchdog for the laser switch."""
+        await super().async_added_to_hass()
+        if self.switch_kind == "laser":
+            self.async_on_remove(
+                self.coordinator.async_add_availability_listener(
+                    self.device_id, self.async_write_ha_state
+                )
+            )
+
+    @property
+    def available(self) -> bool:
+        """Return False while the laser state reported by the device is overdue."""
+        if self.switch_kind == "laser":
+            return super().available and self.coordinator.device_available(self.device_id)
+        return super().available
+
     def _get_taubenschiesser(self) -> dict[str, Any]:
         device = self.coordinator.data.get("devices", {}).get(self.device_id, {})
         taubenschiesser = device.get("taubenschiesser", {})
@@ -127,11 +163,17 @@ class TaubenschiesserSwitch(CoordinatorEntity, SwitchEntity):
         if not device:
             raise Exception(f"Device {self.device_id} not found")
 
-        await self.coordinator.send_api_update_taubenschiesser(self.device_id, fields)
+        async with self.coordinator.async_optimistic(
+            self.device_id,
+            {f"taubenschiesser.{field}": value for field, value in fields.items()},
+        ):
+            await self.coordinator.send_api_update_taubenschiesser(self.device_id, fields)
 
         if sync_esp:
             device_ip = device.get("taubenschiesser", {}).get("ip")
-            if device_ip and self.coordinator.mqtt_client and self.coordinator.mqtt_client.is_connected():
+            if device_ip and (
+                self.coordinator.mqtt_connected or self.coordinator.local is not None
+            ):
                 await self.coordinator.send_esp_device_config(
                     device_ip,
                     use_laser_on_shoot=fields.get("shootUseLaser"),
@@ -139,26 +181,25 @@ class TaubenschiesserSwitch(CoordinatorEntity, SwitchEntity):
                 )
 
         await self.coordinator.async_request_refresh()
-        self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn on the switch."""
         if self.switch_kind == "monitor":
             try:
-                await self.coordinator.send_api_start_pause(self.device_id, "start")
-                if self.device_id in self.coordinator.data.get("devices", {}):
-                    self.coordinator.data["devices"][self.device_id]["monitorStatus"] = (
-                        MONITOR_STATUS_RUNNING
-                    )
+                async with self.coordinator.async_optimistic(
+                    self.device_id, {"monitorStatus": MONITOR_STATUS_RUNNING}
+                ):
+                    await self.coordinator.send_api_start_pause(self.device_id, "start")
                 await self.coordinator.async_request_refresh()
             except Exception as err:
                 _LOGGER.error("Error starting device %s: %s", self.device_id, err)
                 raise
         elif self.switch_kind == "armed":
             try:
-                await self.coordinator.send_api_arm(self.device_id, True)
-                if self.device_id in self.coordinator.data.get("devices", {}):
-                    self.coordinator.data["devices"][self.device_id]["monitorArmed"] = True
+                async with self.coordinator.async_optimistic(
+                    self.device_id, {"monitorArmed": True}
+                ):
+                    await self.coordinator.send_api_arm(self.device_id, True)
                 await self.coordinator.async_request_refresh()
             except Exception as err:
                 _LOGGER.error("Error arming device %s: %s", self.device_id, err)
@@ -201,34 +242,33 @@ class TaubenschiesserSwitch(CoordinatorEntity, SwitchEntity):
         if not device_ip:
             raise Exception(f"Device IP not found for device {self.device_id}")
 
-        if not self.coordinator.mqtt_client or not self.coordinator.mqtt_client.is_connected():
+        if not self.coordinator.mqtt_connected:
             raise Exception("MQTT client not connected")
 
-        await self.coordinator.send_mqtt_command(
-            device_ip, {"type": "laser", "state": on}
-        )
-        if self.device_id in self.coordinator.data.get("devices", {}):
-            self.coordinator.data["devices"][self.device_id][ATTR_LASER] = on
-        await self.coordinator.async_request_refresh()
+        # The device confirms the laser state over MQTT; no API refresh needed
+        async with self.coordinator.async_optimistic(self.device_id, {ATTR_LASER: on}):
+            await self.coordinator.send_mqtt_command(
+                device_ip, {"type": "laser", "state": on}
+            )
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn off the switch."""
         if self.switch_kind == "monitor":
             try:
-                await self.coordinator.send_api_start_pause(self.device_id, "pause")
-                if self.device_id in self.coordinator.data.get("devices", {}):
-                    self.coordinator.data["devices"][self.device_id]["monitorStatus"] = (
-                        MONITOR_STATUS_PAUSED
-                    )
+                async with self.coordinator.async_optimistic(
+                    self.device_id, {"monitorStatus": MONITOR_STATUS_PAUSED}
+                ):
+                    await self.coordinator.send_api_start_pause(self.device_id, "pause")
                 await self.coordinator.async_request_refresh()
             except Exception as err:
                 _LOGGER.error("Error pausing device %s: %s", self.device_id, err)
                 raise
         elif self.switch_kind == "armed":
             try:
-                await self.coordinator.send_api_arm(self.device_id, False)
-                if self.device_id in self.coordinator.data.get("devices", {}):
-                    self.coordinator.data["devices"][self.device_id]["monitorArmed"] = False
+                async with self.coordinator.async_optimistic(
+                    self.device_id, {"monitorArmed": False}
+                ):
+                    await self.coordinator.send_api_arm(self.device_id, False)
                 await self.coordinator.async_request_refresh()
             except Exception as err:
                 _LOGGER.error("Error disarming device %s: %s", self.device_id, err)
@@ -0,0 +1,100 @@
+"""Rotated API tokens persisted outside the config entry."""
+from __future__ import annotations
+
+from datetime import date
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Rotations within this window share one write: at most 86400 / SAVE_DELAY a day
+SAVE_DELAY = 300
+
+
+class TokenStore:
+    """Access and refresh token of one entry in their own debounced store.
+
+    Updating the config entry rewrites core.config_entries (all entries of
+    all integrations) on every token rotation. This store only holds the two
+    tokens and coalesces rotations; Store writes through a temporary file and
+    a rename, so a crash leaves either the old or the new tokens. Losing the
+    last rotation in a crash is recoverable: an expired refresh token falls
+    back to the stored credentials.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.tokens.{entry_id}")
+        self.access_token: str | None = None
+        self.refresh_token: str | None = None
+        self.updated_at: float | None = None
+        self.rotations = 0
+        self.writes = 0
+        self._writes_day: date | None = None
+        self.writes_today = 0
+        self._dirty = False
+
+    async def async_load(self) -> bool:
+        """Load saved tokens; return True if there were any."""
+        data = await self._store.async_load() or {}
+        if not data.get("access_token"):
+            return False
+        self.access_token = data["access_token"]
+        self.refresh_token = data.get("refresh_token")
+        self.updated_at = data.get("updated_at")
+        return True
+
+    @callback
+    def async_update(self, access_token: str, refresh_token: str | None) -> None:
+        """Remember rotated tokens and schedule a save."""
+        self.access_token = access_token
+        if refresh_token:
+            self.refresh_token = refresh_token
+        self.updated_at = time.time()
+        self.rotations += 1
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        today = date.today()
+        if today != self._writes_day:
+            self._writes_day = today
+            self.writes_today = 0
+        self.writes += 1
+        self.writes_today += 1
+        self._dirty = False
+        return {
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "updated_at": self.updated_at,
+        }
+
+    async def async_save(self) -> None:
+        """Write a pending rotation now (on shutdown)."""
+        if self._dirty:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the stored tokens (entry removed)."""
+        await self._store.async_remove()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the store (without the tokens)."""
+        return {
+            "loaded": self.updated_at is not None,
+            "updated_at": self.updated_at,
+            "rotations": self.rotations,
+            "writes": self.writes,
+            # Rotations that shared a write with a later one
+            "coalesced": max(self.rotations - self.writes - self._dirty, 0),
+            "writes_today": self.writes_today if self._writes_day == date.today() else 0,
+            "max_writes_per_day": 86400 // SAVE_DELAY,
+            "pending": self._dirty,
+        }
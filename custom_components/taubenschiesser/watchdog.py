@@ -0,0 +1,189 @@
+"""Per-device telemetry deadlines kept in a single min-heap."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+import heapq
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+@dataclass(slots=True)
+class DeviceOutages:
+    """Outage record of one device."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    last_start: float | None = None
+    last_end: float | None = None
+
+
+class StalenessWatchdog:
+    """Mark devices stale when neither MQTT nor the API reported them in time.
+
+    Each device has one deadline; touching it only moves the deadline in a dict.
+    The heap holds at most one entry per device and a single timer is armed
+    for the earliest one. When an entry comes due whose device was touched in
+    the meantime, it is pushed back with the current deadline, so a timer run
+    only costs the entries that are actually due, not a scan of the fleet.
+    ``last_seen`` returns a monotonic time of the last message a device sent
+    without going through touch(), e.g. counted on the MQTT thread.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        timeout: float,
+        on_change: Callable[[str, bool], None],
+        last_seen: Callable[[str], float | None] | None = None,
+    ) -> None:
+        """Initialize the watchdog."""
+        self.hass = hass
+        self.timeout = timeout
+        self._on_change = on_change
+        self._last_seen = last_seen
+        self.deadlines: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._markers: dict[str, Any] = {}
+        # Device ID -> unix time the device went stale
+        self.stale: dict[str, float] = {}
+        self.outages: dict[str, DeviceOutages] = {}
+        self.timer_runs = 0
+        self._unsub: CALLBACK_TYPE | None = None
+        self._armed_for: float | None = None
+
+    def is_stale(self, device_id: str) -> bool:
+        """Return True if the device missed its deadline."""
+        return device_id in self.stale
+
+    @callback
+    def touch(self, device_id: str, now: float | None = None) -> None:
+        """Reset the deadline of a device after it reported data."""
+        if now is None:
+            now = time.monotonic()
+        deadline = now + self.timeout
+        if device_id not in self.deadlines:
+            heapq.heappush(self._heap, (deadline, device_id))
+        self.deadlines[device_id] = deadline
+        since = self.stale.pop(device_id, None)
+        if since is not None:
+            self._record_recovery(device_id, since)
+        if self._armed_for is None or deadline < self._armed_for:
+            self._arm()
+
+    def is_tracked(self, device_id: str) -> bool:
+        """Return True if the device has a deadline or already missed it."""
+        return device_id in self.deadlines or device_id in self.stale
+
+    @callback
+    def touch_if_changed(self, device_id: str, marker: Any) -> None:
+        """Touch a polled device if its freshness marker moved.
+
+        The device list always contains every device, so the poll itself is
+        no sign of life; a changed ``lastSeen``/``updatedAt`` is. Without a
+        marker (None) the backend cannot tell, and the poll counts. Polls only
+        move deadlines of tracked devices: a device gets its first deadline
+        from touch(), i.e. its first MQTT message.
+        """
+        changed = marker is None or self._markers.get(device_id, _UNSET) != marker
+        self._markers[device_id] = marker
+        if changed and self.is_tracked(device_id):
+            self.touch(device_id)
+
+    @callback
+    def remove(self, device_id: str) -> None:
+        """Forget a removed device (its heap entry is dropped when it comes due)."""
+        self.deadlines.pop(device_id, None)
+        self._markers.pop(device_id, None)
+        self.stale.pop(device_id, None)
+        self.outages.pop(device_id, None)
+
+    @callback
+    def _arm(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._armed_for = None
+        if not self._heap:
+            return
+        self._armed_for = self._heap[0][0]
+        self._unsub = async_call_later(
+            self.hass, max(self._armed_for - time.monotonic(), 0), self._async_fire
+        )
+
+    @callback
+    def _async_fire(self, _now: datetime) -> None:
+        """Expire the devices whose deadline passed."""
+        self._unsub = None
+        self._armed_for = None
+        self.timer_runs += 1
+        now = time.monotonic()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _deadline, device_id = heapq.heappop(heap)
+            current = self.deadlines.get(device_id)
+            if current is None:
+                continue
+            if self._last_seen is not None:
+                seen = self._last_seen(device_id)
+                if seen is not None and seen + self.timeout > current:
+                    current = self.deadlines[device_id] = seen + self.timeout
+            if current > now:
+                # Touched since this entry was pushed: wait for the new deadline
+                heapq.heappush(heap, (current, device_id))
+                continue
+            del self.deadlines[device_id]
+            self.stale[device_id] = time.time()
+            _LOGGER.warning(
+                "Gerät %s hat seit %s s keine Daten geliefert", device_id, int(self.timeout)
+            )
+            self._on_change(device_id, False)
+        self._arm()
+
+    def _record_recovery(self, device_id: str, since: float) -> None:
+        now = time.time()
+        outages = self.outages.setdefault(device_id, DeviceOutages())
+        outages.count += 1
+        outages.total_seconds += now - since
+        outages.last_start = since
+        outages.last_end = now
+        _LOGGER.info(
+            "Gerät %s liefert wieder Daten (Ausfall %s s)", device_id, int(now - since)
+        )
+        self._on_change(device_id, True)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the timer."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._armed_for = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return diagnostics for the watchdog."""
+        return {
+            "timeout": self.timeout,
+            "tracked": len(self.deadlines) + len(self.stale),
+            "heap_entries": len(self._heap),
+            "timer_runs": self.timer_runs,
+            "stale": sorted(self.stale),
+            "outages": {
+                device_id: {
+                    "count": outages.count,
+                    "total_seconds": round(outages.total_seconds),
+                    "last_start": outages.last_start,
+                    "last_end": outages.last_end,
+                }
+                for device_id, outages in self.outages.items()
+            },
+        }
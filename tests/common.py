@@ -0,0 +1,218 @@
+"""Stand-ins for the backend and the MQTT broker used by the tests."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import copy
+import json
+import time
+from typing import Any
+
+from aiohttp import web
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.taubenschiesser.mqtt_pool import MqttConnection
+
+DEVICE_ID = "dev1"
+DEVICE_NAME = "Dach"
+
+
+def make_device(device_ip: str, device_id: str = DEVICE_ID, **fields: Any) -> dict[str, Any]:
+    """Return a device as /api/devices lists it."""
+    return {
+        "_id": device_id,
+        "name": DEVICE_NAME,
+        "monitorStatus": "running",
+        "monitorArmed": False,
+        "detectionCounts": {"today": 0, "yesterday": 0},
+        "taubenschiesser": {"ip": device_ip, "shootingTimeMs": 100},
+        **fields,
+    }
+
+
+async def async_wait_for(predicate: Callable[[], Any], timeout: float = 2.0) -> float:
+    """Wait until predicate() is truthy; return the seconds it took."""
+    started = time.monotonic()
+    while not predicate():
+        if time.monotonic() - started > timeout:
+            raise AssertionError(f"Bedingung nach {timeout} s nicht erfüllt")
+        await asyncio.sleep(0.01)
+    return time.monotonic() - started
+
+
+class StandInBackend:
+    """Minimal Taubenschiesser backend on 127.0.0.1.
+
+    Serves login, token check and refresh, the device list (query parameters
+    filter on device fields), device updates and control actions, and the
+    Server-Sent Events stream with Last-Event-ID resume. The device list
+    answers 401 to any token but ``access_token``.
+    """
+
+    def __init__(self, devices: list[dict[str, Any]]) -> None:
+        """Initialize the backend with a device list."""
+        self.devices = devices
+        self.url = ""
+        # Token issued by login/refresh and accepted by the device list
+        self.access_token = "access"
+        self.unauthorized = 0
+        # 401 answers are held until this many are pending
+        self.hold_unauthorized = 0
+        self._unauthorized_released = asyncio.Event()
+        self.controls: list[tuple[str, str, Any]] = []
+        self.device_requests = 0
+        # Last-Event-ID header of every stream request (None if absent)
+        self.stream_requests: list[str | None] = []
+        self._events: list[tuple[int, str, Any]] = []
+        self._event_added = asyncio.Event()
+        # Handler tasks of the open event streams
+        self._streams: set[asyncio.Task] = set()
+        self._runner: web.AppRunner | None = None
+
+    async def async_start(self) -> None:
+        """Start serving on a free port."""
+        app = web.Application()
+        app.router.add_post("/api/auth/login", self._login)
+        app.router.add_post("/api/auth/refresh", self._login)
+        app.router.add_get("/api/auth/me", self._me)
+        app.router.add_get("/api/devices/events", self._events_stream)
+        app.router.add_get("/api/devices/{device_id}/detections/hourly", self._not_found)
+        app.router.add_get("/api/devices", self._devices)
+        app.router.add_put("/api/devices/{device_id}", self._update_device)
+        app.router.add_route("*", "/api/device-control/{device_id}/{action}", self._control)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+
+    async def async_stop(self) -> None:
+        """Close open streams and stop serving."""
+        await self.async_drop_streams()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def send_event(self, event: str, data: Any) -> int:
+        """Queue a push event for all streams; return its sequence number."""
+        seq = len(self._events) + 1
+        self._events.append((seq, event, data))
+        self._event_added.set()
+        return seq
+
+    async def async_drop_streams(self) -> None:
+        """Cut every open event stream (clients have to reconnect)."""
+        streams, self._streams = self._streams, set()
+        for task in streams:
+            task.cancel()
+        await asyncio.gather(*streams, return_exceptions=True)
+
+    async def _login(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"access_token": self.access_token, "refresh_token": "refresh"}
+        )
+
+    async def _me(self, request: web.Request) -> web.Response:
+        return web.json_response({"email": "test@example.com"})
+
+    async def _not_found(self, request: web.Request) -> web.Response:
+        raise web.HTTPNotFound
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        self.device_requests += 1
+        if request.headers.get("Authorization") != f"Bearer {self.access_token}":
+            self.unauthorized += 1
+            if self.unauthorized >= self.hold_unauthorized:
+                self._unauthorized_released.set()
+            await self._unauthorized_released.wait()
+            raise web.HTTPUnauthorized
+        devices = [
+            device
+            for device in self.devices
+            if all(str(device.get(key)) == value for key, value in request.query.items())
+        ]
+        # The integration merges telemetry into the dicts it receives
+        return web.json_response(copy.deepcopy(devices))
+
+    async def _update_device(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        for device in self.devices:
+            if device["_id"] == request.match_info["device_id"]:
+                device.setdefault("taubenschiesser", {}).update(body.get("taubenschiesser", {}))
+        return web.json_response({"ok": True})
+
+    async def _control(self, request: web.Request) -> web.Response:
+        body = await request.json() if request.can_read_body else None
+        self.controls.append(
+            (request.match_info["device_id"], request.match_info["action"], body)
+        )
+        return web.json_response({"ok": True})
+
+    async def _events_stream(self, request: web.Request) -> web.StreamResponse:
+        last_id = request.headers.get("Last-Event-ID")
+        self.stream_requests.append(last_id)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        task = asyncio.current_task()
+        self._streams.add(task)
+        sent = int(last_id) if last_id else len(self._events)
+        try:
+            while True:
+                # Cleared before sending, so events queued meanwhile are not lost
+                self._event_added.clear()
+                for seq, event, data in self._events[sent:]:
+                    await response.write(
+                        f"id: {seq}\nevent: {event}\ndata: {json.dumps(data)}\n\n".encode()
+                    )
+                    sent = seq
+                if sent == len(self._events):
+                    await self._event_added.wait()
+        finally:
+            self._streams.discard(task)
+
+
+class LoopbackMqttConnection(MqttConnection):
+    """In-process broker between the integration and the ESP emulator.
+
+    Integration publishes go straight to the emulated unit; the emulator
+    publishes through ``publish`` (paho's signature) into the topic router.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: tuple) -> None:
+        """Initialize a connected loopback."""
+        super().__init__(hass, key)
+        self.emulator: Any = None
+        self.published: list[tuple[str, Any]] = []
+        self._connected = True
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the loopback is up."""
+        return self._connected
+
+    async def async_start(self) -> None:
+        """Connect."""
+        self._connected = True
+
+    async def async_stop(self) -> None:
+        """Disconnect."""
+        self._connected = False
+
+    async def async_publish(self, topic: str, payload: str) -> None:
+        """Hand a command to the emulated unit of the topic."""
+        command = json.loads(payload)
+        self.published.append((topic, command))
+        unit = self.emulator.units.get(topic.split("/", 1)[1]) if self.emulator else None
+        if unit is not None:
+            self.emulator.deliver(unit, command)
+
+    async def _async_broker_subscribe(self, topic: str) -> None:
+        """Nothing to do: routing is local."""
+
+    async def _async_broker_unsubscribe(self, topic: str) -> None:
+        """Nothing to do: routing is local."""
+
+    def publish(self, topic: str, payload: str) -> None:
+        """Emulator side: deliver a unit message to the integration."""
+        self._dispatch(topic, payload)
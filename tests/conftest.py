@@ -0,0 +1,136 @@
+"""Fixtures for the Taubenschiesser tests."""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+import socket
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from custom_components.taubenschiesser.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_API_URL,
+    CONF_EMAIL,
+    CONF_MQTT_BROKER,
+    CONF_MQTT_PORT,
+    CONF_PASSWORD,
+    CONF_REFRESH_TOKEN,
+    DOMAIN,
+)
+from custom_components.taubenschiesser.coordinator import (
+    TaubenschiesserDataUpdateCoordinator,
+)
+from custom_components.taubenschiesser.mqtt_pool import async_get_pool
+from esp_emulator import Emulator, EmulatorConfig
+
+from .common import LoopbackMqttConnection, StandInBackend, make_device
+
+BROKER = "loopback"
+BROKER_PORT = 1883
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+def unit_port() -> int:
+    """Return a free local port for the emulated unit's HTTP interface."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def unit_ip(unit_port: int) -> str:
+    """Return the address the integration uses for the unit (LAN and topics)."""
+    return f"127.0.0.1:{unit_port}"
+
+
+@pytest.fixture
+def emulator_config() -> EmulatorConfig:
+    """Return the emulator behaviour; tests override single fields."""
+    # Fast moves and no periodic telemetry keep the tests deterministic
+    return EmulatorConfig(info_interval=3600, wifi_jitter=0, move_speed=10_000)
+
+
+@pytest.fixture
+def http_enabled() -> bool:
+    """Serve the unit's local HTTP interface."""
+    return True
+
+
+@pytest.fixture
+def loopback(hass: HomeAssistant) -> LoopbackMqttConnection:
+    """Put a loopback connection into the pool in place of a broker."""
+    connection = LoopbackMqttConnection(hass, (BROKER, BROKER_PORT, None, None))
+    async_get_pool(hass).connections[connection.key] = connection
+    return connection
+
+
+@pytest.fixture
+async def emulator(
+    loopback: LoopbackMqttConnection,
+    emulator_config: EmulatorConfig,
+    unit_ip: str,
+    unit_port: int,
+    http_enabled: bool,
+) -> AsyncIterator[Emulator]:
+    """Run one emulated unit behind the loopback broker."""
+    emulator = Emulator(emulator_config, [unit_ip], seed=1, client=loopback)
+    loopback.emulator = emulator
+    await emulator.async_start(unit_port if http_enabled else None)
+    yield emulator
+    await emulator.async_stop()
+
+
+@pytest.fixture
+async def backend(unit_ip: str) -> AsyncIterator[StandInBackend]:
+    """Run the stand-in backend with one device at the emulated unit."""
+    backend = StandInBackend([make_device(unit_ip)])
+    await backend.async_start()
+    yield backend
+    await backend.async_stop()
+
+
+@pytest.fixture
+async def setup_integration(
+    hass: HomeAssistant, backend: StandInBackend, emulator: Emulator
+) -> AsyncIterator[Callable[..., Awaitable[TaubenschiesserDataUpdateCoordinator]]]:
+    """Return a function that sets up an entry against the stand-ins."""
+    entries: list[MockConfigEntry] = []
+
+    async def _setup(**options: Any) -> TaubenschiesserDataUpdateCoordinator:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title="Taubenschiesser",
+            data={
+                CONF_API_URL: backend.url,
+                CONF_EMAIL: "test@example.com",
+                CONF_PASSWORD: "secret",
+                CONF_ACCESS_TOKEN: "access",
+                CONF_REFRESH_TOKEN: "refresh",
+                CONF_MQTT_BROKER: BROKER,
+                CONF_MQTT_PORT: BROKER_PORT,
+            },
+            options=options,
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        # Flush telemetry at once instead of after the 3 s debounce
+        coordinator._mqtt_debounce_seconds = 0.01
+        return coordinator
+
+    yield _setup
+    for entry in entries:
+        if entry.state is ConfigEntryState.LOADED:
+            await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,60 @@
+"""Tests for the import and setup time budgets."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+from custom_components.taubenschiesser.const import IMPORT_BUDGET_MS, SETUP_BUDGET_MS
+
+ROOT = Path(__file__).parent.parent
+
+# Home Assistant has imported the integration's dependencies before it loads
+# the integration: preload them so only the integration's own modules count.
+IMPORT_PROBE = """
+import ast, importlib, json, pathlib, sys
+
+PRELOADED = ("homeassistant", "aiohttp", "voluptuous")
+for path in sorted(pathlib.Path("custom_components/taubenschiesser").glob("*.py")):
+    for node in ast.parse(path.read_text()).body:
+        if isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules = [node.module]
+        elif isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        else:
+            continue
+        for module in modules:
+            if module.split(".")[0] in PRELOADED:
+                importlib.import_module(module)
+
+import custom_components.taubenschiesser as integration
+
+print(json.dumps({
+    "import_ms": integration.IMPORT_DURATION_MS,
+    "paho": any(name.split(".")[0] == "paho" for name in sys.modules),
+}))
+"""
+
+
+def test_import_within_budget() -> None:
+    """The integration imports within budget and without paho-mqtt."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    assert probe["import_ms"] < IMPORT_BUDGET_MS
+    # paho is imported in the executor when a broker connection starts
+    assert not probe["paho"]
+
+
+async def test_setup_within_budget(setup_integration) -> None:
+    """Setting up an entry against the stand-ins stays within budget."""
+    coordinator = await setup_integration()
+    setup = coordinator.metrics.setup
+    assert {"import", "storage", "first_refresh", "mqtt_connect", "platforms"} <= setup.keys()
+    assert setup["total"] < SETUP_BUDGET_MS
@@ -0,0 +1,25 @@
+"""Tests for the coordinator's device bookkeeping."""
+from __future__ import annotations
+
+from .common import DEVICE_ID, make_device
+
+
+async def test_device_listed_by_another_shard_is_kept(setup_integration, unit_ip) -> None:
+    """A device leaves only once no shard lists it any more."""
+    coordinator = await setup_integration()
+
+    coordinator._apply_devices([make_device(unit_ip)], shard="dach")
+    coordinator._apply_devices([make_device(unit_ip)], shard="garten")
+    coordinator._apply_devices([], shard="dach")
+    assert DEVICE_ID in coordinator.devices
+
+    coordinator._apply_devices([], shard="garten")
+    assert DEVICE_ID not in coordinator.devices
+
+
+async def test_shutdown_can_run_twice(setup_integration) -> None:
+    """Shutdown is idempotent (unload calls it again after HA did)."""
+    coordinator = await setup_integration()
+
+    await coordinator.async_shutdown()
+    await coordinator.async_shutdown()
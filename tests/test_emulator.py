@@ -0,0 +1,151 @@
+"""Integration tests of commands and entity platforms against the ESP emulator."""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.taubenschiesser.const import (
+    ATTR_ROTATION,
+    ATTR_TILT,
+    CONF_HIGH_RESOLUTION,
+    DOMAIN,
+)
+from esp_emulator import Emulator, EmulatorConfig
+
+from .common import DEVICE_ID, async_wait_for
+
+
+def _entity_id(hass: HomeAssistant, platform: str, suffix: str) -> str:
+    entity_id = er.async_get(hass).async_get_entity_id(
+        platform, DOMAIN, f"{DEVICE_ID}_{suffix}"
+    )
+    assert entity_id is not None
+    return entity_id
+
+
+def _state(hass: HomeAssistant, entity_id: str) -> str | None:
+    state = hass.states.get(entity_id)
+    return state.state if state else None
+
+
+async def test_send_mqtt_command_moves_unit(
+    hass: HomeAssistant, setup_integration, emulator, unit_ip
+) -> None:
+    """An impulse moves the unit; its telemetry echo updates the sensors."""
+    # Without recorder throttling the echo is written at once
+    coordinator = await setup_integration(**{CONF_HIGH_RESOLUTION: True})
+    rotation = _entity_id(hass, "sensor", ATTR_ROTATION)
+    tilt = _entity_id(hass, "sensor", ATTR_TILT)
+
+    await coordinator.send_mqtt_command(
+        unit_ip, {"type": "impulse", "speed": 1, "bounce": 0, "position": {"rot": 30, "tilt": 10}}
+    )
+    await async_wait_for(lambda: emulator.units[unit_ip].rot == 30)
+    await async_wait_for(lambda: _state(hass, rotation) == "30.0")
+    assert _state(hass, tilt) == "10.0"
+    assert emulator.units[unit_ip].stats.commands == {"impulse": 1}
+
+
+async def test_send_esp_device_config(setup_integration, emulator, unit_ip) -> None:
+    """The config command stores the shoot defaults on the unit."""
+    coordinator = await setup_integration()
+    unit = emulator.units[unit_ip]
+
+    await coordinator.send_esp_device_config(
+        unit_ip, use_laser_on_shoot=False, use_audio_on_shoot=True
+    )
+    await async_wait_for(lambda: unit.stats.commands.get("config") == 1)
+    assert unit.use_laser_on_shoot is False
+    assert unit.use_audio_on_shoot is True
+
+    # Nothing to sync: no command at all
+    await coordinator.send_esp_device_config(unit_ip)
+    await asyncio.sleep(0.05)
+    assert unit.stats.commands.get("config") == 1
+
+
+async def test_shoot_laser_switch_syncs_backend_and_unit(
+    hass: HomeAssistant, setup_integration, backend, emulator, unit_ip
+) -> None:
+    """The shoot-laser switch updates the backend and the unit's defaults."""
+    await setup_integration()
+    switch = _entity_id(hass, "switch", "shoot_use_laser")
+    assert _state(hass, switch) == "on"
+
+    await hass.services.async_call(
+        "switch", "turn_off", {"entity_id": switch}, blocking=True
+    )
+    assert backend.devices[0]["taubenschiesser"]["shootUseLaser"] is False
+    await async_wait_for(lambda: emulator.units[unit_ip].use_laser_on_shoot is False)
+    await async_wait_for(lambda: _state(hass, switch) == "off")
+
+
+async def test_laser_switch_follows_device(
+    hass: HomeAssistant, setup_integration, emulator, unit_ip
+) -> None:
+    """The laser switch is confirmed by the unit's telemetry."""
+    await setup_integration()
+    laser = _entity_id(hass, "switch", "laser")
+
+    await hass.services.async_call("switch", "turn_on", {"entity_id": laser}, blocking=True)
+    await async_wait_for(lambda: emulator.units[unit_ip].laser)
+    await async_wait_for(lambda: _state(hass, laser) == "on")
+
+    await hass.services.async_call("switch", "turn_off", {"entity_id": laser}, blocking=True)
+    await async_wait_for(lambda: _state(hass, laser) == "off")
+    assert emulator.units[unit_ip].laser is False
+
+
+async def test_buttons_drive_unit(
+    hass: HomeAssistant, setup_integration, emulator, unit_ip
+) -> None:
+    """Shoot, move and reset buttons reach the unit over MQTT."""
+    await setup_integration()
+    unit = emulator.units[unit_ip]
+
+    for key in ("shoot", "rotate_right", "rotate_right", "move_up"):
+        await hass.services.async_call(
+            "button", "press", {"entity_id": _entity_id(hass, "button", key)}, blocking=True
+        )
+    await async_wait_for(lambda: unit.stats.shots == 1 and unit.rot == 20 and unit.tilt == 10)
+
+    await hass.services.async_call(
+        "button", "press", {"entity_id": _entity_id(hass, "button", "reset")}, blocking=True
+    )
+    await async_wait_for(lambda: unit.rot == 0 and unit.tilt == 0)
+    assert unit.stats.commands == {"shoot": 1, "impulse": 3, "reset": 1}
+
+
+class _CountingClient:
+    """Paho-like client that only counts unit messages."""
+
+    def __init__(self) -> None:
+        self.messages = 0
+
+    def publish(self, topic: str, payload: str) -> None:
+        self.messages += 1
+
+
+async def test_emulator_scales_to_hundreds_of_units() -> None:
+    """Hundreds of units in one process execute their commands."""
+    client = _CountingClient()
+    emulator = Emulator(
+        EmulatorConfig(info_interval=3600, move_speed=10_000),
+        [f"10.99.{index // 250}.{index % 250 + 1}" for index in range(500)],
+        seed=1,
+        client=client,
+    )
+    await emulator.async_start()
+    try:
+        for unit in emulator.units.values():
+            emulator.deliver(unit, {"type": "laser", "state": True})
+            emulator.deliver(unit, {"type": "shoot", "duration": 0})
+        await async_wait_for(lambda: emulator.summary()["shots"] == 500)
+    finally:
+        await emulator.async_stop()
+    summary = emulator.summary()
+    assert summary["commands"] == {"laser": 500, "shoot": 500}
+    assert summary["invalid_commands"] == 0
+    assert client.messages == summary["published"]
@@ -0,0 +1,58 @@
+"""Tests for the hedged device list request."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.taubenschiesser.hedge import FetchStats, async_hedged
+
+
+def _factory(primary_delay: float, hedge_delay: float, fail: set[bool] = frozenset()):
+    cancelled: list[bool] = []
+
+    async def request(hedge: bool) -> str:
+        try:
+            await asyncio.sleep(hedge_delay if hedge else primary_delay)
+        except asyncio.CancelledError:
+            cancelled.append(hedge)
+            raise
+        if hedge in fail:
+            raise RuntimeError("hedge" if hedge else "primary")
+        return "hedge" if hedge else "primary"
+
+    return request, cancelled
+
+
+async def test_fast_primary_is_not_hedged() -> None:
+    """No second request while the primary answers within the delay."""
+    stats = FetchStats()
+    request, _ = _factory(0.01, 0.01)
+    assert await async_hedged(request, 0.2, stats) == "primary"
+    assert stats.hedged == 0
+
+
+async def test_hedge_wins_and_primary_is_cancelled() -> None:
+    """A slow primary loses to the hedge and its request is cancelled."""
+    stats = FetchStats()
+    request, cancelled = _factory(1.0, 0.01)
+    assert await async_hedged(request, 0.05, stats) == "hedge"
+    assert (stats.hedged, stats.hedge_wins, stats.cancelled) == (1, 1, 1)
+    # The cancellation reaches the primary on the next loop iteration
+    await asyncio.sleep(0)
+    assert cancelled == [False]
+
+
+async def test_failed_hedge_waits_for_primary() -> None:
+    """A failing hedge does not fail the fetch while the primary may succeed."""
+    stats = FetchStats()
+    request, _ = _factory(0.2, 0.01, fail={True})
+    assert await async_hedged(request, 0.05, stats) == "primary"
+    assert stats.hedge_wins == 0
+
+
+async def test_both_fail_raises_first_error() -> None:
+    """If both requests fail, the first error is raised."""
+    request, _ = _factory(0.1, 0.01, fail={False, True})
+    with pytest.raises(RuntimeError, match="hedge"):
+        await async_hedged(request, 0.05, FetchStats())
@@ -0,0 +1,23 @@
+"""Tests for setting up and removing config entries."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.taubenschiesser.const import DOMAIN
+
+
+async def test_remove_entry_deletes_stores(
+    hass: HomeAssistant, hass_storage: dict[str, Any], setup_integration
+) -> None:
+    """Removing an entry deletes its tokens, telemetry and detection stores."""
+    coordinator = await setup_integration()
+    entry_id = coordinator.entry.entry_id
+    keys = [f"{DOMAIN}.{name}.{entry_id}" for name in ("tokens", "telemetry", "detections")]
+    for key in keys:
+        hass_storage[key] = {"version": 1, "minor_version": 1, "key": key, "data": {}}
+
+    await hass.config_entries.async_remove(entry_id)
+    await hass.async_block_till_done()
+    assert not any(key in hass_storage for key in keys)
@@ -0,0 +1,31 @@
+"""Tests for the split between API and telemetry listeners."""
+from __future__ import annotations
+
+from .common import async_wait_for
+
+BURST = 20
+
+
+async def test_mqtt_burst_wakes_only_telemetry_listeners(
+    setup_integration, emulator, unit_ip
+) -> None:
+    """One debounced flush per burst, and only telemetry entities are called back."""
+    coordinator = await setup_integration()
+    metrics = coordinator.metrics
+    telemetry_listeners = len(coordinator.telemetry._listeners)
+    api_listeners = len(coordinator._listeners)
+    assert telemetry_listeners and api_listeners
+    before = dict(metrics.listener_callbacks)
+    flushes = metrics.debounce_flushes
+
+    unit = emulator.units[unit_ip]
+    for _ in range(BURST):
+        unit.publish_info()
+    await async_wait_for(lambda: metrics.debounce_flushes == flushes + 1)
+
+    telemetry = metrics.listener_callbacks["telemetry"] - before["telemetry"]
+    api = metrics.listener_callbacks["api"] - before["api"]
+    # Debounced: one callback per telemetry entity for the whole burst, none
+    # on the API side (without the split every listener was called back)
+    assert telemetry == telemetry_listeners
+    assert api == 0
@@ -0,0 +1,102 @@
+"""Tests for the LAN command path and path fallback against the ESP emulator."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.taubenschiesser import local
+from custom_components.taubenschiesser.api import CommandNotSent
+from custom_components.taubenschiesser.const import CONF_LOCAL_CONTROL
+from custom_components.taubenschiesser.local import (
+    PATH_LOCAL,
+    PATH_MQTT,
+    LocalTransport,
+    PathSelector,
+)
+from esp_emulator import EmulatorConfig
+
+from .common import async_wait_for
+
+SHOOT = {"type": "shoot", "duration": 0}
+
+
+def _prefer_local(coordinator, unit_ip: str) -> PathSelector:
+    selector = coordinator.path_selectors.setdefault(unit_ip, PathSelector())
+    selector.record_success(PATH_LOCAL, 1.0)
+    selector.record_success(PATH_MQTT, 100.0)
+    return selector
+
+
+def _mqtt_shots(loopback) -> list:
+    return [command for _, command in loopback.published if command.get("type") == "shoot"]
+
+
+async def test_local_command_reaches_unit(emulator, unit_ip) -> None:
+    """A command over the pooled LAN session is executed by the unit."""
+    transport = LocalTransport()
+    try:
+        await transport.async_command(unit_ip, {"type": "laser", "state": True})
+        await async_wait_for(lambda: emulator.units[unit_ip].laser)
+        assert await transport.async_probe(unit_ip) > 0
+    finally:
+        await transport.async_close()
+    assert transport.errors == 0
+
+
+async def test_fastest_path_is_used(setup_integration, emulator, loopback, unit_ip) -> None:
+    """The selector sends over LAN when it measured that path fastest."""
+    coordinator = await setup_integration(**{CONF_LOCAL_CONTROL: True})
+    _prefer_local(coordinator, unit_ip)
+
+    assert await coordinator.async_send_device_command(unit_ip, SHOOT) == PATH_LOCAL
+    await async_wait_for(lambda: emulator.units[unit_ip].stats.shots == 1)
+    assert not _mqtt_shots(loopback)
+
+
+@pytest.mark.parametrize("http_enabled", [False])
+async def test_connect_error_falls_back(
+    setup_integration, emulator, loopback, unit_ip
+) -> None:
+    """A LAN request that never connected is sent over MQTT instead."""
+    coordinator = await setup_integration(**{CONF_LOCAL_CONTROL: True})
+    selector = _prefer_local(coordinator, unit_ip)
+
+    assert await coordinator.async_send_device_command(unit_ip, SHOOT) == PATH_MQTT
+    await async_wait_for(lambda: emulator.units[unit_ip].stats.shots == 1)
+    assert len(_mqtt_shots(loopback)) == 1
+    assert selector.health(PATH_LOCAL).failures == 1
+
+
+@pytest.mark.parametrize(
+    "emulator_config",
+    [EmulatorConfig(info_interval=3600, move_speed=10_000, http_latency_ms=1000)],
+)
+async def test_timeout_is_not_sent_again(
+    setup_integration, emulator, loopback, unit_ip, monkeypatch
+) -> None:
+    """A LAN request that timed out may have fired: no second shot over MQTT."""
+    monkeypatch.setattr(local, "LOCAL_TIMEOUT", 0.2)
+    coordinator = await setup_integration(**{CONF_LOCAL_CONTROL: True})
+    selector = _prefer_local(coordinator, unit_ip)
+
+    with pytest.raises(Exception) as err:
+        await coordinator.async_send_device_command(unit_ip, SHOOT)
+    assert not isinstance(err.value, CommandNotSent)
+
+    await async_wait_for(lambda: emulator.units[unit_ip].stats.shots == 1)
+    await asyncio.sleep(0.2)
+    assert emulator.units[unit_ip].stats.shots == 1
+    assert not _mqtt_shots(loopback)
+    assert selector.health(PATH_LOCAL).failures == 1
+
+
+async def test_mqtt_down_falls_back_to_lan(
+    setup_integration, emulator, loopback, unit_ip
+) -> None:
+    """Without a broker connection the command goes over the LAN."""
+    coordinator = await setup_integration(**{CONF_LOCAL_CONTROL: True})
+    await loopback.async_stop()
+
+    assert await coordinator.async_send_device_command(unit_ip, SHOOT) == PATH_LOCAL
+    await async_wait_for(lambda: emulator.units[unit_ip].stats.shots == 1)
@@ -0,0 +1,87 @@
+"""Tests for the Server-Sent Events push channel against the stand-in backend."""
+from __future__ import annotations
+
+from datetime import timedelta
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.taubenschiesser.const import (
+    ATTR_DETECTIONS_5MIN,
+    ATTR_TODAY_DETECTIONS,
+    CONF_PUSH,
+    DOMAIN,
+    PUSH_CONSISTENCY_INTERVAL,
+)
+
+from .common import DEVICE_ID, async_wait_for
+
+
+def _sensor(hass: HomeAssistant, key: str) -> str:
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, f"{DEVICE_ID}_{key}")
+    assert entity_id is not None
+    return entity_id
+
+
+def _detection(event_id: str) -> dict:
+    return {
+        "deviceId": DEVICE_ID,
+        "id": event_id,
+        "timestamp": int(time.time() * 1000),
+        "count": 1,
+    }
+
+
+async def test_push_slows_polling(setup_integration) -> None:
+    """While the stream is up, polling is only a consistency sweep."""
+    coordinator = await setup_integration(**{CONF_PUSH: True})
+    await async_wait_for(lambda: coordinator.push.connected)
+    assert coordinator.update_interval == timedelta(seconds=PUSH_CONSISTENCY_INTERVAL)
+
+
+async def test_detection_counters_update_within_a_second(
+    hass: HomeAssistant, setup_integration, backend
+) -> None:
+    """Pushed detections and deltas reach the counter sensors in under a second."""
+    coordinator = await setup_integration(**{CONF_PUSH: True})
+    await async_wait_for(lambda: coordinator.push.connected)
+    rolling = _sensor(hass, ATTR_DETECTIONS_5MIN)
+    today = _sensor(hass, ATTR_TODAY_DETECTIONS)
+    polls = backend.device_requests
+
+    backend.send_event("detection", _detection("det-1"))
+    await async_wait_for(lambda: hass.states.get(rolling).state == "1", timeout=1.0)
+
+    backend.send_event(
+        "device",
+        {"deviceId": DEVICE_ID, "changes": {"detectionCounts": {"today": 7, "yesterday": 2}}},
+    )
+    await async_wait_for(lambda: hass.states.get(today).state == "7", timeout=1.0)
+
+    # Duplicates (same event ID) are not counted twice
+    backend.send_event("detection", _detection("det-1"))
+    backend.send_event("detection", _detection("det-2"))
+    await async_wait_for(lambda: hass.states.get(rolling).state == "2", timeout=1.0)
+    assert backend.device_requests == polls
+
+
+async def test_resume_from_last_event_id(
+    hass: HomeAssistant, setup_integration, backend
+) -> None:
+    """After a reconnect the stream resumes after the last applied event."""
+    coordinator = await setup_integration(**{CONF_PUSH: True})
+    await async_wait_for(lambda: coordinator.push.connected)
+    rolling = _sensor(hass, ATTR_DETECTIONS_5MIN)
+
+    seq = backend.send_event("detection", _detection("det-1"))
+    await async_wait_for(lambda: coordinator.push.last_event_id == str(seq))
+
+    await backend.async_drop_streams()
+    await async_wait_for(lambda: not coordinator.push.connected)
+    # Missed while disconnected; replayed on resume
+    backend.send_event("detection", _detection("det-2"))
+
+    await async_wait_for(lambda: coordinator.push.connected, timeout=5.0)
+    assert backend.stream_requests[-1] == str(seq)
+    await async_wait_for(lambda: hass.states.get(rolling).state == "2", timeout=1.0)
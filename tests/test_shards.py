@@ -0,0 +1,59 @@
+"""Tests for sharded polling and the per-backend rate limiter."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from custom_components.taubenschiesser.const import CONF_SHARDS
+from custom_components.taubenschiesser.hedge import FETCH_DEADLINE
+from custom_components.taubenschiesser.shards import BackendRateLimiter
+
+from .common import DEVICE_ID, make_device
+
+
+async def test_limiter_spacing_and_concurrency() -> None:
+    """Requests start spacing apart and at most concurrency run at once."""
+    limiter = BackendRateLimiter(spacing=0.05, concurrency=2)
+    running = 0
+    peak = 0
+    starts: list[float] = []
+
+    async def request() -> None:
+        nonlocal running, peak
+        async with limiter.acquire():
+            starts.append(time.monotonic())
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.1)
+            running -= 1
+
+    await asyncio.gather(*(request() for _ in range(5)))
+    assert peak == 2
+    assert limiter.requests == 5
+    assert all(later - earlier >= 0.045 for earlier, later in zip(starts, starts[1:]))
+
+
+async def test_concurrent_401_does_not_starve_the_limiter(
+    setup_integration, backend, unit_ip
+) -> None:
+    """Two shards hitting a 401 together refresh and retry without a deadlock."""
+    backend.devices[:] = [
+        make_device(unit_ip, site="nord"),
+        make_device("10.0.0.2", device_id="dev2", site="sued"),
+    ]
+    coordinator = await setup_integration(**{CONF_SHARDS: "site=nord; site=sued"})
+    # Poll by hand instead of on the shard phases
+    await coordinator.shard_scheduler.async_stop()
+
+    # Both 401s arrive while each shard holds one of the two limiter slots
+    backend.access_token = "rotated"
+    backend.hold_unauthorized = 2
+    async with asyncio.timeout(FETCH_DEADLINE / 2):
+        await asyncio.gather(
+            *(coordinator._async_poll_shard(shard) for shard in coordinator.shards)
+        )
+
+    assert backend.unauthorized == 2
+    assert coordinator.access_token == "rotated"
+    assert {DEVICE_ID, "dev2"} <= coordinator.devices.keys()
+    assert coordinator.metrics.poll_failures == 0
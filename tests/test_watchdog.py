@@ -0,0 +1,56 @@
+"""Tests for the staleness watchdog against the stand-ins."""
+from __future__ import annotations
+
+import asyncio
+
+from .common import DEVICE_ID, async_wait_for
+
+
+async def test_polls_keep_devices_without_markers_alive(
+    setup_integration, emulator, unit_ip
+) -> None:
+    """Without lastSeen/updatedAt a poll is a sign of life; MQTT arms the deadline."""
+    coordinator = await setup_integration()
+    watchdog = coordinator.watchdog
+    watchdog.timeout = 0.3
+
+    # No MQTT message yet: no deadline, however long the device stays quiet
+    await asyncio.sleep(0.5)
+    assert not watchdog.is_tracked(DEVICE_ID)
+
+    emulator.units[unit_ip].publish_info()
+    await async_wait_for(lambda: watchdog.is_tracked(DEVICE_ID))
+
+    for _ in range(4):
+        await coordinator.async_refresh()
+        await asyncio.sleep(0.15)
+    assert not watchdog.is_stale(DEVICE_ID)
+
+    # Neither polls nor MQTT: the device goes stale
+    await async_wait_for(lambda: watchdog.is_stale(DEVICE_ID))
+
+
+async def test_messages_from_the_mqtt_thread_recover_stale_devices(
+    hass, setup_integration, emulator, unit_ip
+) -> None:
+    """Messages handled off the loop are handed over once per window and flushed."""
+    coordinator = await setup_integration()
+    watchdog = coordinator.watchdog
+    watchdog.timeout = 0.2
+    unit = emulator.units[unit_ip]
+    assert coordinator._device_id_for_ip(unit_ip) == DEVICE_ID
+
+    await hass.async_add_executor_job(unit.publish_info)
+    await async_wait_for(lambda: coordinator.metrics.debounce_flushes == 1)
+    await async_wait_for(lambda: watchdog.is_stale(DEVICE_ID))
+
+    # A burst from the paho thread: the stale device recovers, one flush follows
+    def burst() -> None:
+        for _ in range(50):
+            unit.publish_info()
+
+    await hass.async_add_executor_job(burst)
+    await async_wait_for(lambda: not watchdog.is_stale(DEVICE_ID))
+    await async_wait_for(lambda: coordinator.metrics.debounce_flushes == 2)
+    assert coordinator.metrics.mqtt_pending == 0
+    assert not coordinator._mqtt_window_ips
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""ESP device emulator for load and behaviour tests of the Taubenschiesser integration.
+
+Simulates many units over one MQTT connection. Each unit listens on
+``taubenschiesser/<ip>`` and answers like the firmware: it executes the
+``shoot``, ``impulse``, ``laser``, ``config`` and ``reset`` commands and
+publishes ``taubenschiesser/<ip>/info`` telemetry (Rot, Tilt, moving, laser,
+watertank, wifi, timeMQTT) on every change and periodically. Jitter, message
+loss and latency are configurable, so command throughput, ack/echo behaviour
+and the integration's debouncing can be tested without hardware.
+
+    python tools/esp_emulator.py --broker localhost --units 200 --loss 0.01
+
+With ``--http-port`` the units also serve the local HTTP interface
+(``POST /command``, ``GET /info``); requests are routed by Host header, so
+register a unit as ``127.0.0.1:<port>`` (``--ip``) to control it over LAN.
+
+Tests run the emulator in-process without a broker: pass any object with a
+paho-like ``publish(topic, payload)`` as ``client``, call ``async_start`` and
+hand commands to ``deliver``.
+
+Requires paho-mqtt (and aiohttp for ``--http-port``).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import json
+import logging
+import random
+import signal
+import time
+from typing import Any
+
+import paho.mqtt.client as mqtt
+
+_LOGGER = logging.getLogger("esp_emulator")
+
+TOPIC_COMMAND = "taubenschiesser/{ip}"
+TOPIC_INFO = "taubenschiesser/{ip}/info"
+TOPIC_DETECTION = "taubenschiesser/{ip}/detection"
+
+TILT_RANGE = (-90.0, 90.0)
+
+
+@dataclass
+class EmulatorConfig:
+    """Behaviour shared by all units."""
+
+    info_interval: float = 5.0
+    # Noise on reported angles (degrees) and WLAN (dBm)
+    jitter: float = 0.0
+    wifi_jitter: float = 3.0
+    # Probability of dropping an incoming command or outgoing message
+    loss: float = 0.0
+    # Delay before a command is executed / a message is sent (ms)
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    # Delay of the local HTTP answer after the command was accepted (ms)
+    http_latency_ms: float = 0.0
+    # Degrees per second at speed 1
+    move_speed: float = 60.0
+    detections_per_hour: float = 0.0
+    # Shots until the water tank is empty (0 = never)
+    tank_shots: int = 0
+
+
+@dataclass
+class UnitStats:
+    """Counters of one unit."""
+
+    commands: dict[str, int] = field(default_factory=dict)
+    dropped_commands: int = 0
+    invalid_commands: int = 0
+    published: int = 0
+    dropped_messages: int = 0
+    shots: int = 0
+
+
+class EmulatedUnit:
+    """One simulated Taubenschiesser ESP."""
+
+    def __init__(self, emulator: Emulator, ip: str, rng: random.Random) -> None:
+        """Initialize the unit at its home position."""
+        self.emulator = emulator
+        self.config = emulator.config
+        self.ip = ip
+        self.rng = rng
+        self.rot = 0.0
+        self.tilt = 0.0
+        self.moving = False
+        self.laser = False
+        self.cam = True
+        self.watertank = True
+        self.wifi = float(rng.randint(-75, -45))
+        self.use_laser_on_shoot = True
+        self.use_audio_on_shoot = False
+        self.last_command_at = time.monotonic()
+        self.shots_since_refill = 0
+        self.stats = UnitStats()
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    def info(self) -> dict[str, Any]:
+        """Return the info payload the firmware publishes."""
+        jitter = self.config.jitter
+        return {
+            "Rot": round(self.rot + self.rng.uniform(-jitter, jitter), 1),
+            "Tilt": round(self.tilt + self.rng.uniform(-jitter, jitter), 1),
+            "moving": self.moving,
+            "laser": self.laser,
+            "watertank": self.watertank,
+            "Cam": self.cam,
+            "wifi": round(
+                self.wifi + self.rng.uniform(-self.config.wifi_jitter, self.config.wifi_jitter)
+            ),
+            "timeMQTT": int(time.monotonic() - self.last_command_at),
+        }
+
+    def publish_info(self) -> None:
+        """Publish the current telemetry."""
+        self.emulator.publish(self, TOPIC_INFO.format(ip=self.ip), self.info())
+
+    def receive(self, command: Any) -> None:
+        """Queue a command; units execute commands one after the other."""
+        self.last_command_at = time.monotonic()
+        if not isinstance(command, dict) or not isinstance(command.get("type"), str):
+            self.stats.invalid_commands += 1
+            return
+        self._queue.put_nowait(command)
+
+    async def run(self) -> None:
+        """Execute queued commands."""
+        while True:
+            command = await self._queue.get()
+            kind = command["type"]
+            self.stats.commands[kind] = self.stats.commands.get(kind, 0) + 1
+            handler = getattr(self, f"_cmd_{kind}", None)
+            if handler is None:
+                self.stats.invalid_commands += 1
+                continue
+            try:
+                await handler(command)
+            except (TypeError, ValueError) as err:
+                self.stats.invalid_commands += 1
+                _LOGGER.debug("%s: invalid %s command: %s", self.ip, kind, err)
+
+    async def run_telemetry(self) -> None:
+        """Publish telemetry periodically (phase spread over the interval)."""
+        await asyncio.sleep(self.rng.uniform(0, self.config.info_interval))
+        while True:
+            self.publish_info()
+            await asyncio.sleep(self.config.info_interval)
+
+    async def run_detections(self) -> None:
+        """Publish detection events as a Poisson process."""
+        rate = self.config.detections_per_hour / 3600
+        while True:
+            await asyncio.sleep(self.rng.expovariate(rate))
+            self.emulator.publish(
+                self,
+                TOPIC_DETECTION.format(ip=self.ip),
+                {
+                    "id": f"{self.ip}-{time.time_ns()}",
+                    "timestamp": int(time.time() * 1000),
+                    "count": 1,
+                },
+            )
+
+    async def _move_to(self, rot: float, tilt: float, speed: float) -> None:
+        distance = max(abs(rot - self.rot), abs(tilt - self.tilt))
+        self.moving = True
+        self.publish_info()
+        await asyncio.sleep(distance / (self.config.move_speed * max(speed, 0.1)))
+        self.rot = rot
+        self.tilt = min(max(tilt, TILT_RANGE[0]), TILT_RANGE[1])
+        self.moving = False
+
+    async def _cmd_impulse(self, command: dict[str, Any]) -> None:
+        """Move relative to the current position; bounce swings back and forth."""
+        position = command.get("position") or {}
+        delta_rot = float(position.get("rot", 0))
+        delta_tilt = float(position.get("tilt", 0))
+        speed = float(command.get("speed", 1))
+        start = (self.rot, self.tilt)
+        target = (self.rot + delta_rot, self.tilt + delta_tilt)
+        await self._move_to(*target, speed)
+        for _ in range(int(command.get("bounce", 0))):
+            await self._move_to(*start, speed)
+            await self._move_to(*target, speed)
+        self.publish_info()
+
+    async def _cmd_shoot(self, command: dict[str, Any]) -> None:
+        """Fire for ``duration`` ms, with the laser on unless disabled."""
+        duration = max(int(command.get("duration", 500)), 0) / 1000
+        use_laser = command.get("useLaser", self.use_laser_on_shoot)
+        if not self.watertank:
+            _LOGGER.debug("%s: shoot with empty tank", self.ip)
+        self.stats.shots += 1
+        self.shots_since_refill += 1
+        previous_laser = self.laser
+        if use_laser:
+            self.laser = True
+            self.publish_info()
+        await asyncio.sleep(duration)
+        self.laser = previous_laser
+        if self.config.tank_shots and self.shots_since_refill >= self.config.tank_shots:
+            self.watertank = False
+        self.publish_info()
+
+    async def _cmd_laser(self, command: dict[str, Any]) -> None:
+        """Switch the laser."""
+        self.laser = bool(command.get("state", False))
+        self.publish_info()
+
+    async def _cmd_config(self, command: dict[str, Any]) -> None:
+        """Store shoot defaults (no telemetry change)."""
+        if "useLaserOnShoot" in command:
+            self.use_laser_on_shoot = bool(command["useLaserOnShoot"])
+        if "useAudioOnShoot" in command:
+            self.use_audio_on_shoot = bool(command["useAudioOnShoot"])
+
+    async def _cmd_reset(self, command: dict[str, Any]) -> None:
+        """Return to the home position with the laser off (refills the tank)."""
+        self.laser = False
+        await self._move_to(0.0, 0.0, 2)
+        self.watertank = True
+        self.shots_since_refill = 0
+        self.publish_info()
+
+
+class Emulator:
+    """Many units behind one MQTT connection."""
+
+    def __init__(
+        self,
+        config: EmulatorConfig,
+        ips: list[str],
+        seed: int | None = None,
+        client: Any = None,
+    ) -> None:
+        """Initialize the units."""
+        self.config = config
+        self.rng = random.Random(seed)
+        self.units = {
+            ip: EmulatedUnit(self, ip, random.Random(self.rng.random())) for ip in ips
+        }
+        self.client = client if client is not None else mqtt.Client()
+        self.client.on_connect = self._on_connect
+        self.client.on_message = self._on_message
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.started = time.monotonic()
+        # Bound port of the local HTTP interface (useful with port 0)
+        self.http_port: int | None = None
+        self._runner: Any = None
+        self._tasks: list[asyncio.Task] = []
+
+    def _delay(self, rng: random.Random) -> float:
+        latency = self.config.latency_ms + rng.uniform(0, self.config.latency_jitter_ms)
+        return latency / 1000
+
+    def _on_connect(self, client, userdata, flags, rc) -> None:
+        if rc != 0:
+            _LOGGER.error("Connection failed with code %s", rc)
+            return
+        # One wildcard subscription for all units; info topics are filtered out
+        client.subscribe("taubenschiesser/+")
+        _LOGGER.info("Connected, emulating %s units", len(self.units))
+
+    def _on_message(self, client, userdata, msg) -> None:
+        unit = self.units.get(msg.topic.split("/", 1)[1])
+        if unit is None:
+            return
+        try:
+            command = json.loads(msg.payload)
+        except ValueError:
+            command = None
+        self.loop.call_soon_threadsafe(self.deliver, unit, command)
+
+    def deliver(self, unit: EmulatedUnit, command: Any) -> None:
+        """Hand a command to a unit, applying loss and latency."""
+        if self.config.loss and unit.rng.random() < self.config.loss:
+            unit.stats.dropped_commands += 1
+            return
+        delay = self._delay(unit.rng)
+        if delay:
+            self.loop.call_later(delay, unit.receive, command)
+        else:
+            unit.receive(command)
+
+    def publish(self, unit: EmulatedUnit, topic: str, payload: dict[str, Any]) -> None:
+        """Publish a unit message, applying loss and latency."""
+        if self.config.loss and unit.rng.random() < self.config.loss:
+            unit.stats.dropped_messages += 1
+            return
+        unit.stats.published += 1
+        data = json.dumps(payload)
+        delay = self._delay(unit.rng)
+        if delay:
+            self.loop.call_later(delay, self.client.publish, topic, data)
+        else:
+            self.client.publish(topic, data)
+
+    def summary(self) -> dict[str, Any]:
+        """Return aggregated counters of all units."""
+        commands: dict[str, int] = {}
+        totals = {
+            "dropped_commands": 0,
+            "invalid_commands": 0,
+            "published": 0,
+            "dropped_messages": 0,
+            "shots": 0,
+        }
+        for unit in self.units.values():
+            for kind, count in unit.stats.commands.items():
+                commands[kind] = commands.get(kind, 0) + count
+            for key in totals:
+                totals[key] += getattr(unit.stats, key)
+        elapsed = time.monotonic() - self.started
+        return {
+            "units": len(self.units),
+            "elapsed_s": round(elapsed, 1),
+            "commands": commands,
+            "commands_per_s": round(sum(commands.values()) / elapsed, 2) if elapsed else 0,
+            **totals,
+        }
+
+    async def _async_http(self, port: int) -> Any:
+        from aiohttp import web
+
+        def unit_for(request: web.Request) -> EmulatedUnit:
+            host = request.host
+            unit = self.units.get(host) or self.units.get(host.rsplit(":", 1)[0])
+            if unit is None and len(self.units) == 1:
+                unit = next(iter(self.units.values()))
+            if unit is None:
+                raise web.HTTPNotFound(text=f"unknown unit {host}")
+            return unit
+
+        async def handle_command(request: web.Request) -> web.Response:
+            unit = unit_for(request)
+            try:
+                command = await request.json()
+            except ValueError:
+                raise web.HTTPBadRequest(text="invalid json") from None
+            self.deliver(unit, command)
+            if self.config.http_latency_ms:
+                await asyncio.sleep(self.config.http_latency_ms / 1000)
+            return web.json_response({"ok": True})
+
+        async def handle_info(request: web.Request) -> web.Response:
+            return web.json_response(unit_for(request).info())
+
+        app = web.Application()
+        app.router.add_post("/command", handle_command)
+        app.router.add_get("/info", handle_info)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "0.0.0.0", port).start()
+        self.http_port = runner.addresses[0][1]
+        _LOGGER.info("Local HTTP interface on port %s", self.http_port)
+        return runner
+
+    async def async_start(self, http_port: int | None = None) -> None:
+        """Start the units (and the local HTTP interface); no broker needed."""
+        self.loop = asyncio.get_running_loop()
+        if http_port is not None:
+            self._runner = await self._async_http(http_port)
+        for unit in self.units.values():
+            self._tasks.append(asyncio.create_task(unit.run()))
+            self._tasks.append(asyncio.create_task(unit.run_telemetry()))
+            if self.config.detections_per_hour > 0:
+                self._tasks.append(asyncio.create_task(unit.run_detections()))
+
+    async def async_stop(self) -> None:
+        """Stop the units and the local HTTP interface."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def run(
+        self,
+        broker: str,
+        port: int,
+        username: str | None,
+        password: str | None,
+        http_port: int | None = None,
+        stats_interval: float = 30.0,
+        duration: float | None = None,
+    ) -> dict[str, Any]:
+        """Connect and emulate until cancelled or ``duration`` elapsed."""
+        self.loop = asyncio.get_running_loop()
+        if username:
+            self.client.username_pw_set(username, password)
+        await self.loop.run_in_executor(None, self.client.connect, broker, port, 60)
+        self.client.loop_start()
+        await self.async_start(http_port)
+
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:
+                pass
+        if duration:
+            self.loop.call_later(duration, stop.set)
+
+        try:
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), stats_interval)
+                except asyncio.TimeoutError:
+                    _LOGGER.info("%s", json.dumps(self.summary()))
+        finally:
+            await self.async_stop()
+            self.client.loop_stop()
+            self.client.disconnect()
+        return self.summary()
+
+
+def generate_ips(base: str, count: int) -> list[str]:
+    """Return ``count`` consecutive IPv4 addresses starting at ``base``."""
+    parts = [int(part) for part in base.split(".")]
+    start = (parts[0] << 24) | (parts[1] << 16) | (parts[2] << 8) | parts[3]
+    return [
+        ".".join(str((address >> shift) & 0xFF) for shift in (24, 16, 8, 0))
+        for address in range(start, start + count)
+    ]
+
+
+def main() -> None:
+    """Run the emulator from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--broker", default="localhost")
+    parser.add_argument("--port", type=int, default=1883)
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--units", type=int, default=1, help="number of emulated units")
+    parser.add_argument("--base-ip", default="10.99.0.1", help="IP of the first unit")
+    parser.add_argument(
+        "--ip", action="append", default=[], help="explicit unit IP (repeatable)"
+    )
+    parser.add_argument("--info-interval", type=float, default=5.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="angle noise (deg)")
+    parser.add_argument("--loss", type=float, default=0.0, help="drop probability 0..1")
+    parser.add_argument("--latency", type=float, default=0.0, help="ms")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="ms")
+    parser.add_argument(
+        "--http-latency", type=float, default=0.0, help="local HTTP answer delay (ms)"
+    )
+    parser.add_argument("--move-speed", type=float, default=60.0, help="deg/s at speed 1")
+    parser.add_argument("--detections-per-hour", type=float, default=0.0)
+    parser.add_argument("--tank-shots", type=int, default=0, help="0 = never empty")
+    parser.add_argument("--http-port", type=int, help="serve the local HTTP interface")
+    parser.add_argument("--duration", type=float, help="stop after N seconds")
+    parser.add_argument("--stats-interval", type=float, default=30.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    config = EmulatorConfig(
+        info_interval=args.info_interval,
+        jitter=args.jitter,
+        loss=args.loss,
+        latency_ms=args.latency,
+        latency_jitter_ms=args.latency_jitter,
+        http_latency_ms=args.http_latency,
+        move_speed=args.move_speed,
+        detections_per_hour=args.detections_per_hour,
+        tank_shots=args.tank_shots,
+    )
+    ips = args.ip or generate_ips(args.base_ip, args.units)
+    emulator = Emulator(config, ips, seed=args.seed)
+    summary = asyncio.run(
+        emulator.run(
+            args.broker,
+            args.port,
+            args.username,
+            args.password,
+            http_port=args.http_port,
+            stats_interval=args.stats_interval,
+            duration=args.duration,
+        )
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""Replay recorded Taubenschiesser traffic through the coordinator offline.
+
+Feeds a capture written by the ``taubenschiesser.capture_traffic`` service
+(JSONL: MQTT messages, device list responses, push events) into a real
+coordinator running on a throwaway Home Assistant instance, without network
+or broker. The coordinator code is loaded from this checkout, so two versions
+can be compared on the same production traffic:
+
+    python tools/replay.py capture.jsonl              # recorded pacing (1x)
+    python tools/replay.py capture.jsonl --speed 10   # 10x faster
+    python tools/replay.py capture.jsonl --speed max  # as fast as possible
+    python tools/replay.py capture.jsonl --option fleet_store --json
+
+The report contains throughput, the entity state writes the traffic would
+have caused (one counting listener per device and context stands in for the
+entities), poll/parse timings and a hash of the final device state.
+
+The MQTT debounce follows the recorded timestamps instead of the wall clock,
+so state writes and the state hash do not depend on ``--speed``.
+
+Requires homeassistant (the version the integration targets).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+from pathlib import Path
+import sys
+import tempfile
+import time
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant import config_entries
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.taubenschiesser.capture import (  # noqa: E402
+    KIND_API,
+    KIND_MQTT,
+    KIND_PUSH,
+)
+from custom_components.taubenschiesser.const import (  # noqa: E402
+    CONF_ACCESS_TOKEN,
+    CONF_API_URL,
+    DOMAIN,
+    LISTENER_TELEMETRY,
+    SIGNAL_SUMMARY_UPDATED,
+)
+from custom_components.taubenschiesser.coordinator import (  # noqa: E402
+    TaubenschiesserDataUpdateCoordinator,
+)
+from custom_components.taubenschiesser.push import (  # noqa: E402
+    TaubenschiesserPushClient,
+)
+
+_LOGGER = logging.getLogger("replay")
+
+# Keeps the real debounce timer from firing; flushes follow the recording
+DEBOUNCE_DISABLED = 1e9
+
+
+def load_capture(path: str) -> tuple[dict[str, Any], list[list[Any]]]:
+    """Read a capture file; return its header and records in order."""
+    header: dict[str, Any] = {}
+    records: list[list[Any]] = []
+    with open(path, encoding="utf-8") as handle:
+        for number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                # A capture cut off mid-write ends with a partial line
+                _LOGGER.warning("Zeile %s ist kein gültiges JSON, übersprungen", number)
+                continue
+            if isinstance(item, dict):
+                header = item
+            elif isinstance(item, list) and len(item) >= 3:
+                records.append(item)
+    records.sort(key=lambda record: record[0])
+    return header, records
+
+
+def state_hash(devices: dict[str, Any]) -> str:
+    """Return a stable hash of the coordinator's device state."""
+    encoded = json.dumps(devices, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _config_entry(options: dict[str, Any]) -> ConfigEntry:
+    """Build a config entry for the replay (the signature varies by HA version)."""
+    kwargs = {
+        "version": 1,
+        "minor_version": 1,
+        "domain": DOMAIN,
+        "title": "Replay",
+        "data": {CONF_API_URL: "http://replay.invalid", CONF_ACCESS_TOKEN: "replay"},
+        "source": "user",
+        "options": options,
+        "unique_id": None,
+        "discovery_keys": MappingProxyType({}),
+        "subentries_data": None,
+    }
+    parameters = inspect.signature(ConfigEntry).parameters
+    return ConfigEntry(**{key: value for key, value in kwargs.items() if key in parameters})
+
+
+class _RecordedResponse:
+    """The parts of an aiohttp response the device list parser reads."""
+
+    def __init__(self, status: int, payload: Any) -> None:
+        self.status = status
+        self._body = json.dumps(payload).encode()
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class Replayer:
+    """Drive one coordinator with recorded records."""
+
+    def __init__(self, hass: HomeAssistant, options: dict[str, Any]) -> None:
+        """Create the coordinator without network, broker or poll timer."""
+        self.hass = hass
+        entry = _config_entry(options)
+        if hasattr(config_entries, "current_entry"):
+            config_entries.current_entry.set(entry)
+        self.coordinator = coordinator = TaubenschiesserDataUpdateCoordinator(hass, entry)
+        coordinator.update_interval = None
+        self.debounce = coordinator._mqtt_debounce_seconds
+        coordinator._mqtt_debounce_seconds = DEBOUNCE_DISABLED
+        coordinator._async_fetch_devices = self._async_fetch_devices
+        self.push = TaubenschiesserPushClient(coordinator)
+        self.counts = {KIND_MQTT: 0, KIND_API: 0, KIND_PUSH: 0}
+        self.summary_writes = 0
+        self._response: _RecordedResponse | None = None
+        self._listened: set[str] = set()
+        self._unsubs = [
+            async_dispatcher_connect(
+                hass,
+                SIGNAL_SUMMARY_UPDATED.format(entry_id=entry.entry_id),
+                self._summary_updated,
+            )
+        ]
+
+    def _summary_updated(self, changed: set[str]) -> None:
+        self.summary_writes += len(changed)
+
+    def _noop(self) -> None:
+        """Stand-in for an entity's state write."""
+
+    def _attach_listeners(self) -> None:
+        """Give every new device one API and one telemetry listener."""
+        for device_id in self.coordinator.devices.keys() - self._listened:
+            self._listened.add(device_id)
+            self._unsubs.append(self.coordinator.async_add_listener(self._noop))
+            self._unsubs.append(
+                self.coordinator.async_add_listener(self._noop, LISTENER_TELEMETRY)
+            )
+
+    async def _async_fetch_devices(
+        self, shard: Any = None, check_token: bool = True
+    ) -> dict[str, Any]:
+        if self._response is None:
+            raise UpdateFailed("Keine Geräteliste in der Aufzeichnung")
+        return await self.coordinator._async_parse_devices(self._response)
+
+    async def _async_flush(self) -> None:
+        """Run the debounced MQTT flush if one is pending."""
+        coordinator = self.coordinator
+        if coordinator._mqtt_debounce_handle is None:
+            return
+        coordinator._mqtt_debounce_handle.cancel()
+        coordinator._mqtt_debounce_handle = None
+        await coordinator._async_mqtt_flush()
+
+    async def async_run(self, records: list[list[Any]], speed: float | None) -> dict[str, Any]:
+        """Replay the records; speed None means as fast as possible."""
+        coordinator = self.coordinator
+        started = time.perf_counter()
+        last_mqtt_at: float | None = None
+        for record in records:
+            offset = record[0] / 1000
+            if speed is not None:
+                delay = started + offset / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if last_mqtt_at is not None and offset - last_mqtt_at >= self.debounce:
+                # The recorded quiet period was long enough for the debounce
+                await self._async_flush()
+                last_mqtt_at = None
+
+            kind = record[1]
+            if kind == KIND_MQTT:
+                coordinator._handle_mqtt_message(record[2], record[3], bool(record[4]))
+                last_mqtt_at = offset
+            elif kind == KIND_API:
+                if record[3] != 200:
+                    continue
+                self._response = _RecordedResponse(record[3], record[4])
+                _, _, shard = record[2].partition(":")
+                if shard:
+                    # One shard's list, merged and notified like a scheduled shard poll
+                    await coordinator._async_parse_devices(self._response, shard)
+                    coordinator.async_notify_pushed_data()
+                    coordinator.async_notify_telemetry()
+                else:
+                    await coordinator.async_refresh()
+                self._attach_listeners()
+            elif kind == KIND_PUSH:
+                self.push._handle_event(record[2], None, json.dumps(record[3]))
+            else:
+                continue
+            self.counts[kind] += 1
+            # Let callbacks handed over by call_soon_threadsafe run
+            await asyncio.sleep(0)
+        await self._async_flush()
+        await self.hass.async_block_till_done()
+        elapsed = time.perf_counter() - started
+        return self._report(records, elapsed)
+
+    def _report(self, records: list[list[Any]], elapsed: float) -> dict[str, Any]:
+        metrics = self.coordinator.metrics
+        replayed = sum(self.counts.values())
+        return {
+            "records": replayed,
+            "by_kind": {
+                "mqtt": self.counts[KIND_MQTT],
+                "api": self.counts[KIND_API],
+                "push": self.counts[KIND_PUSH],
+            },
+            "recorded_s": round(records[-1][0] / 1000, 2) if records else 0,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(replayed / elapsed, 1) if elapsed else None,
+            "devices": len(self.coordinator.devices),
+            "state_writes": {
+                "api": metrics.listener_callbacks["api"],
+                "telemetry": metrics.listener_callbacks["telemetry"],
+                "summary": self.summary_writes,
+            },
+            "debounce_flushes": metrics.debounce_flushes,
+            "poll_duration": metrics.poll_duration.as_dict(),
+            "parse_duration": metrics.parse_duration.as_dict(),
+            "state_hash": state_hash(self.coordinator.devices),
+        }
+
+    async def async_close(self) -> None:
+        """Detach listeners and stop the coordinator's timers."""
+        for unsub in self._unsubs:
+            unsub()
+        await self.coordinator.async_shutdown()
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    """Replay one capture on a temporary Home Assistant instance."""
+    header, records = load_capture(args.capture)
+    if not records:
+        raise SystemExit(f"{args.capture} enthält keine Einträge")
+    speed = None if args.speed == "max" else float(args.speed)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await dr.async_load(hass)
+        replayer = Replayer(hass, {option: True for option in args.option})
+        try:
+            report = await replayer.async_run(records, speed)
+        finally:
+            await replayer.async_close()
+            await hass.async_stop(force=True)
+    report["capture"] = {"file": args.capture, "version": header.get("version")}
+    report["speed"] = args.speed
+    return report
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    writes = report["state_writes"]
+    print(f"Aufzeichnung:   {report['capture']['file']} ({report['recorded_s']} s)")
+    print(
+        f"Einträge:       {report['records']} "
+        f"(MQTT {report['by_kind']['mqtt']}, API {report['by_kind']['api']}, "
+        f"Push {report['by_kind']['push']}), {report['devices']} Geräte"
+    )
+    print(
+        f"Durchsatz:      {report['throughput_per_s']}/s in {report['elapsed_s']} s "
+        f"(Tempo {report['speed']})"
+    )
+    print(
+        f"State-Writes:   API {writes['api']}, Telemetrie {writes['telemetry']}, "
+        f"Zusammenfassung {writes['summary']}, Flushes {report['debounce_flushes']}"
+    )
+    print(
+        f"Poll/Parse p95: {report['poll_duration']['p95_ms']} ms / "
+        f"{report['parse_duration']['p95_ms']} ms"
+    )
+    print(f"State-Hash:     {report['state_hash']}")
+
+
+def main() -> None:
+    """Parse arguments and replay."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("capture", help="JSONL-Datei des Dienstes capture_traffic")
+    parser.add_argument(
+        "--speed",
+        default="1",
+        help="Tempo relativ zur Aufnahme (1, 10, ...) oder 'max' (Standard: 1)",
+    )
+    parser.add_argument(
+        "--option",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Boolesche Integrationsoption aktivieren (mehrfach möglich, z. B. fleet_store)",
+    )
+    parser.add_argument("--json", action="store_true", help="Bericht als JSON ausgeben")
+    parser.add_argument("--debug", action="store_true", help="Debug-Logging")
+    args = parser.parse_args()
+    if args.speed != "max":
+        try:
+            if float(args.speed) <= 0:
+                raise ValueError
+        except ValueError:
+            parser.error("--speed muss eine positive Zahl oder 'max' sein")
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    report = asyncio.run(async_main(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()